@@ -0,0 +1,52 @@
+"""Add composite index on cards.next_review_date and id
+
+Also backfills NULL review dates and makes the column NOT NULL, matching the model.
+
+Revision ID: 3f7a9c2d1b84
+Revises: e1e336330745
+Create Date: 2026-10-17 09:12:41.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f7a9c2d1b84'
+down_revision: Union[str, Sequence[str], None] = 'e1e336330745'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Legacy rows from before next_review_date was mandatory are due right away.
+    # Once the column is NOT NULL the due-card lookup no longer needs an
+    # "OR next_review_date IS NULL" branch and becomes a plain index range scan.
+    op.execute(
+        sa.text("UPDATE cards SET next_review_date = CURRENT_DATE WHERE next_review_date IS NULL")
+    )
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.alter_column(
+            'next_review_date',
+            existing_type=sa.Date(),
+            nullable=False,
+        )
+        batch_op.create_index(
+            'ix_cards_next_review_date_id',
+            ['next_review_date', 'id'],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.drop_index('ix_cards_next_review_date_id')
+        batch_op.alter_column(
+            'next_review_date',
+            existing_type=sa.Date(),
+            nullable=True,
+        )
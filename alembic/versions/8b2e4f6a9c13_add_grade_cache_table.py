@@ -0,0 +1,51 @@
+"""Add grade_cache table
+
+Revision ID: 8b2e4f6a9c13
+Revises: 3f7a9c2d1b84
+Create Date: 2026-10-17 11:03:27.518342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4f6a9c13'
+down_revision: Union[str, Sequence[str], None] = '3f7a9c2d1b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('grade_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('card_id', sa.Integer(), nullable=False),
+        sa.Column('back_hash', sa.String(length=64), nullable=False),
+        sa.Column('answer_hash', sa.String(length=64), nullable=False),
+        sa.Column('prompt_version', sa.String(length=16), nullable=False),
+        sa.Column('result', sa.String(length=16), nullable=False),
+        sa.Column('feedback', sa.Text(), nullable=False),
+        sa.Column('latency_ms', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['card_id'], ['cards.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('grade_cache', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_grade_cache_lookup',
+            ['card_id', 'back_hash', 'answer_hash', 'prompt_version'],
+            unique=True,
+        )
+        batch_op.create_index('ix_grade_cache_last_used_at', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('grade_cache', schema=None) as batch_op:
+        batch_op.drop_index('ix_grade_cache_last_used_at')
+        batch_op.drop_index('ix_grade_cache_lookup')
+    op.drop_table('grade_cache')
@@ -0,0 +1,43 @@
+"""Add card_deletions for syncing deleted cards
+
+Revision ID: a4e6c8f0b2d5
+Revises: f8d1c3e5a7b9
+Create Date: 2026-10-17 22:14:05.630218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e6c8f0b2d5'
+down_revision: Union[str, Sequence[str], None] = 'f8d1c3e5a7b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of flash_zap.models.server_clock.SQLITE_NOW at this revision.
+SQLITE_NOW = "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        now = sa.text(f"({SQLITE_NOW})")
+    else:
+        now = sa.func.current_timestamp()
+    op.create_table(
+        'card_deletions',
+        sa.Column('sync_id', sa.String(length=36), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False, server_default=now),
+        sa.PrimaryKeyConstraint('sync_id'),
+    )
+    op.create_index('ix_card_deletions_changed_at', 'card_deletions', ['changed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_card_deletions_changed_at', table_name='card_deletions')
+    op.drop_table('card_deletions')
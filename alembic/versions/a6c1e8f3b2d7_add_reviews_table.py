@@ -0,0 +1,45 @@
+"""Add reviews table
+
+Revision ID: a6c1e8f3b2d7
+Revises: f2b7c9d4e6a8
+Create Date: 2026-10-17 17:48:09.274160
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c1e8f3b2d7'
+down_revision: Union[str, Sequence[str], None] = 'f2b7c9d4e6a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('reviews',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('card_id', sa.Integer(), nullable=False),
+        sa.Column('reviewed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('answer', sa.Text(), nullable=True),
+        sa.Column('grade', sa.String(length=16), nullable=False),
+        sa.Column('latency_ms', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('old_mastery_level', sa.Integer(), nullable=False),
+        sa.Column('new_mastery_level', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['card_id'], ['cards.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.create_index('ix_reviews_card_id_reviewed_at', ['card_id', 'reviewed_at'], unique=False)
+        batch_op.create_index('ix_reviews_reviewed_at', ['reviewed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_index('ix_reviews_reviewed_at')
+        batch_op.drop_index('ix_reviews_card_id_reviewed_at')
+    op.drop_table('reviews')
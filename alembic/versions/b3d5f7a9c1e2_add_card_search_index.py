@@ -0,0 +1,68 @@
+"""Add full-text search index on card fronts and backs
+
+Revision ID: b3d5f7a9c1e2
+Revises: a6c1e8f3b2d7
+Create Date: 2026-10-17 18:32:44.061237
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d5f7a9c1e2'
+down_revision: Union[str, Sequence[str], None] = 'a6c1e8f3b2d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of flash_zap.models.card_search at this revision.
+TSVECTOR_EXPRESSION = "to_tsvector('simple', coalesce(front, '') || ' ' || coalesce(back, ''))"
+
+SQLITE_UPGRADE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts USING fts5("
+    "front, back, content='cards', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS cards_fts_insert AFTER INSERT ON cards BEGIN "
+    "INSERT INTO cards_fts(rowid, front, back) VALUES (new.id, new.front, new.back); END",
+    "CREATE TRIGGER IF NOT EXISTS cards_fts_delete AFTER DELETE ON cards BEGIN "
+    "INSERT INTO cards_fts(cards_fts, rowid, front, back) VALUES ('delete', old.id, old.front, old.back); END",
+    "CREATE TRIGGER IF NOT EXISTS cards_fts_update AFTER UPDATE OF front, back ON cards BEGIN "
+    "INSERT INTO cards_fts(cards_fts, rowid, front, back) VALUES ('delete', old.id, old.front, old.back); "
+    "INSERT INTO cards_fts(rowid, front, back) VALUES (new.id, new.front, new.back); END",
+    "INSERT INTO cards_fts(cards_fts) VALUES ('rebuild')",
+)
+SQLITE_DOWNGRADE = (
+    "DROP TRIGGER IF EXISTS cards_fts_update",
+    "DROP TRIGGER IF EXISTS cards_fts_delete",
+    "DROP TRIGGER IF EXISTS cards_fts_insert",
+    "DROP TABLE IF EXISTS cards_fts",
+)
+
+POSTGRESQL_UPGRADE = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_cards_search_tsv ON cards USING gin (({TSVECTOR_EXPRESSION}))",
+    "CREATE INDEX IF NOT EXISTS ix_cards_front_trgm ON cards USING gin (front gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_cards_back_trgm ON cards USING gin (back gin_trgm_ops)",
+)
+POSTGRESQL_DOWNGRADE = (
+    "DROP INDEX IF EXISTS ix_cards_back_trgm",
+    "DROP INDEX IF EXISTS ix_cards_front_trgm",
+    "DROP INDEX IF EXISTS ix_cards_search_tsv",
+)
+
+
+def _run(sqlite, postgresql) -> None:
+    dialect = op.get_bind().dialect.name
+    statements = sqlite if dialect == "sqlite" else postgresql if dialect == "postgresql" else ()
+    for statement in statements:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _run(SQLITE_UPGRADE, POSTGRESQL_UPGRADE)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _run(SQLITE_DOWNGRADE, POSTGRESQL_DOWNGRADE)
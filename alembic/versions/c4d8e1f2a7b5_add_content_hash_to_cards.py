@@ -0,0 +1,76 @@
+"""Add content_hash column to cards
+
+Backfills the hash for existing cards, giving it only to the first card of
+each group of duplicates so the unique index can be created.
+
+Revision ID: c4d8e1f2a7b5
+Revises: 8b2e4f6a9c13
+Create Date: 2026-10-17 13:26:09.731840
+
+"""
+import hashlib
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e1f2a7b5'
+down_revision: Union[str, Sequence[str], None] = '8b2e4f6a9c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _content_hash(front: str, back: str) -> str:
+    # Frozen copy of flash_zap.utils.text.card_content_hash at this revision.
+    normalized = [
+        _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip().casefold()
+        for text in (front, back)
+    ]
+    return hashlib.sha256("\x00".join(normalized).encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    conn = op.get_bind()
+    cards = sa.table(
+        'cards',
+        sa.column('id', sa.Integer),
+        sa.column('front', sa.String),
+        sa.column('back', sa.String),
+        sa.column('content_hash', sa.String),
+    )
+    seen = set()
+    updates = []
+    for card_id, front, back in conn.execute(
+        sa.select(cards.c.id, cards.c.front, cards.c.back).order_by(cards.c.id)
+    ):
+        content_hash = _content_hash(front, back)
+        if content_hash not in seen:
+            seen.add(content_hash)
+            updates.append({"card_id": card_id, "content_hash": content_hash})
+    if updates:
+        conn.execute(
+            cards.update()
+            .where(cards.c.id == sa.bindparam('card_id'))
+            .values(content_hash=sa.bindparam('content_hash')),
+            updates,
+        )
+
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.create_index('ix_cards_content_hash', ['content_hash'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.drop_index('ix_cards_content_hash')
+        batch_op.drop_column('content_hash')
@@ -0,0 +1,66 @@
+"""Add sync_id and updated_at to cards and the sync_state table
+
+Revision ID: d9a3b5c7e2f1
+Revises: c4d8e1f2a7b5
+Create Date: 2026-10-17 15:41:52.118403
+
+"""
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a3b5c7e2f1'
+down_revision: Union[str, Sequence[str], None] = 'c4d8e1f2a7b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sync_id', sa.String(length=36), nullable=True))
+        batch_op.add_column(sa.Column(
+            'updated_at',
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.current_timestamp(),
+        ))
+
+    conn = op.get_bind()
+    cards = sa.table('cards', sa.column('id', sa.Integer), sa.column('sync_id', sa.String))
+    updates = [
+        {"card_id": card_id, "sync_id": str(uuid.uuid4())}
+        for (card_id,) in conn.execute(sa.select(cards.c.id))
+    ]
+    if updates:
+        conn.execute(
+            cards.update()
+            .where(cards.c.id == sa.bindparam('card_id'))
+            .values(sync_id=sa.bindparam('sync_id')),
+            updates,
+        )
+
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.alter_column('sync_id', existing_type=sa.String(length=36), nullable=False)
+        batch_op.create_index('ix_cards_sync_id', ['sync_id'], unique=True)
+        batch_op.create_index('ix_cards_updated_at', ['updated_at'], unique=False)
+
+    op.create_table('sync_state',
+        sa.Column('name', sa.String(length=32), nullable=False),
+        sa.Column('watermark', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sync_state')
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.drop_index('ix_cards_updated_at')
+        batch_op.drop_index('ix_cards_sync_id')
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('sync_id')
@@ -0,0 +1,75 @@
+"""Add decks and card tags
+
+Revision ID: e7c2a4f9d1b3
+Revises: b3d5f7a9c1e2
+Create Date: 2026-10-17 19:48:12.903417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c2a4f9d1b3'
+down_revision: Union[str, Sequence[str], None] = 'b3d5f7a9c1e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# On SQLite, batch mode rebuilds the cards table, which drops the triggers that
+# keep the search index in step with it. Frozen copy of their DDL from
+# flash_zap.models.card_search at this revision.
+SQLITE_SEARCH_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS cards_fts_insert AFTER INSERT ON cards BEGIN "
+    "INSERT INTO cards_fts(rowid, front, back) VALUES (new.id, new.front, new.back); END",
+    "CREATE TRIGGER IF NOT EXISTS cards_fts_delete AFTER DELETE ON cards BEGIN "
+    "INSERT INTO cards_fts(cards_fts, rowid, front, back) VALUES ('delete', old.id, old.front, old.back); END",
+    "CREATE TRIGGER IF NOT EXISTS cards_fts_update AFTER UPDATE OF front, back ON cards BEGIN "
+    "INSERT INTO cards_fts(cards_fts, rowid, front, back) VALUES ('delete', old.id, old.front, old.back); "
+    "INSERT INTO cards_fts(rowid, front, back) VALUES (new.id, new.front, new.back); END",
+)
+
+
+def _restore_search_triggers() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in SQLITE_SEARCH_TRIGGERS:
+            op.execute(statement)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'decks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name'),
+    )
+    op.create_table(
+        'card_tags',
+        sa.Column('card_id', sa.Integer(), nullable=False),
+        sa.Column('tag', sa.String(length=50), nullable=False),
+        sa.ForeignKeyConstraint(['card_id'], ['cards.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('card_id', 'tag'),
+    )
+    op.create_index('ix_card_tags_tag_card_id', 'card_tags', ['tag', 'card_id'], unique=False)
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deck_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_cards_deck_id_decks', 'decks', ['deck_id'], ['id'], ondelete='SET NULL')
+        batch_op.create_index(
+            'ix_cards_deck_id_next_review_date', ['deck_id', 'next_review_date', 'id'], unique=False
+        )
+    _restore_search_triggers()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.drop_index('ix_cards_deck_id_next_review_date')
+        batch_op.drop_constraint('fk_cards_deck_id_decks', type_='foreignkey')
+        batch_op.drop_column('deck_id')
+    _restore_search_triggers()
+    op.drop_index('ix_card_tags_tag_card_id', table_name='card_tags')
+    op.drop_table('card_tags')
+    op.drop_table('decks')
@@ -0,0 +1,42 @@
+"""Add SM-2 and FSRS scheduling state to cards
+
+Revision ID: f2b7c9d4e6a8
+Revises: d9a3b5c7e2f1
+Create Date: 2026-10-17 17:06:21.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7c9d4e6a8'
+down_revision: Union[str, Sequence[str], None] = 'd9a3b5c7e2f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('ease_factor', sa.Float(), server_default=sa.text('2.5'), nullable=False))
+        batch_op.add_column(sa.Column('interval_days', sa.Integer(), server_default=sa.text('0'), nullable=False))
+        batch_op.add_column(sa.Column('stability', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('difficulty', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('last_review_date', sa.Date(), nullable=True))
+
+    # Under the linear schedule the current interval is the mastery level.
+    cards = sa.table('cards', sa.column('mastery_level', sa.Integer), sa.column('interval_days', sa.Integer))
+    op.execute(cards.update().values(interval_days=cards.c.mastery_level))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.drop_column('last_review_date')
+        batch_op.drop_column('difficulty')
+        batch_op.drop_column('stability')
+        batch_op.drop_column('interval_days')
+        batch_op.drop_column('ease_factor')
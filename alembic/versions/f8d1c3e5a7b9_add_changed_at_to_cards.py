@@ -0,0 +1,69 @@
+"""Add changed_at to cards for the sync watermarks
+
+Revision ID: f8d1c3e5a7b9
+Revises: e7c2a4f9d1b3
+Create Date: 2026-10-17 21:02:37.481526
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f8d1c3e5a7b9'
+down_revision: Union[str, Sequence[str], None] = 'e7c2a4f9d1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# On SQLite, batch mode rebuilds the cards table, which drops the triggers that
+# keep the search index in step with it. Frozen copy of their DDL from
+# flash_zap.models.card_search at this revision.
+SQLITE_SEARCH_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS cards_fts_insert AFTER INSERT ON cards BEGIN "
+    "INSERT INTO cards_fts(rowid, front, back) VALUES (new.id, new.front, new.back); END",
+    "CREATE TRIGGER IF NOT EXISTS cards_fts_delete AFTER DELETE ON cards BEGIN "
+    "INSERT INTO cards_fts(cards_fts, rowid, front, back) VALUES ('delete', old.id, old.front, old.back); END",
+    "CREATE TRIGGER IF NOT EXISTS cards_fts_update AFTER UPDATE OF front, back ON cards BEGIN "
+    "INSERT INTO cards_fts(cards_fts, rowid, front, back) VALUES ('delete', old.id, old.front, old.back); "
+    "INSERT INTO cards_fts(rowid, front, back) VALUES (new.id, new.front, new.back); END",
+)
+# Frozen copy of flash_zap.models.server_clock.SQLITE_NOW at this revision.
+SQLITE_NOW = "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+def _restore_search_triggers() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in SQLITE_SEARCH_TRIGGERS:
+            op.execute(statement)
+
+
+def _reset_watermarks() -> None:
+    # The watermarks hold `updated_at` values before this revision and
+    # `changed_at` values after it; the next sync looks at every card again.
+    op.execute(sa.table('sync_state', sa.column('name', sa.String)).delete())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        now = sa.text(f"({SQLITE_NOW})")
+    else:
+        now = sa.func.current_timestamp()
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False, server_default=now))
+        batch_op.drop_index('ix_cards_updated_at')
+        batch_op.create_index('ix_cards_changed_at', ['changed_at'], unique=False)
+    _restore_search_triggers()
+    _reset_watermarks()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.drop_index('ix_cards_changed_at')
+        batch_op.create_index('ix_cards_updated_at', ['updated_at'], unique=False)
+        batch_op.drop_column('changed_at')
+    _restore_search_triggers()
+    _reset_watermarks()
@@ -0,0 +1,65 @@
+"""
+Benchmark: importing a large deck card by card versus in bulk.
+
+Times two ways of saving the same generated deck:
+
+* orm add - a Card object and `session.add` per card, one commit at the end
+  (how `_save_cards_to_db` used to work);
+* bulk    - `import_service._save_cards_to_db`, i.e. batched executemany
+  INSERTs, or COPY FROM STDIN when the database is PostgreSQL.
+
+Runs against a temporary SQLite file by default; pass a database URL as the
+first argument to run it against another database, e.g. a local PostgreSQL
+container (the `cards` table there is dropped and recreated).
+
+Usage:
+    python benchmarks/bench_bulk_import.py [database_url] [cards]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from flash_zap.models.base import Base
+from flash_zap.models.card import Card
+from flash_zap.services.import_service import _save_cards_to_db
+
+
+def _save_with_orm_add(cards_data, db_session):
+    for card_data in cards_data:
+        db_session.add(Card(front=card_data["front"], back=card_data["back"]))
+    db_session.commit()
+
+
+def _time(label: str, save, engine, cards_data) -> float:
+    Base.metadata.drop_all(engine, tables=[Card.__table__])
+    Base.metadata.create_all(engine, tables=[Card.__table__])
+    with sessionmaker(bind=engine)() as session:
+        start = time.perf_counter()
+        save(cards_data, session)
+        elapsed = time.perf_counter() - start
+        saved = session.execute(select(func.count()).select_from(Card)).scalar_one()
+    print(f"{label:>8}: {elapsed:8.3f} s for {saved} cards, {saved / elapsed:10.0f} cards/s")
+    return elapsed
+
+
+def run(url: str, count: int):
+    engine = create_engine(url)
+    cards_data = [{"front": f"Question {i}", "back": f"Answer {i}"} for i in range(count)]
+    print(f"Database: {engine.dialect.name}")
+    orm_add = _time("orm add", _save_with_orm_add, engine, cards_data)
+    bulk = _time("bulk", _save_cards_to_db, engine, cards_data)
+    print(f"{'speedup':>8}: {orm_add / bulk:8.1f}x")
+    Base.metadata.drop_all(engine, tables=[Card.__table__])
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    if len(sys.argv) > 1 and sys.argv[1] != "sqlite":
+        run(sys.argv[1], count)
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}", count)
@@ -0,0 +1,126 @@
+"""
+Benchmark: rescheduling many cards through ORM objects versus set-based SQL.
+
+Seeds a `cards` table and times three bulk operations two ways:
+
+* orm       - load every Card, change it in Python (SRSEngine for the replay),
+  and commit;
+* set-based - `core.bulk_schedule`: one UPDATE for a deck reset or a due date
+  shift, and plain SELECTs plus one executemany UPDATE for a log replay.
+
+Runs against a temporary SQLite file by default; pass a database URL as the
+first argument to run it against another database (the `cards` table there is
+dropped and recreated).
+
+Usage:
+    python benchmarks/bench_bulk_reschedule.py [database_url] [cards]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from flash_zap.core import bulk_schedule
+from flash_zap.models.base import Base
+from flash_zap.models.card import Card
+from flash_zap.services.srs_engine import SRSEngine
+
+INSERT_BATCH = 10_000
+
+
+def _seed(engine, count: int):
+    Base.metadata.drop_all(engine, tables=[Card.__table__])
+    Base.metadata.create_all(engine, tables=[Card.__table__])
+    rng = random.Random(count)
+    today = datetime.now(timezone.utc).date()
+    with engine.begin() as conn:
+        for start in range(0, count, INSERT_BATCH):
+            conn.execute(insert(Card), [
+                {
+                    "front": f"Question {i}",
+                    "back": f"Answer {i}",
+                    "mastery_level": rng.randint(0, 10),
+                    "next_review_date": today + timedelta(days=rng.randint(0, 60)),
+                }
+                for i in range(start, min(start + INSERT_BATCH, count))
+            ])
+
+
+def _orm_reset(session):
+    today = datetime.now(timezone.utc).date()
+    for card in session.scalars(select(Card)):
+        card.mastery_level = 0
+        card.next_review_date = today
+    session.commit()
+
+
+def _orm_shift(session):
+    for card in session.scalars(select(Card)):
+        card.next_review_date += timedelta(days=7)
+    session.commit()
+
+
+def _review_log(session):
+    rng = random.Random(0)
+    ids = session.scalars(select(Card.id)).all()
+    return ids, [rng.random() < 0.8 for _ in ids]
+
+
+def _orm_replay(session):
+    ids, outcomes = _review_log(session)
+    srs_engine = SRSEngine()
+    for card_id, correct in zip(ids, outcomes):
+        card = session.get(Card, card_id)
+        if correct:
+            srs_engine.promote_card(card)
+        else:
+            srs_engine.demote_card(card)
+    session.commit()
+
+
+def _bulk_replay(session):
+    ids, outcomes = _review_log(session)
+    bulk_schedule.replay_reviews(session, ids, outcomes)
+
+
+OPERATIONS = [
+    ("reset deck", _orm_reset, bulk_schedule.reset_cards),
+    ("shift +7 days", _orm_shift, lambda session: bulk_schedule.shift_due_dates(session, 7)),
+    ("replay log", _orm_replay, _bulk_replay),
+]
+
+
+def _time(engine, count: int, operation) -> float:
+    _seed(engine, count)
+    with sessionmaker(bind=engine)() as session:
+        start = time.perf_counter()
+        operation(session)
+        return time.perf_counter() - start
+
+
+def run(url: str, count: int):
+    engine = create_engine(url)
+    # The SRS engine logs every promotion; keep that out of the timings.
+    import logging
+    logging.disable(logging.INFO)
+    print(f"{count} cards, database: {engine.dialect.name}")
+    print(f"{'operation':>14} {'orm (s)':>9} {'set-based (s)':>14} {'speedup':>8}")
+    for name, orm_operation, bulk_operation in OPERATIONS:
+        orm = _time(engine, count, orm_operation)
+        bulk = _time(engine, count, bulk_operation)
+        print(f"{name:>14} {orm:>9.3f} {bulk:>14.3f} {orm / bulk:>7.1f}x")
+    Base.metadata.drop_all(engine, tables=[Card.__table__])
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    if len(sys.argv) > 1 and sys.argv[1] != "sqlite":
+        run(sys.argv[1], count)
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}", count)
@@ -0,0 +1,74 @@
+"""
+Benchmark: time to load one page of the card list at growing depth.
+
+Compares `card_manager.list_cards_page` (keyset: `WHERE id > last_id LIMIT n`)
+with the same page read through `OFFSET`, which has to skip every earlier
+row. Runs against a temporary SQLite file by default; pass a database URL as
+the first argument to run it against another database (the `cards` table
+there is dropped and recreated).
+
+Usage:
+    python benchmarks/bench_card_list.py [database_url] [cards]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from flash_zap.core import card_manager
+from flash_zap.models.base import Base
+from flash_zap.models.card import Card
+
+PAGE_SIZE = 20
+REPEATS = 5
+INSERT_BATCH = 10_000
+
+
+def _seed(engine, count: int):
+    Base.metadata.drop_all(engine, tables=[Card.__table__])
+    Base.metadata.create_all(engine, tables=[Card.__table__])
+    with engine.begin() as conn:
+        for start in range(0, count, INSERT_BATCH):
+            conn.execute(insert(Card), [
+                {"front": f"Question {i}", "back": f"Answer {i}", "mastery_level": 0}
+                for i in range(start, min(start + INSERT_BATCH, count))
+            ])
+
+
+def _time(load) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        load()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(url: str, count: int):
+    engine = create_engine(url)
+    _seed(engine, count)
+    columns = (Card.id, Card.front, Card.back, Card.mastery_level, Card.next_review_date)
+    print(f"{count} cards, database: {engine.dialect.name}, best of {REPEATS} runs")
+    print(f"{'depth':>9} {'keyset (ms)':>12} {'offset (ms)':>12}")
+    with Session(engine) as session:
+        ids = session.scalars(select(Card.id).order_by(Card.id)).all()
+        for depth in (0, count // 100, count // 10, count // 2, count - PAGE_SIZE):
+            after_id = ids[depth - 1] if depth else None
+            keyset = _time(lambda: card_manager.list_cards_page(session, after_id=after_id, limit=PAGE_SIZE))
+            offset = _time(lambda: session.execute(
+                select(*columns).order_by(Card.id).offset(depth).limit(PAGE_SIZE + 1)
+            ).all())
+            print(f"{depth:>9} {keyset:>12.2f} {offset:>12.2f}")
+    Base.metadata.drop_all(engine, tables=[Card.__table__])
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    if len(sys.argv) > 1 and sys.argv[1] != "sqlite":
+        run(sys.argv[1], count)
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}", count)
@@ -0,0 +1,83 @@
+"""
+Benchmark: latency of card search as the number of cards grows.
+
+Compares `card_manager.search_cards` (FTS5 on SQLite, tsvector on
+PostgreSQL) with the substring scan it replaces: an ILIKE on front and back
+for every word. Runs against a temporary SQLite file by default; pass a
+database URL as the first argument to run it against another database (the
+`cards` table there is dropped and recreated).
+
+Usage:
+    python benchmarks/bench_card_search.py [database_url]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from flash_zap.core import card_manager
+from flash_zap.models.base import Base
+from flash_zap.models.card import Card
+
+CARD_COUNTS = [10_000, 100_000, 500_000]
+QUERIES = ["grunwald", "stolica fran", "xylofon"]
+REPEATS = 5
+INSERT_BATCH = 10_000
+WORDS = [
+    "stolica", "francji", "bitwa", "pod", "rzeka", "miasto", "król", "rok", "wojna", "pokój",
+    "góra", "morze", "język", "słowo", "książka", "dom", "szkoła", "czas", "ludzie", "świat",
+]
+
+
+def _seed(engine, count: int):
+    Base.metadata.drop_all(engine, tables=[Card.__table__])
+    Base.metadata.create_all(engine, tables=[Card.__table__])
+    rng = random.Random(count)
+    with engine.begin() as conn:
+        for start in range(0, count, INSERT_BATCH):
+            conn.execute(insert(Card), [
+                {
+                    "front": " ".join(rng.choices(WORDS, k=6)) + f" {i}?",
+                    "back": " ".join(rng.choices(WORDS, k=3)),
+                    "mastery_level": 0,
+                }
+                for i in range(start, min(start + INSERT_BATCH, count))
+            ])
+        # One rare card, so some searches have a single match.
+        conn.execute(insert(Card), [{"front": "Bitwa pod Grunwaldem", "back": "1410", "mastery_level": 0}])
+
+
+def _time(search) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        search()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(url: str):
+    engine = create_engine(url)
+    print(f"database: {engine.dialect.name}, best of {REPEATS} runs, first page of results")
+    print(f"{'cards':>8} {'query':>14} {'index (ms)':>11} {'ILIKE (ms)':>11}")
+    for count in CARD_COUNTS:
+        _seed(engine, count)
+        with Session(engine) as session:
+            for query in QUERIES:
+                terms = card_manager._search_terms(query)
+                indexed = _time(lambda: card_manager.search_cards(session, query))
+                scanned = _time(lambda: session.scalars(card_manager._substring_search(terms, 0, 21)).all())
+                print(f"{count:>8} {query:>14} {indexed:>11.2f} {scanned:>11.2f}")
+    Base.metadata.drop_all(engine, tables=[Card.__table__])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
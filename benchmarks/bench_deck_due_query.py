@@ -0,0 +1,110 @@
+"""
+Benchmark: latency of the due-card query for one deck as the number of decks grows.
+
+Every deck holds the same number of cards, so the collection grows with the
+number of decks while the deck being reviewed stays the same size. Times the
+queries a deck-scoped ReviewSession runs (the due count and the first batch
+of the review deck) with and without the `ix_cards_deck_id_next_review_date`
+index; without it, SQLite has to scan every due card of the collection. Runs
+against a temporary SQLite file by default; pass a database URL as the first
+argument to run it against another database (its tables are dropped and
+recreated).
+
+Usage:
+    python benchmarks/bench_deck_due_query.py [database_url]
+"""
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, func, insert, select, text
+
+from flash_zap.core.review_session import due_cards_filter
+from flash_zap.models.base import Base
+from flash_zap.models.card import Card
+from flash_zap.models.card_tag import CardTag  # noqa: F401
+from flash_zap.models.deck import Deck
+
+DECK_COUNTS = [10, 100, 1_000]
+CARDS_PER_DECK = 500
+DUE_FRACTION = 0.1
+BATCH_SIZE = 200
+REPEATS = 5
+INSERT_BATCH = 10_000
+
+
+def _seed(conn, decks: int, today):
+    rng = random.Random(decks)
+    conn.execute(insert(Deck), [{"id": deck, "name": f"Deck {deck}"} for deck in range(1, decks + 1)])
+    rows = []
+    for i in range(decks * CARDS_PER_DECK):
+        offset = -rng.randint(0, 30) if rng.random() < DUE_FRACTION else rng.randint(1, 365)
+        rows.append({
+            "front": f"Question {i}",
+            "back": f"Answer {i}",
+            "next_review_date": today + timedelta(days=offset),
+            # Cards of one deck are imported at different times, so their ids are spread out.
+            "deck_id": rng.randint(1, decks),
+        })
+        if len(rows) == INSERT_BATCH:
+            conn.execute(insert(Card), rows)
+            rows = []
+    if rows:
+        conn.execute(insert(Card), rows)
+
+
+def _time_queries(engine, today, deck_id: int) -> float:
+    criterion = due_cards_filter(today, deck_id=deck_id)
+    count = select(func.count()).select_from(Card).where(criterion)
+    first_batch = select(Card.__table__).where(criterion).order_by(Card.id).limit(BATCH_SIZE)
+    best = float("inf")
+    for _ in range(REPEATS):
+        with engine.connect() as conn:
+            start = time.perf_counter()
+            conn.execute(count).scalar_one()
+            conn.execute(first_batch).fetchall()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(url: str):
+    engine = create_engine(url)
+    tables = [Deck.__table__, Card.__table__]
+    today = datetime.now(timezone.utc).date()
+    print(f"{CARDS_PER_DECK} cards per deck on average, {DUE_FRACTION:.0%} due")
+    print(f"{'decks':>7} {'cards':>9} {'due in deck':>12} {'no deck index (ms)':>19} {'deck index (ms)':>16} {'speedup':>8}")
+    for decks in DECK_COUNTS:
+        Base.metadata.drop_all(engine, tables=tables)
+        Base.metadata.create_all(engine, tables=tables)
+        with engine.begin() as conn:
+            _seed(conn, decks, today)
+            due = conn.execute(select(func.count()).where(due_cards_filter(today, deck_id=1))).scalar_one()
+            conn.execute(text("DROP INDEX ix_cards_deck_id_next_review_date"))
+            if engine.dialect.name == "sqlite":
+                conn.execute(text("ANALYZE"))
+        without_index = _time_queries(engine, today, 1)
+
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE INDEX ix_cards_deck_id_next_review_date ON cards (deck_id, next_review_date, id)"
+            ))
+            if engine.dialect.name == "sqlite":
+                conn.execute(text("ANALYZE"))
+        with_index = _time_queries(engine, today, 1)
+
+        print(f"{decks:>7} {decks * CARDS_PER_DECK:>9} {due:>12} {without_index * 1000:>19.2f} "
+              f"{with_index * 1000:>16.2f} {without_index / with_index:>7.1f}x")
+    Base.metadata.drop_all(engine, tables=tables)
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
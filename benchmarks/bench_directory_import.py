@@ -0,0 +1,75 @@
+"""
+Benchmark: importing a directory of deck files with one or many worker processes.
+
+Writes a tree of generated deck files to a temporary directory and times
+`import_service.import_cards_from_files` on it with a single worker and with
+one worker per CPU core. Validation runs in the workers ahead of the single
+database writer, which streams each valid file again as it inserts it, so the
+speedup is bounded by the writer.
+
+Runs against a temporary SQLite file by default; pass a database URL as the
+first argument to run it against another database (the `cards` table there is
+dropped and recreated).
+
+Usage:
+    python benchmarks/bench_directory_import.py [database_url] [files] [cards_per_file]
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from flash_zap.models.base import Base
+from flash_zap.models.card import Card
+from flash_zap.services.import_service import import_cards_from_files
+
+
+def _write_decks(root: str, files: int, cards_per_file: int):
+    for i in range(files):
+        directory = os.path.join(root, f"subject_{i % 10}")
+        os.makedirs(directory, exist_ok=True)
+        deck = [
+            {"front": f"Deck {i} question {j}", "back": f"Deck {i} answer {j}"}
+            for j in range(cards_per_file)
+        ]
+        with open(os.path.join(directory, f"deck_{i}.json"), "w", encoding="utf-8") as f:
+            json.dump(deck, f)
+
+
+def _time(engine, root: str, workers: int) -> float:
+    Base.metadata.drop_all(engine, tables=[Card.__table__])
+    Base.metadata.create_all(engine, tables=[Card.__table__])
+    with sessionmaker(bind=engine)() as session, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        import_cards_from_files(session, root, max_workers=workers)
+        elapsed = time.perf_counter() - start
+    print(f"{workers:>8} workers: {elapsed:8.3f} s")
+    return elapsed
+
+
+def run(url: str, files: int, cards_per_file: int):
+    engine = create_engine(url)
+    with tempfile.TemporaryDirectory() as root:
+        _write_decks(root, files, cards_per_file)
+        print(f"{files} files x {cards_per_file} cards, database: {engine.dialect.name}")
+        single = _time(engine, root, 1)
+        cores = os.cpu_count() or 1
+        parallel = _time(engine, root, cores)
+    print(f"{'speedup':>16}: {single / parallel:8.1f}x")
+    Base.metadata.drop_all(engine, tables=[Card.__table__])
+
+
+if __name__ == "__main__":
+    files = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    cards_per_file = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    if len(sys.argv) > 1 and sys.argv[1] != "sqlite":
+        run(sys.argv[1], files, cards_per_file)
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}", files, cards_per_file)
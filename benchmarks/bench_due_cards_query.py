@@ -0,0 +1,94 @@
+"""
+Benchmark: latency of the due-card query as the number of cards grows.
+
+Compares the query used by ReviewSession against a `cards` table with and
+without the `ix_cards_next_review_date_id` index. Runs against a temporary
+SQLite file by default; pass a database URL as the first argument to run it
+against another database (the `cards` table there is dropped and recreated).
+
+Usage:
+    python benchmarks/bench_due_cards_query.py [database_url]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, func, insert, select, text
+
+from flash_zap.core.review_session import due_cards_filter
+from flash_zap.models.base import Base
+from flash_zap.models.card import Card
+
+CARD_COUNTS = [1_000, 10_000, 100_000, 300_000]
+DUE_FRACTION = 0.01
+REPEATS = 5
+INSERT_BATCH = 10_000
+
+
+def _seed(conn, count: int, today):
+    rng = random.Random(count)
+    rows = []
+    for i in range(count):
+        if rng.random() < DUE_FRACTION:
+            offset = -rng.randint(0, 30)
+        else:
+            offset = rng.randint(1, 365)
+        rows.append({
+            "front": f"Question {i}",
+            "back": f"Answer {i}",
+            "mastery_level": rng.randint(0, 10),
+            "next_review_date": today + timedelta(days=offset),
+        })
+        if len(rows) == INSERT_BATCH:
+            conn.execute(insert(Card), rows)
+            rows = []
+    if rows:
+        conn.execute(insert(Card), rows)
+
+
+def _time_query(engine, today) -> float:
+    query = select(Card.__table__).where(due_cards_filter(today))
+    best = float("inf")
+    for _ in range(REPEATS):
+        with engine.connect() as conn:
+            start = time.perf_counter()
+            conn.execute(query).fetchall()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(url: str):
+    engine = create_engine(url)
+    today = datetime.now(timezone.utc).date()
+    due_index = next(index for index in Card.__table__.indexes if index.name == "ix_cards_next_review_date_id")
+    print(f"{'cards':>10} {'due':>8} {'no index (ms)':>15} {'index (ms)':>12} {'speedup':>8}")
+    for count in CARD_COUNTS:
+        Base.metadata.drop_all(engine, tables=[Card.__table__])
+        Base.metadata.create_all(engine, tables=[Card.__table__])
+        with engine.begin() as conn:
+            _seed(conn, count, today)
+            due = conn.execute(select(func.count()).where(due_cards_filter(today))).scalar_one()
+            due_index.drop(conn)
+        without_index = _time_query(engine, today)
+
+        with engine.begin() as conn:
+            # Only the due-card index was dropped; the table's other indexes are still there.
+            due_index.create(conn)
+            if engine.dialect.name == "sqlite":
+                conn.execute(text("ANALYZE"))
+        with_index = _time_query(engine, today)
+
+        print(f"{count:>10} {due:>8} {without_index * 1000:>15.2f} {with_index * 1000:>12.2f} "
+              f"{without_index / with_index:>7.1f}x")
+    Base.metadata.drop_all(engine, tables=[Card.__table__])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
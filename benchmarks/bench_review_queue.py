@@ -0,0 +1,107 @@
+"""
+Benchmark: building a capped, ordered review queue in SQL vs in Python.
+
+With a large backlog of due cards and a daily cap, the old approach loaded
+every due card, shuffled or sorted them in Python and then dropped all but
+the first REVIEWS_PER_DAY. The review deck now orders and limits the cards in
+the database, so only the capped cards are transferred and materialized.
+Times dealing the whole queue with each approach. Runs against a temporary
+SQLite file by default; pass a database URL as the first argument to run it
+against another database (its `cards` table is dropped and recreated).
+
+Usage:
+    python benchmarks/bench_review_queue.py [database_url]
+"""
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from flash_zap.core.review_deck import DueCardDeck
+from flash_zap.core.review_session import due_cards_filter
+from flash_zap.models.base import Base
+from flash_zap.models.card import Card
+
+CARDS = 300_000
+DUE_FRACTION = 0.3
+REVIEWS_PER_DAY = 200
+BATCH_SIZE = 200
+INSERT_BATCH = 10_000
+
+
+def _seed(conn, today):
+    rng = random.Random(0)
+    rows = []
+    for i in range(CARDS):
+        offset = -rng.randint(0, 60) if rng.random() < DUE_FRACTION else rng.randint(1, 365)
+        rows.append({
+            "front": f"Question {i}",
+            "back": f"Answer {i}",
+            "mastery_level": rng.randint(0, 10),
+            "next_review_date": today + timedelta(days=offset),
+            "last_review_date": today - timedelta(days=rng.randint(1, 90)),
+        })
+        if len(rows) == INSERT_BATCH:
+            conn.execute(insert(Card), rows)
+            rows = []
+    if rows:
+        conn.execute(insert(Card), rows)
+
+
+def _in_python(engine, today, order: str) -> float:
+    start = time.perf_counter()
+    with Session(engine) as session:
+        cards = list(session.scalars(select(Card).where(due_cards_filter(today))))
+        if order == "random":
+            random.Random(1).shuffle(cards)
+        else:
+            cards.sort(key=lambda card: (card.next_review_date, card.id))
+        queue = cards[:REVIEWS_PER_DAY]
+        assert len(queue) == REVIEWS_PER_DAY
+    return time.perf_counter() - start
+
+
+def _in_sql(engine, today, order: str) -> float:
+    start = time.perf_counter()
+    with Session(engine) as session:
+        deck = DueCardDeck(
+            session, due_cards_filter(today), batch_size=BATCH_SIZE, order=order, seed=1,
+            review_limit=REVIEWS_PER_DAY, new_limit=0,
+        )
+        dealt = 0
+        while deck.peek() is not None:
+            deck.pop_front()
+            dealt += 1
+        assert dealt == REVIEWS_PER_DAY
+    return time.perf_counter() - start
+
+
+def run(url: str):
+    engine = create_engine(url)
+    today = datetime.now(timezone.utc).date()
+    Base.metadata.drop_all(engine, tables=[Card.__table__])
+    Base.metadata.create_all(engine, tables=[Card.__table__])
+    with engine.begin() as conn:
+        _seed(conn, today)
+    print(f"{CARDS} cards, {DUE_FRACTION:.0%} due, {REVIEWS_PER_DAY} reviews per day")
+    print(f"{'order':>8} {'python (ms)':>12} {'sql (ms)':>9} {'speedup':>8}")
+    for order in ("overdue", "random"):
+        in_python = min(_in_python(engine, today, order) for _ in range(3))
+        in_sql = min(_in_sql(engine, today, order) for _ in range(3))
+        print(f"{order:>8} {in_python * 1000:>12.1f} {in_sql * 1000:>9.1f} {in_python / in_sql:>7.1f}x")
+    Base.metadata.drop_all(engine, tables=[Card.__table__])
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
@@ -0,0 +1,133 @@
+"""
+Benchmark: daily review load and AI grader calls of each scheduling algorithm.
+
+Simulates a collection of synthetic cards over a number of days, without a
+database. New cards are introduced at a steady rate so the whole collection
+is started by the end of the simulation, and every due card is reviewed on
+its due day. A card answered wrongly is reviewed again the same day, as in a
+real review session.
+
+Whether an answer is correct is drawn from a synthetic learner, not from any
+scheduler's own model: each card has a hidden memory strength `h` (days
+until recall drops to 90%) and a hidden ease. Recall after `t` days is
+0.9 ** (t / h). A successful review multiplies `h` by a factor that grows
+with how much had been forgotten (reviewing too early teaches little), a
+lapse cuts `h` to a third.
+
+Every review is counted as one AI grader call; the local pre-grader and the
+grade cache would only lower that number by the same share for every
+algorithm.
+
+Usage:
+    python benchmarks/bench_scheduler_simulation.py [cards] [days] [algorithm ...]
+"""
+import logging
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+
+from flash_zap.services.schedulers import SCHEDULERS, ReviewState, get_scheduler
+
+START = date(2026, 1, 1)
+
+
+class SyntheticLearner:
+    """The hidden memory of every card; see the module docstring."""
+
+    def __init__(self, cards: int, seed: int):
+        self._rng = random.Random(seed)
+        self.strength = [self._rng.lognormvariate(0.0, 0.5) for _ in range(cards)]
+        self.ease = [self._rng.uniform(0.5, 1.5) for _ in range(cards)]
+        self.last_seen: List[int] = [0] * cards
+
+    def recall_probability(self, card: int, day: int) -> float:
+        return 0.9 ** ((day - self.last_seen[card]) / self.strength[card])
+
+    def answer(self, card: int, day: int) -> bool:
+        probability = self.recall_probability(card, day)
+        correct = self._rng.random() < probability
+        if correct:
+            self.strength[card] *= 1 + self.ease[card] * (0.5 + 15 * (1 - probability))
+        else:
+            self.strength[card] = max(self.strength[card] / 3, 0.5)
+        self.last_seen[card] = day
+        return correct
+
+
+def simulate(algorithm: str, cards: int, days: int, seed: int = 0) -> Dict[str, float]:
+    scheduler = get_scheduler(algorithm)
+    learner = SyntheticLearner(cards, seed)
+    states = [ReviewState() for _ in range(cards)]
+    due: Dict[int, List[int]] = {}
+    new_per_day = -(-cards // days)
+    introduced = 0
+    daily_reviews = []
+    scheduled_reviews = scheduled_correct = 0
+
+    for day in range(days):
+        today = START + timedelta(days=day)
+        queue = due.pop(day, [])
+        new_cards = range(introduced, min(introduced + new_per_day, cards))
+        introduced = new_cards.stop
+        for card in new_cards:
+            learner.last_seen[card] = day
+        queue.extend(new_cards)
+
+        reviews = 0
+        while queue:
+            relearn = []
+            for card in queue:
+                # New cards and same-day relearning are not tests of retention.
+                scheduled = learner.last_seen[card] != day
+                correct = learner.answer(card, day)
+                reviews += 1
+                if scheduled:
+                    scheduled_reviews += 1
+                    scheduled_correct += correct
+                state = scheduler.review(states[card], correct, today)
+                states[card] = state
+                offset = (state.next_review_date - START).days
+                if offset == day:
+                    relearn.append(card)
+                elif offset < days:
+                    due.setdefault(offset, []).append(card)
+            queue = relearn
+        daily_reviews.append(reviews)
+
+    mean_recall = sum(learner.recall_probability(card, days) for card in range(cards)) / cards
+    total = sum(daily_reviews)
+    return {
+        "reviews": total,
+        "per_day": total / days,
+        "peak_day": max(daily_reviews),
+        "retention": scheduled_correct / scheduled_reviews if scheduled_reviews else 0.0,
+        "recall_at_end": mean_recall,
+    }
+
+
+def run(cards: int, days: int, algorithms: List[str]):
+    print(f"{cards} cards over {days} days")
+    print(
+        f"{'algorithm':>9} {'grader calls':>13} {'calls/day':>10} {'peak day':>9} "
+        f"{'retention':>10} {'recall at end':>14} {'time (s)':>9}"
+    )
+    baseline = None
+    for algorithm in algorithms:
+        start = time.perf_counter()
+        result = simulate(algorithm, cards, days)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or result["reviews"]
+        print(
+            f"{algorithm:>9} {result['reviews']:>13} {result['per_day']:>10.0f} {result['peak_day']:>9} "
+            f"{result['retention']:>10.1%} {result['recall_at_end']:>14.1%} {elapsed:>9.1f}"
+            f"   ({result['reviews'] / baseline:.0%} of {algorithms[0]})"
+        )
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    cards = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 365
+    run(cards, days, sys.argv[3:] or list(SCHEDULERS))
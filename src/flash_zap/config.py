@@ -5,10 +5,20 @@ Application configuration loading and management.
 # Example configuration
 # You can load from environment variables, .env files, or other sources.
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import List, Optional
+import threading
+
+# The grading rules shared by the single-answer and the batch grading prompt.
+GRADING_RULES = """**Primary Rule: Semantic Equivalence is Key**
+Your primary goal is to check if the user's answer is **semantically equivalent** to the correct answer. If the meaning is the same, the answer is "Correct", even if there are minor grammatical errors, typos, or differences in wording.
+
+**Grading Rules:**
+
+1.  **Grammar and Typos:** Ignore minor grammatical errors (like incorrect noun declension, e.g., "grudzień" vs "grudnia") or small typos, as long as the core meaning of the answer remains clear and unambiguous.
+2.  **Keywords and Names:** If a flashcard asks for a specific keyword or name, a spelling mistake can only be accepted if it's a very minor typo that doesn't create confusion with another term (e.g., "Waszyngton" vs "Waszyngtom" is acceptable, but "Bitwa pod Grunwaldem" vs "Bitwa pod Grunwald" is not).
+3.  **Dates:** If a flashcard asks for a date, the user may provide it in any valid format. This explicitly includes variations in the grammatical case of the month's name. As long as the day, month, and year are correct, the answer should be marked as "Correct".
+"""
 
 class LoggingSettings(BaseSettings):
     """
@@ -25,29 +35,47 @@ class Settings(BaseSettings):
     APP_NAME: str = "FlashZap"
     DEBUG: bool = False
     
-    # Cloud database settings are now the only option
+    # Cloud database settings
     CLOUD_DB_HOST: str
     CLOUD_DB_NAME: str
     CLOUD_DB_USER: str
     CLOUD_DB_PASSWORD: str
 
+    # Cloud database connection pool
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 5
+    # Test pooled connections before use, so a connection dropped by the
+    # server or a NAT timeout is replaced instead of failing the first query.
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_CONNECT_TIMEOUT_SECONDS: int = 10
+    # TCP keepalives stop idle connections from being silently dropped.
+    DB_KEEPALIVES_IDLE_SECONDS: int = 60
+    DB_KEEPALIVES_INTERVAL_SECONDS: int = 10
+    DB_KEEPALIVES_COUNT: int = 5
+
+    # "cloud" works directly on the cloud database. "local" works on a SQLite
+    # replica at LOCAL_DB_PATH that is synced with the cloud in the background.
+    DATABASE_MODE: str = "cloud"
+    LOCAL_DB_PATH: str = "flash_zap_local.db"
+    LOCAL_DB_BUSY_TIMEOUT_SECONDS: float = 10.0
+    SYNC_INTERVAL_SECONDS: float = 60.0
+    SYNC_BATCH_SIZE: int = 1000
+    # Cards changed this many seconds before the last sync are checked again.
+    SYNC_WATERMARK_OVERLAP_SECONDS: float = 300.0
+
     # AI settings
     GEMINI_API_KEY: str = "YOUR_API_KEY_HERE"
     AI_GRADER_MODEL_NAME: str = "gemini-2.5-flash-lite-preview-06-17"
+    AI_GRADER_MAX_WORKERS: int = 4
+    # Gemini client transport: "grpc" (library default) or "rest".
+    AI_GRADER_TRANSPORT: Optional[str] = None
     AI_GRADER_PROMPT_TEMPLATE: str = """
 You are an AI assistant for a flashcard application. Your task is to evaluate a user's answer to a flashcard question.
 
 You must compare the user's answer to the correct answer (the back of the flashcard) and determine if it is "Correct" or "Incorrect".
 
-**Primary Rule: Semantic Equivalence is Key**
-Your primary goal is to check if the user's answer is **semantically equivalent** to the correct answer. If the meaning is the same, the answer is "Correct", even if there are minor grammatical errors, typos, or differences in wording.
-
-**Grading Rules:**
-
-1.  **Grammar and Typos:** Ignore minor grammatical errors (like incorrect noun declension, e.g., "grudzień" vs "grudnia") or small typos, as long as the core meaning of the answer remains clear and unambiguous.
-2.  **Keywords and Names:** If a flashcard asks for a specific keyword or name, a spelling mistake can only be accepted if it's a very minor typo that doesn't create confusion with another term (e.g., "Waszyngton" vs "Waszyngtom" is acceptable, but "Bitwa pod Grunwaldem" vs "Bitwa pod Grunwald" is not).
-3.  **Dates:** If a flashcard asks for a date, the user may provide it in any valid format. This explicitly includes variations in the grammatical case of the month's name. As long as the day, month, and year are correct, the answer should be marked as "Correct".
-
+""" + GRADING_RULES + """
 Provide a brief, helpful feedback message. If the answer was not fully correct, also provide the correct answer or explain what was missing.
 
 Reply in the polish language.
@@ -60,6 +88,69 @@ Reply in the polish language.
 Result: [Correct/Incorrect]
 Feedback: [Your feedback here]
 """
+    AI_GRADER_BATCH_SIZE: int = 20
+    AI_GRADER_BATCH_PROMPT_TEMPLATE: str = """
+You are an AI assistant for a flashcard application. Your task is to evaluate several users' answers to flashcard questions.
+
+For every item, compare the user's answer to the correct answer (the back of the flashcard) and determine if it is "Correct" or "Incorrect".
+
+""" + GRADING_RULES + """
+Provide a brief, helpful feedback message for every item. If the answer was not fully correct, also provide the correct answer or explain what was missing.
+
+Reply in the polish language.
+
+**Items (JSON):**
+{items}
+
+**Output format:**
+Reply with only a JSON array containing one object per item, in any order:
+[{{"index": <item index>, "result": "Correct" or "Incorrect", "feedback": "<your feedback here>"}}]
+"""
+    # Local pre-grader settings
+    LOCAL_GRADER_ENABLED: bool = True
+    LOCAL_GRADER_MAX_EDIT_DISTANCE: int = 1
+    LOCAL_GRADER_MIN_FUZZY_LENGTH: int = 12
+
+    # Grade cache settings
+    GRADE_CACHE_ENABLED: bool = True
+    GRADE_CACHE_MAX_ENTRIES: int = 50000
+    GRADE_CACHE_TTL_DAYS: int = 180
+
+    # Import settings
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_WORKERS: Optional[int] = None
+
+    # Review settings
+    REVIEW_DECK_BATCH_SIZE: int = 200
+    REVIEW_COMMIT_EVERY: int = 20
+    REVIEW_COMMIT_INTERVAL_SECONDS: float = 30.0
+    # "random", "overdue" (longest overdue first), "mastery" (lowest level first) or "id".
+    REVIEW_ORDER: str = "random"
+    # Seed of the "random" order; a new one is drawn for every session if unset.
+    REVIEW_RANDOM_SEED: Optional[int] = None
+    # Daily caps on never-reviewed cards and on all other cards; unlimited if unset.
+    NEW_CARDS_PER_DAY: Optional[int] = None
+    REVIEWS_PER_DAY: Optional[int] = None
+
+    # Review log settings
+    REVIEW_LOG_ENABLED: bool = True
+    REVIEW_LOG_BUFFER_SIZE: int = 500
+    REVIEW_LOG_RETENTION_DAYS: int = 730
+    REVIEW_LOG_ANSWER_RETENTION_DAYS: int = 90
+
+    # Cards per page when browsing or searching cards.
+    BROWSE_PAGE_SIZE: int = 20
+
+    # Days of due counts kept by the due forecast.
+    DUE_FORECAST_DAYS: int = 14
+
+    # Scheduling settings
+    # "linear" (interval = mastery level), "sm2" or "fsrs".
+    SRS_ALGORITHM: str = "linear"
+    SRS_MAXIMUM_INTERVAL_DAYS: int = 36500
+    # Recall probability FSRS aims for on the due date.
+    FSRS_DESIRED_RETENTION: float = 0.9
+
     logging: LoggingSettings = LoggingSettings()
 
     model_config = SettingsConfigDict(env_file=".env")
@@ -80,10 +171,95 @@ def get_database_url() -> str:
     )
 
 
-engine = create_engine(
-    get_database_url(),
-    # The 'client_encoding' arg is specific to PostgreSQL and will cause errors with SQLite in tests
-    # We can check the URL scheme to apply it conditionally.
-    connect_args={"client_encoding": "utf8"} if get_database_url().startswith("postgresql") else {}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def get_local_database_url() -> str:
+    """Returns the URL of the local SQLite replica used in "local" mode."""
+    return f"sqlite:///{settings.LOCAL_DB_PATH}"
+
+
+def create_cloud_engine():
+    """Creates an engine for the cloud database, with the pool configured in Settings."""
+    from sqlalchemy import create_engine
+
+    url = get_database_url()
+    # The connect args and pool options are specific to PostgreSQL and will cause
+    # errors with SQLite in tests, so they are only applied to PostgreSQL URLs.
+    if not url.startswith("postgresql"):
+        return create_engine(url)
+    return create_engine(
+        url,
+        connect_args={
+            "client_encoding": "utf8",
+            "connect_timeout": settings.DB_CONNECT_TIMEOUT_SECONDS,
+            "keepalives": 1,
+            "keepalives_idle": settings.DB_KEEPALIVES_IDLE_SECONDS,
+            "keepalives_interval": settings.DB_KEEPALIVES_INTERVAL_SECONDS,
+            "keepalives_count": settings.DB_KEEPALIVES_COUNT,
+        },
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    )
+
+
+def create_local_engine():
+    """
+    Creates an engine for the local SQLite replica.
+
+    The replica is switched to WAL mode, so the background sync can read it
+    while a review is being committed, and writers wait up to
+    LOCAL_DB_BUSY_TIMEOUT_SECONDS for each other instead of failing with
+    "database is locked".
+    """
+    from sqlalchemy import create_engine, event
+
+    engine = create_engine(get_local_database_url())
+
+    @event.listens_for(engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.LOCAL_DB_BUSY_TIMEOUT_SECONDS * 1000)}")
+        cursor.close()
+
+    return engine
+
+
+# The engine and session factory are created on first use rather than at import,
+# so starting the application does not pay for SQLAlchemy and driver setup
+# before the main menu is drawn.
+_engine = None
+_session_factory = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Returns the application's engine for the configured DATABASE_MODE, creating it on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_local_engine() if settings.DATABASE_MODE == "local" else create_cloud_engine()
+    return _engine
+
+
+def get_session_factory():
+    """Returns the sessionmaker bound to `get_engine()`, creating it on first use."""
+    global _session_factory
+    if _session_factory is None:
+        from sqlalchemy.orm import sessionmaker
+
+        engine = get_engine()
+        with _engine_lock:
+            if _session_factory is None:
+                _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return _session_factory
+
+
+def __getattr__(name: str):
+    # Keeps `config.engine` and `config.SessionLocal` working, created lazily.
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
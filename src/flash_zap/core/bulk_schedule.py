@@ -0,0 +1,156 @@
+from datetime import date, datetime, timezone
+from typing import Dict, Iterator, List, Optional, Sequence
+import logging
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from flash_zap.models.card import Card
+from flash_zap.services.due_forecast import invalidate_due_forecast
+from flash_zap.services.schedulers import STATE_COLUMNS, ReviewState
+from flash_zap.services.srs_engine import SRSEngine
+
+# Ids per IN (...) list, well below SQLite's limit on bound parameters.
+_ID_CHUNK_SIZE = 5000
+
+_cards = Card.__table__
+
+
+def id_chunks(card_ids: Sequence[int]) -> Iterator[Sequence[int]]:
+    """Splits ids into chunks small enough for one IN (...) list."""
+    for start in range(0, len(card_ids), _ID_CHUNK_SIZE):
+        yield card_ids[start:start + _ID_CHUNK_SIZE]
+
+
+def update_cards(db_session: Session, values: dict, card_ids: Optional[Sequence[int]], *criteria) -> int:
+    """
+    Runs one set-based UPDATE over all cards, or over `card_ids` in chunks,
+    limited to the rows matching `criteria`. Returns the number of rows updated.
+    """
+    if card_ids is None:
+        return db_session.execute(update(_cards).where(*criteria).values(values)).rowcount
+    updated = 0
+    for chunk in id_chunks(card_ids):
+        updated += db_session.execute(
+            update(_cards).where(_cards.c.id.in_(chunk), *criteria).values(values)
+        ).rowcount
+    return updated
+
+
+def _add_days(db_session: Session, column, days: int):
+    """Date arithmetic on a DATE column, in the dialect of the session's database."""
+    if db_session.get_bind().dialect.name == "sqlite":
+        return func.date(column, f"{days:+d} days")
+    return column + days
+
+
+def reset_cards(db_session: Session, card_ids: Optional[Sequence[int]] = None) -> int:
+    """
+    Resets cards to mastery level 0, due today, and clears the scheduling
+    state kept by SM-2 and FSRS, so they are scheduled as new cards.
+
+    Args:
+        card_ids: The cards to reset; every card if omitted.
+
+    Returns:
+        The number of cards reset.
+    """
+    today = datetime.now(timezone.utc).date()
+    new_state = {**vars(ReviewState()), "next_review_date": today}
+    reset = update_cards(db_session, new_state, card_ids)
+    db_session.commit()
+    invalidate_due_forecast()
+    logging.info(f"Reset {reset} cards to mastery level 0.")
+    return reset
+
+
+def shift_due_dates(db_session: Session, days: int, card_ids: Optional[Sequence[int]] = None) -> int:
+    """
+    Moves the next review date of cards by `days` (negative to bring them forward),
+    e.g. to push everything back after a vacation.
+
+    Returns:
+        The number of cards moved.
+    """
+    shifted = update_cards(
+        db_session,
+        {"next_review_date": _add_days(db_session, _cards.c.next_review_date, days)},
+        card_ids,
+    )
+    db_session.commit()
+    invalidate_due_forecast()
+    logging.info(f"Shifted the review dates of {shifted} cards by {days} days.")
+    return shifted
+
+
+def replay_reviews(
+    db_session: Session,
+    card_ids: Sequence[int],
+    outcomes: Sequence[bool],
+    review_dates: Optional[Sequence[date]] = None,
+) -> int:
+    """
+    Applies a log of reviews, in order, without loading cards as ORM objects.
+
+    Current scheduling states are read with plain SELECTs, the log is scheduled
+    with `SRSEngine.schedule_many` one round at a time (a card reviewed several
+    times is advanced once per round), and the final state of every card is
+    written back with a single executemany UPDATE.
+
+    Args:
+        card_ids: The reviewed card of each log entry.
+        outcomes: Whether each review was correct.
+        review_dates: The day of each review; today by default.
+
+    Returns:
+        The number of cards updated.
+    """
+    if not (len(card_ids) == len(outcomes) and (review_dates is None or len(review_dates) == len(card_ids))):
+        raise ValueError("card_ids, outcomes and review_dates must have the same length.")
+    if review_dates is None:
+        review_dates = [datetime.now(timezone.utc).date()] * len(card_ids)
+
+    states: Dict[int, ReviewState] = {}
+    unique_ids = list(dict.fromkeys(card_ids))
+    columns = [_cards.c[name] for name in STATE_COLUMNS]
+    for chunk in id_chunks(unique_ids):
+        for row in db_session.execute(select(_cards.c.id, *columns).where(_cards.c.id.in_(chunk))).mappings():
+            states[row["id"]] = ReviewState(**{name: row[name] for name in STATE_COLUMNS})
+
+    # Split the log into rounds where each card appears at most once, so every
+    # round can be scheduled as one batch while keeping each card's order.
+    rounds: List[List[int]] = []
+    seen: Dict[int, int] = {}
+    for position, card_id in enumerate(card_ids):
+        if card_id not in states:
+            continue
+        round_index = seen.get(card_id, 0)
+        seen[card_id] = round_index + 1
+        if round_index == len(rounds):
+            rounds.append([])
+        rounds[round_index].append(position)
+
+    srs_engine = SRSEngine()
+    for positions in rounds:
+        ids = [card_ids[position] for position in positions]
+        new_states = srs_engine.schedule_many(
+            [states[card_id] for card_id in ids],
+            [outcomes[position] for position in positions],
+            [review_dates[position] for position in positions],
+        )
+        states.update(zip(ids, new_states))
+
+    if rounds:
+        db_session.execute(
+            update(_cards)
+            .where(_cards.c.id == bindparam("card_id"))
+            .values({name: bindparam(f"new_{name}") for name in STATE_COLUMNS}),
+            [
+                {"card_id": card_id, **{f"new_{name}": getattr(states[card_id], name) for name in STATE_COLUMNS}}
+                for card_id in seen
+            ],
+        )
+    db_session.commit()
+    invalidate_due_forecast()
+    logging.info(f"Replayed {sum(seen.values())} reviews over {len(seen)} cards.")
+    return len(seen)
@@ -0,0 +1,83 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+import logging
+
+from sqlalchemy.orm import Session
+
+from flash_zap.config import settings
+from flash_zap.core.card_manager import CardListPage, list_cards_page
+
+
+class CardListPager:
+    """
+    Scrolls through every card one page at a time.
+
+    Only the visible page and one prefetched page are held in memory. After a
+    page is shown, the next page in the direction of scrolling is loaded on a
+    background thread with its own session from `session_factory`, so moving
+    on is usually instant. Pages come from `card_manager.list_cards_page`, so
+    each one costs the same short keyset query however far into the list it is.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], page_size: Optional[int] = None):
+        self._session_factory = session_factory
+        self._page_size = page_size or settings.BROWSE_PAGE_SIZE
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # The prefetched page and the (after_id, before_id) it was requested for.
+        self._prefetch: Optional[Tuple[Tuple[Optional[int], Optional[int]], Future]] = None
+        self.page = self._load(None, None)
+        self._start_prefetch()
+
+    def _fetch(self, after_id: Optional[int], before_id: Optional[int]) -> CardListPage:
+        with self._session_factory() as session:
+            page = list_cards_page(session, after_id=after_id, before_id=before_id, limit=self._page_size)
+        logging.debug(f"Loaded the card list page with ids {page.first_id} to {page.last_id}.")
+        return page
+
+    def _load(self, after_id: Optional[int], before_id: Optional[int]) -> CardListPage:
+        if self._prefetch is not None:
+            key, future = self._prefetch
+            self._prefetch = None
+            if key == (after_id, before_id):
+                return future.result()
+            future.cancel()
+        return self._fetch(after_id, before_id)
+
+    def _start_prefetch(self, forward: bool = True) -> None:
+        if forward and self.page.has_next:
+            key = (self.page.last_id, None)
+        elif not forward and self.page.has_previous:
+            key = (None, self.page.first_id)
+        else:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="card-list")
+        self._prefetch = (key, self._executor.submit(self._fetch, *key))
+
+    def next_page(self) -> CardListPage:
+        """Moves to the next page, if there is one, and returns the current page."""
+        if self.page.has_next:
+            self.page = self._load(self.page.last_id, None)
+            self._start_prefetch(forward=True)
+        return self.page
+
+    def previous_page(self) -> CardListPage:
+        """Moves to the previous page, if there is one, and returns the current page."""
+        if self.page.has_previous:
+            self.page = self._load(None, self.page.first_id)
+            self._start_prefetch(forward=False)
+        return self.page
+
+    def reload(self) -> CardListPage:
+        """Reads the current page again, e.g. after one of its cards was edited."""
+        if self.page.items:
+            self.page = self._fetch(self.page.first_id - 1, None)
+        return self.page
+
+    def close(self) -> None:
+        if self._prefetch is not None:
+            self._prefetch[1].cancel()
+            self._prefetch = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
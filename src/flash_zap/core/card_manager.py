@@ -1,41 +1,475 @@
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import (
+    DateTime, and_, bindparam, column, delete, func, insert, literal, literal_column, or_, select, table, update,
+)
+
+from flash_zap.config import settings
+from flash_zap.core import bulk_schedule
 from flash_zap.models.card import Card
+from flash_zap.models.card_deletion import CardDeletion
+from flash_zap.models.card_search import FTS_TABLE, TSVECTOR_EXPRESSION
+from flash_zap.models.card_tag import CardTag
+from flash_zap.models.grade_cache_entry import GradeCacheEntry
+from flash_zap.models.review import Review
+from flash_zap.services import due_forecast, grade_cache
+from flash_zap.utils.text import card_content_hash
+
+_SEARCH_TERM = re.compile(r"\w+")
+# The longest front or back the cards table holds.
+_MAX_TEXT_LENGTH = Card.__table__.c.front.type.length
 
 def get_card_by_id(session, card_id):
     """
     Retrieves a card from the database by its ID.
+
+    Uses the session's identity map, so a card the session has already
+    loaded is returned without another query.
     """
-    return session.query(Card).filter_by(id=card_id).first()
+    return session.get(Card, card_id)
+
+
+class CardEditor:
+    """
+    Stages edits to one loaded card and saves them with a single commit.
+
+    The setters only record the new values; `front`, `back` and
+    `mastery_level` read through to them, so a view can show the edited card
+    before it is saved. `save` applies every staged edit to the instance the
+    session already holds, without loading it again.
+    """
+
+    def __init__(self, session, card: Card):
+        self.session = session
+        self.card = card
+        self._changes: Dict[str, object] = {}
+
+    @classmethod
+    def for_id(cls, session, card_id) -> Optional["CardEditor"]:
+        card = get_card_by_id(session, card_id)
+        return cls(session, card) if card is not None else None
+
+    @property
+    def front(self) -> str:
+        return self._changes.get("front", self.card.front)
+
+    @property
+    def back(self) -> str:
+        return self._changes.get("back", self.card.back)
+
+    @property
+    def mastery_level(self) -> int:
+        return self._changes.get("mastery_level", self.card.mastery_level)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self._changes)
+
+    def _stage(self, name: str, value) -> None:
+        if value == getattr(self.card, name):
+            self._changes.pop(name, None)
+        else:
+            self._changes[name] = value
+
+    def set_front(self, new_front: str) -> None:
+        self._stage("front", new_front)
+
+    def set_back(self, new_back: str) -> None:
+        self._stage("back", new_back)
+
+    def lower_mastery(self, new_mastery_level: int) -> bool:
+        """Stages a lower mastery level; returns False, staging nothing, if it would be higher."""
+        if new_mastery_level > self.mastery_level:
+            return False
+        self._stage("mastery_level", new_mastery_level)
+        return True
+
+    def discard(self) -> None:
+        self._changes.clear()
+
+    def save(self) -> bool:
+        """
+        Applies the staged edits and commits them, dropping the AI grades
+        cached for the old back if it changed. A new front or back gets a new
+        content hash, so imports compare against the edited text. Returns
+        False if there was nothing to save.
+        """
+        if not self._changes:
+            return False
+        card = self.card
+        old_mastery_level = card.mastery_level
+        if "front" in self._changes or "back" in self._changes:
+            content_hash = card_content_hash(self.front, self.back)
+            self._changes["content_hash"] = _free_content_hashes(self.session, {card.id: content_hash})[card.id]
+        for name, value in self._changes.items():
+            setattr(card, name, value)
+        if "back" in self._changes:
+            grade_cache.invalidate_card(self.session, card.id)
+        self.session.commit()
+        if "mastery_level" in self._changes:
+            due_forecast.card_rescheduled(
+                card.next_review_date, old_mastery_level, card.next_review_date, card.mastery_level
+            )
+        self._changes.clear()
+        return True
+
 
 def update_card_front(session, card_id, new_front):
     """
     Updates the front of a card.
     """
-    card = get_card_by_id(session, card_id)
-    if card:
-        card.front = new_front
-        session.commit()
-    return card
+    editor = CardEditor.for_id(session, card_id)
+    if editor:
+        editor.set_front(new_front)
+        editor.save()
+        return editor.card
+    return None
 
 def update_card_back(session, card_id, new_back):
     """
-    Updates the back of a card.
+    Updates the back of a card and drops the AI grades cached for its old back.
     """
-    card = get_card_by_id(session, card_id)
-    if card:
-        card.back = new_back
-        session.commit()
-    return card
+    editor = CardEditor.for_id(session, card_id)
+    if editor:
+        editor.set_back(new_back)
+        editor.save()
+        return editor.card
+    return None
 
 def update_card_mastery(session, card_id, new_mastery_level):
     """
     Updates the mastery level of a card, ensuring the new level is not higher than the current one.
     """
-    card = get_card_by_id(session, card_id)
-    if card:
-        if new_mastery_level <= card.mastery_level:
-            card.mastery_level = new_mastery_level
-            session.commit()
-            return card, True
+    editor = CardEditor.for_id(session, card_id)
+    if editor:
+        if editor.lower_mastery(new_mastery_level):
+            editor.save()
+            return editor.card, True
         else:
-            return card, False
-    return None, False 
\ No newline at end of file
+            return editor.card, False
+    return None, False
+
+
+@dataclass
+class SearchPage:
+    """One page of ranked search results."""
+    cards: List[Card]
+    page: int
+    page_size: int
+    has_next: bool
+
+
+def _search_terms(query: str) -> List[str]:
+    return _SEARCH_TERM.findall(query.lower())
+
+
+def _sqlite_search(terms: List[str], offset: int, limit: int):
+    # Every term must match, as a word or the start of one. Ranking and paging
+    # happen inside the FTS5 table, so only one page of cards is joined.
+    match = " ".join(f'"{term}"*' for term in terms)
+    fts = table(FTS_TABLE, column("rowid"), column("rank"))
+    ranked = (
+        select(fts.c.rowid, fts.c.rank)
+        .where(literal_column(FTS_TABLE).op("MATCH")(match))
+        .order_by(fts.c.rank, fts.c.rowid)
+        .offset(offset)
+        .limit(limit)
+        .subquery()
+    )
+    return select(Card).join(ranked, ranked.c.rowid == Card.id).order_by(ranked.c.rank, Card.id)
+
+
+def _postgresql_search(terms: List[str], offset: int, limit: int):
+    vector = literal_column(TSVECTOR_EXPRESSION)
+    tsquery = func.to_tsquery(literal_column("'simple'"), " & ".join(f"{term}:*" for term in terms))
+    return (
+        select(Card)
+        .where(vector.op("@@")(tsquery))
+        .order_by(func.ts_rank(vector, tsquery).desc(), Card.id)
+        .offset(offset)
+        .limit(limit)
+    )
+
+
+def _postgresql_similar(query: str, offset: int, limit: int):
+    # `%` is pg_trgm's similarity operator; it uses the trigram indexes.
+    similarity = func.greatest(func.similarity(Card.front, query), func.similarity(Card.back, query))
+    return (
+        select(Card)
+        .where(or_(Card.front.op("%")(query), Card.back.op("%")(query)))
+        .order_by(similarity.desc(), Card.id)
+        .offset(offset)
+        .limit(limit)
+    )
+
+
+def _substring_search(terms: List[str], offset: int, limit: int):
+    return (
+        select(Card)
+        .where(*[or_(Card.front.ilike(f"%{term}%"), Card.back.ilike(f"%{term}%")) for term in terms])
+        .order_by(Card.id)
+        .offset(offset)
+        .limit(limit)
+    )
+
+
+def search_cards(session, query: str, page: int = 1, page_size: Optional[int] = None) -> SearchPage:
+    """
+    Finds cards whose front or back contains every word of `query`, best matches first.
+
+    Words also match as prefixes ("pari" finds "Paris"). On SQLite the FTS5
+    index is used and accents are ignored; on PostgreSQL the tsvector index
+    is used, falling back to trigram similarity when no card contains the
+    words, so misspelled searches still find something. Other databases get
+    a plain substring search.
+
+    Args:
+        page: The page to return, starting at 1.
+        page_size: Cards per page; BROWSE_PAGE_SIZE by default.
+    """
+    page_size = page_size or settings.BROWSE_PAGE_SIZE
+    terms = _search_terms(query)
+    if not terms:
+        return SearchPage([], page, page_size, False)
+
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        searches = [lambda offset, limit: _sqlite_search(terms, offset, limit)]
+    elif dialect == "postgresql":
+        searches = [
+            lambda offset, limit: _postgresql_search(terms, offset, limit),
+            lambda offset, limit: _postgresql_similar(query, offset, limit),
+        ]
+    else:
+        searches = [lambda offset, limit: _substring_search(terms, offset, limit)]
+
+    for search in searches:
+        # One extra row tells whether there is a next page without counting every match.
+        cards = session.scalars(search((page - 1) * page_size, page_size + 1)).all()
+        if cards or (page > 1 and session.scalars(search(0, 1)).first() is not None):
+            break
+    return SearchPage(list(cards[:page_size]), page, page_size, len(cards) > page_size)
+
+
+def search_card_ids(session, query: str) -> List[int]:
+    """Returns the ids of every card `search_cards` finds for `query`, e.g. to edit them in bulk."""
+    ids, page = [], 1
+    while True:
+        results = search_cards(session, query, page=page, page_size=1000)
+        ids.extend(card.id for card in results.cards)
+        if not results.has_next:
+            return ids
+        page += 1
+
+
+class CardListItem(NamedTuple):
+    """The columns of a card shown in the card list, detached from any session."""
+    id: int
+    front: str
+    back: str
+    mastery_level: int
+    next_review_date: date
+
+
+@dataclass
+class CardListPage:
+    """One page of the card list, in id order."""
+    items: List[CardListItem]
+    has_next: bool
+    has_previous: bool
+
+    @property
+    def first_id(self) -> Optional[int]:
+        return self.items[0].id if self.items else None
+
+    @property
+    def last_id(self) -> Optional[int]:
+        return self.items[-1].id if self.items else None
+
+
+def list_cards_page(
+    session, after_id: Optional[int] = None, before_id: Optional[int] = None, limit: Optional[int] = None
+) -> CardListPage:
+    """
+    Returns a page of cards in id order, using keyset pagination.
+
+    The page after `after_id` is read with `WHERE id > after_id ORDER BY id
+    LIMIT n` and the page before `before_id` with the reverse, so every page
+    is a short range scan of the primary key, however deep into the list it
+    is. Only the listed columns are read, as plain rows.
+
+    Args:
+        after_id: Return the cards following this id (the first page if neither id is given).
+        before_id: Return the cards preceding this id.
+        limit: Cards per page; BROWSE_PAGE_SIZE by default.
+    """
+    limit = limit or settings.BROWSE_PAGE_SIZE
+    query = select(Card.id, Card.front, Card.back, Card.mastery_level, Card.next_review_date)
+    if before_id is not None:
+        query = query.where(Card.id < before_id).order_by(Card.id.desc())
+    else:
+        if after_id is not None:
+            query = query.where(Card.id > after_id)
+        query = query.order_by(Card.id)
+    # One extra row tells whether there is another page in the same direction;
+    # a one-row lookup on the primary key tells whether there is one behind.
+    rows = [CardListItem(*row) for row in session.execute(query.limit(limit + 1))]
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if before_id is not None:
+        if not more:
+            # Back at the start of the list: show a full first page.
+            return list_cards_page(session, limit=limit)
+        return CardListPage(rows[::-1], has_next=_has_card(session, Card.id >= before_id), has_previous=True)
+    has_previous = after_id is not None and _has_card(session, Card.id <= after_id)
+    return CardListPage(rows, has_next=more, has_previous=has_previous)
+
+
+def _has_card(session, criterion) -> bool:
+    return session.execute(select(Card.id).where(criterion).limit(1)).first() is not None
+
+
+def bulk_lower_mastery(session, card_ids: Optional[Sequence[int]], new_mastery_level: int) -> int:
+    """
+    Lowers the mastery level of many cards with one UPDATE per chunk of ids
+    (every card if `card_ids` is None).
+
+    As with `update_card_mastery`, a mastery level is never raised: cards
+    already at or below `new_mastery_level` are left out by the WHERE clause.
+
+    Returns:
+        The number of cards changed.
+    """
+    changed = bulk_schedule.update_cards(
+        session, {"mastery_level": new_mastery_level}, card_ids, Card.mastery_level > new_mastery_level
+    )
+    session.commit()
+    due_forecast.invalidate_due_forecast()
+    logging.info(f"Lowered the mastery level of {changed} cards to {new_mastery_level}.")
+    return changed
+
+
+def bulk_reset_schedule(session, card_ids: Optional[Sequence[int]]) -> int:
+    """Resets many cards to mastery level 0, due today; see `bulk_schedule.reset_cards`."""
+    return bulk_schedule.reset_cards(session, card_ids)
+
+
+@dataclass
+class FindReplaceResult:
+    """The outcome of a bulk find and replace."""
+    changed: int
+    # Cards left unchanged because the replacement would not fit in a side.
+    too_long: int
+
+
+def bulk_find_replace(session, card_ids: Optional[Sequence[int]], find: str, replace: str) -> FindReplaceResult:
+    """
+    Replaces every occurrence of `find` with `replace` in the front and back of
+    many cards (every card if `card_ids` is None), case-sensitively. The cards
+    to change are picked in SQL; the new texts and their content hashes are
+    then written with one executemany UPDATE per chunk of ids. A card whose
+    front or back would grow past the column length is left as it is and
+    counted in `too_long`. Cached AI grades of cards whose back changes are
+    dropped.
+    """
+    if not find:
+        raise ValueError("The text to find must not be empty.")
+    new_front = func.replace(Card.front, find, replace)
+    new_back = func.replace(Card.back, find, replace)
+    changes = or_(new_front != Card.front, new_back != Card.back)
+    fits = and_(func.length(new_front) <= _MAX_TEXT_LENGTH, func.length(new_back) <= _MAX_TEXT_LENGTH)
+    too_long = 0
+    to_change: List[int] = []
+    for chunk in [None] if card_ids is None else bulk_schedule.id_chunks(card_ids):
+        in_chunk = [] if chunk is None else [Card.id.in_(chunk)]
+        too_long += session.execute(
+            select(func.count()).select_from(Card).where(changes, ~fits, *in_chunk)
+        ).scalar_one()
+        to_change.extend(session.scalars(select(Card.id).where(changes, fits, *in_chunk)))
+
+    for chunk in bulk_schedule.id_chunks(to_change):
+        edits = {
+            card_id: (front.replace(find, replace), back.replace(find, replace), back != back.replace(find, replace))
+            for card_id, front, back in session.execute(
+                select(Card.id, Card.front, Card.back).where(Card.id.in_(chunk))
+            )
+        }
+        hashes = _free_content_hashes(
+            session, {card_id: card_content_hash(front, back) for card_id, (front, back, _) in edits.items()}
+        )
+        changed_backs = [card_id for card_id, (_, _, back_changed) in edits.items() if back_changed]
+        if changed_backs:
+            session.execute(
+                delete(GradeCacheEntry).where(GradeCacheEntry.card_id.in_(changed_backs)),
+                execution_options={"synchronize_session": False},
+            )
+        session.execute(
+            update(Card.__table__)
+            .where(Card.id == bindparam("card_id"))
+            .values(front=bindparam("new_front"), back=bindparam("new_back"), content_hash=bindparam("new_hash")),
+            [
+                {"card_id": card_id, "new_front": front, "new_back": back, "new_hash": hashes[card_id]}
+                for card_id, (front, back, _) in edits.items()
+            ],
+        )
+    session.commit()
+    logging.info(
+        f"Replaced '{find}' with '{replace}' in {len(to_change)} cards, skipped {too_long} that would be too long."
+    )
+    return FindReplaceResult(len(to_change), too_long)
+
+
+def _free_content_hashes(session, hashes: Dict[int, str]) -> Dict[int, Optional[str]]:
+    """
+    Returns the content hash to store for each edited card: its new hash, or
+    None if another card already holds it, as `content_hash` is unique. Such a
+    card is a duplicate of the other one, which re-imports will match.
+    """
+    holders = dict(session.execute(
+        select(Card.content_hash, Card.id).where(Card.content_hash.in_(set(hashes.values())))
+    ).all())
+    free: Dict[int, Optional[str]] = {}
+    for card_id, content_hash in hashes.items():
+        if holders.setdefault(content_hash, card_id) == card_id:
+            free[card_id] = content_hash
+        else:
+            free[card_id] = None
+    return free
+
+
+def bulk_delete_cards(session, card_ids: Sequence[int]) -> int:
+    """
+    Deletes many cards, with their cached grades, review history and tags, using
+    one DELETE per table and chunk of ids, and records a tombstone for each.
+
+    Returns:
+        The number of cards deleted.
+    """
+    deleted = 0
+    now = datetime.now(timezone.utc)
+    for chunk in bulk_schedule.id_chunks(card_ids):
+        # Tombstones let the sync delete the cards on the other side too.
+        session.execute(insert(CardDeletion).from_select(
+            ["sync_id", "deleted_at"],
+            select(Card.sync_id, literal(now, DateTime(timezone=True))).where(Card.id.in_(chunk)),
+        ))
+        # Dependent rows are deleted explicitly, as SQLite does not enforce
+        # ON DELETE CASCADE unless foreign keys are switched on.
+        for model in (GradeCacheEntry, Review, CardTag):
+            session.execute(
+                delete(model).where(model.card_id.in_(chunk)),
+                execution_options={"synchronize_session": False},
+            )
+        deleted += session.execute(
+            delete(Card).where(Card.id.in_(chunk)),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+    session.commit()
+    due_forecast.invalidate_due_forecast()
+    logging.info(f"Deleted {deleted} cards.")
+    return deleted
+
@@ -0,0 +1,152 @@
+"""
+Decks and tags: grouping cards so that a review session can be scoped to one
+course or topic of a large shared collection.
+
+A card belongs to at most one deck (`cards.deck_id`) and can have any number
+of tags (`card_tags`). Assigning either to many cards at once is set-based,
+like the rest of the bulk operations. Changing a card's deck or tags counts as
+an edit of the card, so that sync copies it.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from flash_zap.core import bulk_schedule
+from flash_zap.models.card import Card
+from flash_zap.models.card_tag import CardTag
+from flash_zap.models.deck import Deck
+
+MAX_DECK_NAME_LENGTH = Deck.__table__.c.name.type.length
+MAX_TAG_LENGTH = CardTag.__table__.c.tag.type.length
+
+
+@dataclass
+class DeckSummary:
+    """A deck with the number of its cards and of those due today."""
+    id: int
+    name: str
+    cards: int
+    due: int
+
+
+def normalize_tags(tags: Iterable[str]) -> List[str]:
+    """Lowercases tags and drops a leading '#', blanks and duplicates, keeping their order."""
+    normalized = (tag.strip().lstrip("#").strip().lower() for tag in tags)
+    return list(dict.fromkeys(tag for tag in normalized if tag))
+
+
+def get_or_create_deck(db_session: Session, name: str) -> Deck:
+    """Returns the deck called `name`, creating and committing it if there is none."""
+    name = name.strip()
+    if not name:
+        raise ValueError("A deck needs a name.")
+    if len(name) > MAX_DECK_NAME_LENGTH:
+        raise ValueError(f"A deck name can be at most {MAX_DECK_NAME_LENGTH} characters long.")
+    deck = db_session.scalars(select(Deck).where(Deck.name == name)).first()
+    if deck is None:
+        deck = Deck(name=name)
+        db_session.add(deck)
+        db_session.commit()
+        logging.info(f"Created deck '{name}' with id {deck.id}.")
+    return deck
+
+
+def list_decks(db_session: Session) -> List[DeckSummary]:
+    """Returns every deck by name, with its card and due counts, from one GROUP BY query."""
+    today = datetime.now(timezone.utc).date()
+    query = (
+        select(
+            Deck.id,
+            Deck.name,
+            func.count(Card.id),
+            func.coalesce(func.sum(case((Card.next_review_date <= today, 1), else_=0)), 0),
+        )
+        .outerjoin(Card, Card.deck_id == Deck.id)
+        .group_by(Deck.id, Deck.name)
+        .order_by(Deck.name)
+    )
+    return [DeckSummary(*row) for row in db_session.execute(query).all()]
+
+
+def move_cards_to_deck(db_session: Session, card_ids: Optional[Sequence[int]], deck_id: Optional[int]) -> int:
+    """
+    Puts cards (every card if `card_ids` is None) into a deck, or takes them
+    out of their deck if `deck_id` is None.
+
+    Returns:
+        The number of cards moved.
+    """
+    moved = bulk_schedule.update_cards(db_session, {"deck_id": deck_id}, card_ids)
+    db_session.commit()
+    logging.info(f"Moved {moved} cards to deck {deck_id}.")
+    return moved
+
+
+def tag_cards(db_session: Session, card_ids: Sequence[int], tags: Iterable[str]) -> int:
+    """
+    Adds tags to cards; tags a card already has are left as they are.
+
+    Returns:
+        The number of tags added.
+
+    Raises:
+        ValueError: If a tag is longer than `MAX_TAG_LENGTH`.
+    """
+    tags = normalize_tags(tags)
+    too_long = [tag for tag in tags if len(tag) > MAX_TAG_LENGTH]
+    if too_long:
+        raise ValueError(f"A tag can be at most {MAX_TAG_LENGTH} characters long: {too_long[0]}")
+    now = datetime.now(timezone.utc)
+    added = 0
+    for chunk in bulk_schedule.id_chunks(card_ids):
+        existing = set(
+            db_session.execute(
+                select(CardTag.card_id, CardTag.tag).where(CardTag.card_id.in_(chunk), CardTag.tag.in_(tags))
+            ).all()
+        )
+        rows = [
+            {"card_id": card_id, "tag": tag}
+            for card_id in chunk for tag in tags
+            if (card_id, tag) not in existing
+        ]
+        if rows:
+            db_session.execute(insert(CardTag), rows)
+            bulk_schedule.update_cards(db_session, {"updated_at": now}, sorted({row["card_id"] for row in rows}))
+            added += len(rows)
+    db_session.commit()
+    logging.info(f"Added {added} tags to {len(card_ids)} cards.")
+    return added
+
+
+def untag_cards(db_session: Session, card_ids: Sequence[int], tags: Iterable[str]) -> int:
+    """
+    Removes tags from cards.
+
+    Returns:
+        The number of tags removed.
+    """
+    tags = normalize_tags(tags)
+    now = datetime.now(timezone.utc)
+    removed = 0
+    for chunk in bulk_schedule.id_chunks(card_ids):
+        criteria = (CardTag.card_id.in_(chunk), CardTag.tag.in_(tags))
+        tagged = db_session.scalars(select(CardTag.card_id).where(*criteria).distinct()).all()
+        if not tagged:
+            continue
+        removed += db_session.execute(
+            delete(CardTag).where(*criteria), execution_options={"synchronize_session": False}
+        ).rowcount
+        bulk_schedule.update_cards(db_session, {"updated_at": now}, tagged)
+    db_session.commit()
+    logging.info(f"Removed {removed} tags from {len(card_ids)} cards.")
+    return removed
+
+
+def list_tags(db_session: Session) -> List[Tuple[str, int]]:
+    """Returns every tag in use with the number of cards that have it, by tag."""
+    query = select(CardTag.tag, func.count()).group_by(CardTag.tag).order_by(CardTag.tag)
+    return [(tag, count) for tag, count in db_session.execute(query).all()]
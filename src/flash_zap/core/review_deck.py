@@ -0,0 +1,238 @@
+from collections import deque
+from typing import Deque, List, Optional, Set, Tuple
+import logging
+
+from sqlalchemy import BigInteger, and_, cast, func, not_, select, tuple_
+from sqlalchemy.orm import Session
+
+from flash_zap.models.card import Card
+
+REVIEW_ORDERS = ("id", "overdue", "mastery", "random")
+
+MAX_RANDOM_SEED = 2**30
+# Multiplier of the rounds of the integer hash behind the "random" order.
+# Every intermediate value stays below 2**63, so the hash runs on 64-bit
+# integers on SQLite and PostgreSQL alike.
+_HASH_MULTIPLIER = 0x45D9F3B
+_HASH_ROUNDS = 3
+_UINT32 = 2**32
+
+
+def _mix_seed(seed: int) -> int:
+    """Spreads a seed over 32 bits, so that nearby seeds give unrelated orders."""
+    seed = (seed * 0x9E3779B1) % _UINT32
+    seed ^= seed >> 16
+    return (seed * _HASH_MULTIPLIER) % _UINT32
+
+
+def _random_key(seed: int):
+    """
+    A seeded hash of the card id, computed by the database.
+
+    The id is first multiplied by an odd number that depends on the seed, so
+    every seed starts from a different permutation. Each round then folds the
+    high bits into the low ones and multiplies them back up, until the order
+    looks random and has nothing in common with the order of another seed.
+    """
+    mixed = _mix_seed(seed)
+    key = (cast(Card.id, BigInteger) * (mixed % 2**30 | 1) + (mixed >> 7)) % _UINT32
+    for _ in range(_HASH_ROUNDS):
+        key = (key + key.op(">>")(16)) * _HASH_MULTIPLIER % _UINT32
+    return key
+
+
+def new_cards_filter():
+    """Returns the WHERE criterion selecting cards that have never been reviewed."""
+    return and_(Card.last_review_date.is_(None), Card.mastery_level == 0)
+
+
+def order_keys(order: str, seed: Optional[int] = None) -> list:
+    """
+    Returns the ORDER BY keys of a review order, each ending with the card id
+    so that they identify a card and can be used as a keyset.
+
+    - "id": the order the cards were added in.
+    - "overdue": the longest overdue first.
+    - "mastery": the lowest mastery level first, then the longest overdue.
+    - "random": a pseudo-random order, the same for the same `seed`.
+    """
+    if order == "id":
+        return [Card.id]
+    if order == "overdue":
+        return [Card.next_review_date, Card.id]
+    if order == "mastery":
+        return [Card.mastery_level, Card.next_review_date, Card.id]
+    if order == "random":
+        return [_random_key((seed or 0) % MAX_RANDOM_SEED), Card.id]
+    raise ValueError(f"Unknown review order '{order}'. Choose one of: {', '.join(REVIEW_ORDERS)}.")
+
+
+class _Stream:
+    """One query of the deck: its criterion, how many cards it may deal and where it stopped."""
+
+    def __init__(self, criterion, limit: Optional[int]):
+        self.criterion = criterion
+        self.limit = limit
+        self.dealt = 0
+        self.last_key: Optional[Tuple] = None
+        # The ids still to deal, when the order is drawn up front.
+        self.ids: Optional[Deque[int]] = None
+
+
+class DueCardDeck:
+    """
+    A lazily loaded review deck.
+
+    Due cards are fetched from the database in keyset-paginated batches
+    (`WHERE key > last_key ORDER BY key LIMIT n`, where the key is the review
+    `order`), so only a bounded window of `Card` objects is held in memory at
+    any time. Cards that have to be reviewed again in the same session are
+    kept in a separate queue and come back once the database stream is
+    exhausted, just like appending them to the end of a list.
+
+    With a `review_limit` or `new_limit`, cards already reviewed before are
+    dealt first, then new ones, and each stream stops after its limit: the
+    LIMIT of the last batch is cut down so that no card beyond it is loaded.
+
+    The "random" order is the exception: its key is a hash the database would
+    have to compute and sort for every due card in every batch, so the ids are
+    drawn once, with one `ORDER BY key LIMIT limit` query per stream, and the
+    cards are then loaded by id a batch at a time.
+    """
+
+    def __init__(
+        self,
+        db_session: Session,
+        criterion,
+        batch_size: int = 200,
+        order: str = "id",
+        seed: Optional[int] = None,
+        new_limit: Optional[int] = None,
+        review_limit: Optional[int] = None,
+    ):
+        self._db = db_session
+        self._keys = order_keys(order, seed)
+        self._batch_size = batch_size
+        if new_limit is None and review_limit is None:
+            streams = [_Stream(criterion, None)]
+        else:
+            new_cards = new_cards_filter()
+            streams = [
+                _Stream(and_(criterion, not_(new_cards)), review_limit),
+                _Stream(and_(criterion, new_cards), new_limit),
+            ]
+        if order == "random":
+            for stream in streams:
+                stream.ids = self._draw_ids(stream)
+        self._streams: Deque[_Stream] = deque(streams)
+        self._window: Deque[Card] = deque()
+        self._requeued: Deque[Card] = deque()
+        self._requeued_ids: Set[int] = set()
+        self._remaining = sum(self._count(stream) for stream in self._streams)
+        logging.info(f"Review deck created with {self._remaining} due cards in {order} order.")
+
+    def _draw_ids(self, stream: _Stream) -> Deque[int]:
+        query = select(Card.id).where(stream.criterion).order_by(*self._keys)
+        if stream.limit is not None:
+            query = query.limit(max(stream.limit, 0))
+        return deque(self._db.scalars(query).all())
+
+    def _count(self, stream: _Stream) -> int:
+        if stream.ids is not None:
+            return len(stream.ids)
+        if stream.limit is None:
+            query = select(func.count()).select_from(Card).where(stream.criterion)
+        else:
+            limited = select(Card.id).where(stream.criterion).limit(max(stream.limit, 0)).subquery()
+            query = select(func.count()).select_from(limited)
+        return self._db.execute(query).scalar_one()
+
+    def __len__(self) -> int:
+        return self._remaining
+
+    def peek(self) -> Optional[Card]:
+        """Returns the card at the front of the deck without removing it."""
+        self._fill_window()
+        if not self._window:
+            return None
+        return self._window[0]
+
+    def pop_front(self) -> Card:
+        """Removes and returns the card at the front of the deck."""
+        self._fill_window()
+        card = self._window.popleft()
+        self._remaining -= 1
+        return card
+
+    def push_back(self, card: Card) -> None:
+        """Puts a card at the back of the deck to be reviewed again."""
+        self._requeued.append(card)
+        self._requeued_ids.add(card.id)
+        self._remaining += 1
+
+    def _fill_window(self) -> None:
+        if self._window:
+            return
+        batch = self._fetch_batch()
+        if batch:
+            self._window.extend(batch)
+            return
+        if self._requeued:
+            self._window, self._requeued = self._requeued, deque()
+            self._requeued_ids.clear()
+
+    def _keyset_after(self, last_key: Tuple):
+        if len(self._keys) == 1:
+            return self._keys[0] > last_key[0]
+        return tuple_(*self._keys) > tuple_(*last_key)
+
+    def _fetch_batch(self) -> List[Card]:
+        while self._streams:
+            stream = self._streams[0]
+            size = self._batch_size if stream.limit is None else min(self._batch_size, stream.limit - stream.dealt)
+            if size <= 0:
+                self._streams.popleft()
+                continue
+            if stream.ids is not None:
+                cards = self._fetch_drawn(stream, size)
+            else:
+                cards = self._fetch_keyset(stream, size)
+            if cards is None:
+                self._streams.popleft()
+                continue
+            # A card reviewed earlier in the session can sort after the keyset
+            # position once its new schedule is committed. It only still
+            # matches the criterion if it is due again today, and then it is
+            # already waiting in the requeue.
+            batch = [card for card in cards if card.id not in self._requeued_ids]
+            stream.dealt += len(batch)
+            if batch:
+                logging.debug(f"Fetched {len(batch)} due cards.")
+                return batch
+        return []
+
+    def _fetch_keyset(self, stream: _Stream, size: int) -> Optional[List[Card]]:
+        """Loads the next `size` cards after the stream's keyset position; None at its end."""
+        query = select(Card, *self._keys).where(stream.criterion)
+        if stream.last_key is not None:
+            query = query.where(self._keyset_after(stream.last_key))
+        query = query.order_by(*self._keys).limit(size)
+        # Cards reviewed so far are either behind the keyset position or
+        # skipped by the caller, so there is no need to flush their pending changes.
+        with self._db.no_autoflush:
+            rows = self._db.execute(query).all()
+        if not rows:
+            return None
+        stream.last_key = tuple(rows[-1][1:])
+        return [row[0] for row in rows]
+
+    def _fetch_drawn(self, stream: _Stream, size: int) -> Optional[List[Card]]:
+        """Loads the next `size` drawn cards in their drawn order; None once all are dealt."""
+        if not stream.ids:
+            return None
+        chunk = [stream.ids.popleft() for _ in range(min(size, len(stream.ids)))]
+        # The criterion drops cards that stopped being due since the draw.
+        query = select(Card).where(Card.id.in_(chunk), stream.criterion)
+        with self._db.no_autoflush:
+            cards = {card.id: card for card in self._db.scalars(query)}
+        return [cards[card_id] for card_id in chunk if card_id in cards]
@@ -1,67 +1,315 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait as futures_wait
+from dataclasses import dataclass
 from datetime import date, datetime, timezone
-from sqlalchemy import or_, func
+from sqlalchemy import and_, func, select
 from sqlalchemy.orm import Session
-from typing import Set, Tuple, List
+from typing import Dict, Optional, Sequence, Set, Tuple, List
 import logging
 import random
+import time
 
+from flash_zap.core.exceptions import AIGraderError
+from flash_zap.core.review_deck import MAX_RANDOM_SEED, DueCardDeck
 from flash_zap.models.card import Card
+from flash_zap.models.card_tag import CardTag
 from flash_zap.services import ai_grader
+from flash_zap.services.grade_cache import GradeCache
+from flash_zap.services.local_grader import LocalGrader
+from flash_zap.services.review_log import ReviewLogWriter, studied_today
 from flash_zap.services.srs_engine import SRSEngine
 from flash_zap import config
 
 
+def due_cards_filter(today: date, deck_id: Optional[int] = None, tags: Optional[Sequence[str]] = None):
+    """
+    Returns the WHERE criterion selecting cards that are due for review on `today`,
+    optionally only those in one deck and/or with any of the given tags.
+
+    `next_review_date` is NOT NULL, so this is a single range condition that can
+    be answered from the `ix_cards_next_review_date_id` index, or from
+    `ix_cards_deck_id_next_review_date` when scoped to a deck. Tags are matched
+    through `ix_card_tags_tag_card_id`.
+    """
+    criterion = Card.next_review_date <= today
+    if deck_id is not None:
+        criterion = and_(Card.deck_id == deck_id, criterion)
+    if tags:
+        criterion = and_(criterion, Card.id.in_(select(CardTag.card_id).where(CardTag.tag.in_(tags))))
+    return criterion
+
+
+@dataclass
+class GradedAnswer:
+    """The outcome of a background grade, applied to its card."""
+    card: Card
+    user_answer: str
+    grade: Optional[str] = None
+    feedback: Optional[str] = None
+    old_mastery_level: Optional[int] = None
+    error: Optional[AIGraderError] = None
+
+
 class ReviewSession:
-    def __init__(self, db_session: Session, shuffle: bool = True):
+    def __init__(
+        self,
+        db_session: Session,
+        order: Optional[str] = None,
+        grader: Optional[ai_grader.AIGrader] = None,
+        pre_grader: Optional[LocalGrader] = None,
+        grade_cache: Optional[GradeCache] = None,
+        review_log: Optional[ReviewLogWriter] = None,
+        commit_every: Optional[int] = None,
+        commit_interval: Optional[float] = None,
+        deck_id: Optional[int] = None,
+        tags: Optional[Sequence[str]] = None,
+    ):
+        """
+        Review progress is written behind: SRS changes stay in the session's
+        unit of work and are committed together, as one batched UPDATE, after
+        `commit_every` graded cards or `commit_interval` seconds (checked when
+        a grade is applied), and always by `commit_changes` and `close`.
+
+        If a `review_log` is given, every applied grade is appended to it and
+        the log is flushed in the same commit as the progress it records.
+
+        `deck_id` and `tags` limit the session to the due cards of one deck
+        and/or with any of the tags; see `due_cards_filter`. Cards are dealt
+        in the review `order` (REVIEW_ORDER by default), up to what is left
+        of today's NEW_CARDS_PER_DAY and REVIEWS_PER_DAY.
+        """
         self._db = db_session
+        self._grader = grader
+        self._pre_grader = pre_grader
+        self._grade_cache = grade_cache
+        self._review_log = review_log
         self._srs_engine = SRSEngine()
-        self._review_deck: List[Card] = self._get_due_cards(shuffle)
+        self._deck_id = deck_id
+        self._tags = list(tags) if tags else None
+        self._review_deck = self._get_due_cards(order or config.settings.REVIEW_ORDER)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[Future, Tuple[Card, str, str]] = {}
+        self._commit_every = config.settings.REVIEW_COMMIT_EVERY if commit_every is None else commit_every
+        self._commit_interval = (
+            config.settings.REVIEW_COMMIT_INTERVAL_SECONDS if commit_interval is None else commit_interval
+        )
+        self._uncommitted = 0
+        self._first_uncommitted_at: Optional[float] = None
 
-    def _get_due_cards(self, shuffle: bool = True) -> List[Card]:
+    def _get_due_cards(self, order: str) -> DueCardDeck:
+        settings = config.settings
         today = datetime.now(timezone.utc).date()
-        due_cards = self._db.query(Card).filter(
-            or_(Card.next_review_date <= today, Card.next_review_date == None)
-        ).all()
-        if shuffle:
-            random.shuffle(due_cards)
-        return due_cards
+        new_limit, review_limit = settings.NEW_CARDS_PER_DAY, settings.REVIEWS_PER_DAY
+        if new_limit is not None or review_limit is not None:
+            new_today, reviews_today = studied_today(self._db, today)
+            if new_limit is not None:
+                new_limit = max(new_limit - new_today, 0)
+            if review_limit is not None:
+                review_limit = max(review_limit - reviews_today, 0)
+        seed = settings.REVIEW_RANDOM_SEED
+        if seed is None:
+            seed = random.randrange(MAX_RANDOM_SEED)
+        return DueCardDeck(
+            self._db,
+            due_cards_filter(today, self._deck_id, self._tags),
+            batch_size=settings.REVIEW_DECK_BATCH_SIZE,
+            order=order,
+            seed=seed,
+            new_limit=new_limit,
+            review_limit=review_limit,
+        )
 
     @property
     def remaining_cards_count(self) -> int:
-        return len(self._review_deck)
+        # Cards waiting for a grade may still come back if they are demoted to level 0.
+        return len(self._review_deck) + len(self._pending)
+
+    @property
+    def has_pending_grades(self) -> bool:
+        return bool(self._pending)
 
     def get_next_card(self) -> Card | None:
-        if not self._review_deck:
-            return None
-        return self._review_deck[0]
+        return self._review_deck.peek()
 
     def process_answer(self, card: Card, user_answer: str) -> Tuple[str, str]:
+        local_result = self._grade_locally(card, user_answer)
+        if local_result is not None:
+            return local_result
+        grade, feedback, elapsed = self._timed_grade(card.front, user_answer, card.back)
+        self._remember_grade(card.id, card.back, user_answer, grade, feedback, elapsed)
+        return grade, feedback
+
+    def _grade_locally(self, card: Card, user_answer: str) -> Optional[Tuple[str, str]]:
+        """Grades without the AI, from the pre-grader or the grade cache, if possible."""
+        if self._pre_grader is not None:
+            result = self._pre_grader.grade_answer(card.front, user_answer, card.back)
+            if result is not None:
+                return result
+        if self._grade_cache is not None:
+            return self._grade_cache.get(card.id, card.back, user_answer)
+        return None
+
+    def _remember_grade(
+        self, card_id: int, correct_answer: str, user_answer: str, grade: str, feedback: str, elapsed: float
+    ) -> None:
+        if self._grade_cache is not None:
+            self._grade_cache.put(card_id, correct_answer, user_answer, grade, feedback, elapsed)
+
+    def _timed_grade(self, question: str, user_answer: str, correct_answer: str) -> Tuple[str, str, float]:
+        start = time.perf_counter()
+        grade, feedback = self._grade(question, user_answer, correct_answer)
+        return grade, feedback, time.perf_counter() - start
+
+    def _grade(self, question: str, user_answer: str, correct_answer: str) -> Tuple[str, str]:
+        if self._grader is not None:
+            return self._grader.grade_answer(question, user_answer, correct_answer)
         return ai_grader.grade_answer(
-            question=card.front,
+            question=question,
             user_answer=user_answer,
-            correct_answer=card.back,
+            correct_answer=correct_answer,
         )
 
     def grade_and_update_card(self, card: Card, user_answer: str) -> Tuple[str, str, int]:
+        start = time.perf_counter()
         grade, feedback = self.process_answer(card, user_answer)
+        elapsed = time.perf_counter() - start
         logging.info(f"AI graded card id {card.id} as '{grade}'.")
 
-        old_mastery_level = card.mastery_level
+        # Take the card off the front of the deck before the SRS engine changes it,
+        # so an autoflush triggered by loading the next batch sees a consistent deck.
+        self._review_deck.pop_front()
+        old_mastery_level = self._apply_grade(card, grade, user_answer, elapsed)
+
+        self._commit_if_due()
+        return grade, feedback, old_mastery_level
+
+    def submit_answer(self, card: Card, user_answer: str) -> None:
+        """
+        Takes the card off the deck and grades the answer in the background.
 
+        The grade is applied to the card later, on the calling thread, by
+        `collect_graded_answers`. Only plain strings are handed to the worker,
+        so the database session is never touched off the calling thread.
+        """
+        self._review_deck.pop_front()
+        question, correct_answer = card.front, card.back
+        local_result = self._grade_locally(card, user_answer)
+        if local_result is not None:
+            future = Future()
+            future.set_result((*local_result, None))
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=config.settings.AI_GRADER_MAX_WORKERS,
+                    thread_name_prefix="ai-grader",
+                )
+            future = self._executor.submit(self._timed_grade, question, user_answer, correct_answer)
+        self._pending[future] = (card, user_answer, correct_answer)
+        logging.info(f"Submitted answer for card id {card.id} for background grading.")
+
+    def collect_graded_answers(self, wait: bool = False) -> List[GradedAnswer]:
+        """
+        Applies every background grade that has arrived and returns the outcomes.
+
+        Grades may complete in any order; each is applied to the card it was
+        submitted for. If `wait` is true, blocks until at least one grade is ready.
+        A card whose grading failed is put back at the end of the deck.
+        """
+        if not self._pending:
+            return []
+        if wait:
+            done, _ = futures_wait(list(self._pending), return_when=FIRST_COMPLETED)
+        else:
+            done = [future for future in self._pending if future.done()]
+
+        results = []
+        for future in done:
+            card, user_answer, correct_answer = self._pending.pop(future)
+            try:
+                grade, feedback, elapsed = future.result()
+            except AIGraderError as e:
+                logging.error(f"Background grading failed for card id {card.id}.", exc_info=True)
+                self._review_deck.push_back(card)
+                results.append(GradedAnswer(card=card, user_answer=user_answer, error=e))
+                continue
+            logging.info(f"AI graded card id {card.id} as '{grade}'.")
+            if elapsed is not None:
+                self._remember_grade(card.id, correct_answer, user_answer, grade, feedback, elapsed)
+            old_mastery_level = self._apply_grade(card, grade, user_answer, elapsed or 0.0)
+            results.append(GradedAnswer(card, user_answer, grade, feedback, old_mastery_level))
+
+        if any(result.error is None for result in results):
+            self._commit_if_due()
+        return results
+
+    def wait_for_pending_grades(self) -> List[GradedAnswer]:
+        """Blocks until every submitted answer is graded and applies the results."""
+        results = []
+        while self._pending:
+            results.extend(self.collect_graded_answers(wait=True))
+        return results
+
+    @property
+    def uncommitted_count(self) -> int:
+        """The number of graded cards whose progress is not committed yet."""
+        return self._uncommitted
+
+    def commit_changes(self) -> None:
+        """Commits every review change made so far."""
+        if self._uncommitted:
+            logging.info(f"Committing review progress for {self._uncommitted} cards.")
+        if self._review_log is not None:
+            self._review_log.flush()
+        self._db.commit()
+        self._uncommitted = 0
+        self._first_uncommitted_at = None
+
+    def _commit_if_due(self) -> None:
+        if self._uncommitted >= self._commit_every or (
+            self._first_uncommitted_at is not None
+            and time.monotonic() - self._first_uncommitted_at >= self._commit_interval
+        ):
+            self.commit_changes()
+
+    def close(self) -> None:
+        """
+        Applies any outstanding grades, commits all review progress and
+        releases the grading workers.
+
+        The commit happens even if waiting for grades is interrupted (e.g. by
+        Ctrl+C) or fails, so answers already graded are never lost.
+        """
+        try:
+            self.wait_for_pending_grades()
+        finally:
+            try:
+                self.commit_changes()
+                if self._grade_cache is not None:
+                    self._grade_cache.evict()
+                    self._db.commit()
+                if self._review_log is not None:
+                    self._review_log.compact()
+                    self._db.commit()
+            finally:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+
+    def _apply_grade(self, card: Card, grade: str, user_answer: str, latency_seconds: float) -> int:
+        self._uncommitted += 1
+        if self._first_uncommitted_at is None:
+            self._first_uncommitted_at = time.monotonic()
+        old_mastery_level = card.mastery_level
         if grade == "Correct":
             self._srs_engine.promote_card(card)
-            # Remove card from the front of the deck
-            self._review_deck.pop(0)
         else:
             self._srs_engine.demote_card(card)
             # If mastery level drops to 0, it needs immediate re-review in this session.
             if card.mastery_level == 0:
                 # Move card to the back of the deck to be reviewed again.
-                card_to_review_again = self._review_deck.pop(0)
-                self._review_deck.append(card_to_review_again)
-            else:
-                # Otherwise, remove from session and it will be reviewed on its next scheduled date.
-                self._review_deck.pop(0)
-        
-        self._db.commit()
-        return grade, feedback, old_mastery_level 
\ No newline at end of file
+                self._review_deck.push_back(card)
+            # Otherwise, it will be reviewed on its next scheduled date.
+        if self._review_log is not None:
+            self._review_log.append(
+                card.id, user_answer, grade, old_mastery_level, card.mastery_level, latency_seconds
+            )
+        return old_mastery_level
@@ -1,19 +1,65 @@
-from sqlalchemy import Column, Integer, String, Date
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import date, datetime, timezone
 from typing import Optional
+import uuid
 
+from flash_zap.models import card_search
 from flash_zap.models.base import Base
+from flash_zap.models.server_clock import server_now
+# cards.deck_id references decks, so the table must be registered with it.
+from flash_zap.models.deck import Deck  # noqa: F401
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def new_sync_id() -> str:
+    return str(uuid.uuid4())
 
 
 class Card(Base):
     __tablename__ = "cards"
+    __table_args__ = (
+        # Covers the due-card lookup in ReviewSession: range scan on the date,
+        # with the id available in the index for ordering and keyset paging.
+        Index("ix_cards_next_review_date_id", "next_review_date", "id"),
+        # The same lookup scoped to one deck, so its cost follows the size of
+        # the deck rather than of the whole collection.
+        Index("ix_cards_deck_id_next_review_date", "deck_id", "next_review_date", "id"),
+        # Fingerprint of the imported content; deduplicating imports skip or
+        # update cards that are already in the collection.
+        Index("ix_cards_content_hash", "content_hash", unique=True),
+        # Identify a card across the local replica and the cloud database, and
+        # find the cards changed since the last sync.
+        Index("ix_cards_sync_id", "sync_id", unique=True),
+        Index("ix_cards_changed_at", "changed_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     front: Mapped[str] = mapped_column(String(200))
     back: Mapped[str] = mapped_column(String(200))
     mastery_level: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     next_review_date: Mapped[date] = mapped_column(Date, default=lambda: datetime.now(timezone.utc).date(), nullable=False)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    sync_id: Mapped[str] = mapped_column(String(36), default=new_sync_id, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=_utcnow, onupdate=_utcnow, nullable=False
+    )
+    # When this database last stored a change to the card, by its own clock.
+    # Unlike `updated_at`, which travels with the card and decides conflicts,
+    # it is never copied by a sync, so the sync watermarks can rely on it.
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=server_now(), onupdate=server_now(), nullable=False
+    )
+    # Scheduling state kept for the SM-2 and FSRS algorithms; see services/schedulers.py.
+    ease_factor: Mapped[float] = mapped_column(Float, default=2.5, server_default=text("2.5"), nullable=False)
+    interval_days: Mapped[int] = mapped_column(Integer, default=0, server_default=text("0"), nullable=False)
+    stability: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    difficulty: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    last_review_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    deck_id: Mapped[Optional[int]] = mapped_column(ForeignKey("decks.id", ondelete="SET NULL"), nullable=True)
 
     def __init__(self, front: str, back: str, mastery_level: int = 0, next_review_date: Optional[date] = None):
         self.front = front
@@ -26,4 +72,7 @@ class Card(Base):
 
     def __repr__(self) -> str:
         return (f"Card(id={self.id!r}, front={self.front!r}, back={self.back!r}, "
-                f"mastery_level={self.mastery_level!r}, next_review_date={self.next_review_date!r})") 
\ No newline at end of file
+                f"mastery_level={self.mastery_level!r}, next_review_date={self.next_review_date!r})")
+
+
+card_search.register(Card.__table__)
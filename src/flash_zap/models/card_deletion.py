@@ -0,0 +1,33 @@
+from sqlalchemy import DateTime, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime, timezone
+
+from flash_zap.models.base import Base
+from flash_zap.models.server_clock import server_now
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class CardDeletion(Base):
+    """
+    A tombstone of a deleted card, so that the sync can delete it on the other
+    side too instead of copying it back.
+    """
+    __tablename__ = "card_deletions"
+    __table_args__ = (
+        Index("ix_card_deletions_changed_at", "changed_at"),
+    )
+
+    sync_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # When the card was deleted; competes with the card's `updated_at` under
+    # last writer wins, so an edit made after the deletion brings it back.
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow, nullable=False)
+    # When this database stored the tombstone, by its own clock; see Card.changed_at.
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=server_now(), onupdate=server_now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"CardDeletion(sync_id={self.sync_id!r}, deleted_at={self.deleted_at!r})"
@@ -0,0 +1,62 @@
+"""
+Full-text search indexes over card fronts and backs.
+
+SQLite uses an FTS5 table, `cards_fts`, that mirrors `cards` through
+triggers. PostgreSQL uses a GIN index on a `tsvector` of both sides and
+`pg_trgm` trigram indexes for misspelled searches. Both are created with the
+`cards` table, and `ensure_search_index` adds them to an existing database
+that does not have them yet. `core.card_manager.search_cards` queries them.
+"""
+from sqlalchemy import Connection, Table, event, inspect, text
+
+FTS_TABLE = "cards_fts"
+# Must match the index expression exactly for PostgreSQL to use the index.
+TSVECTOR_EXPRESSION = "to_tsvector('simple', coalesce(front, '') || ' ' || coalesce(back, ''))"
+
+SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "front, back, content='cards', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON cards BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, front, back) VALUES (new.id, new.front, new.back); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON cards BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, front, back) VALUES ('delete', old.id, old.front, old.back); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF front, back ON cards BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, front, back) VALUES ('delete', old.id, old.front, old.back); "
+    f"INSERT INTO {FTS_TABLE}(rowid, front, back) VALUES (new.id, new.front, new.back); END",
+)
+
+POSTGRESQL_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_cards_search_tsv ON cards USING gin (({TSVECTOR_EXPRESSION}))",
+    "CREATE INDEX IF NOT EXISTS ix_cards_front_trgm ON cards USING gin (front gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_cards_back_trgm ON cards USING gin (back gin_trgm_ops)",
+)
+
+
+def ensure_search_index(connection: Connection) -> None:
+    """Creates the search index for the connection's database if it is missing."""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        if inspect(connection).has_table(FTS_TABLE):
+            return
+        for statement in SQLITE_DDL:
+            connection.exec_driver_sql(statement)
+        # Index the cards that already exist.
+        connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        # Creating the extension needs privileges a migrated database does not need again.
+        if connection.exec_driver_sql("SELECT 1 FROM pg_indexes WHERE indexname = 'ix_cards_search_tsv'").first():
+            return
+        for statement in POSTGRESQL_DDL:
+            connection.exec_driver_sql(statement)
+
+
+def _drop_search_index(target: Table, connection: Connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def register(cards: Table) -> None:
+    """Creates and drops the search index together with the `cards` table."""
+    event.listen(cards, "after_create", lambda target, connection, **kw: ensure_search_index(connection))
+    event.listen(cards, "before_drop", _drop_search_index)
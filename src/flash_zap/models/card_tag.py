@@ -0,0 +1,19 @@
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from flash_zap.models.base import Base
+
+
+class CardTag(Base):
+    """One tag on one card; a card can have any number of tags."""
+    __tablename__ = "card_tags"
+    __table_args__ = (
+        # Finds the cards with a tag; the primary key finds the tags of a card.
+        Index("ix_card_tags_tag_card_id", "tag", "card_id"),
+    )
+
+    card_id: Mapped[int] = mapped_column(ForeignKey("cards.id", ondelete="CASCADE"), primary_key=True)
+    tag: Mapped[str] = mapped_column(String(50), primary_key=True)
+
+    def __repr__(self) -> str:
+        return f"CardTag(card_id={self.card_id!r}, tag={self.tag!r})"
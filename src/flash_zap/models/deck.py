@@ -0,0 +1,15 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from flash_zap.models.base import Base
+
+
+class Deck(Base):
+    """A named group of cards, e.g. one course, that can be reviewed on its own."""
+    __tablename__ = "decks"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"Deck(id={self.id!r}, name={self.name!r})"
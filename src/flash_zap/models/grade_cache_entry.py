@@ -0,0 +1,37 @@
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime, timezone
+
+from flash_zap.models.base import Base
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class GradeCacheEntry(Base):
+    """A stored AI grade for one normalized answer to one version of a card."""
+    __tablename__ = "grade_cache"
+    __table_args__ = (
+        Index(
+            "ix_grade_cache_lookup",
+            "card_id", "back_hash", "answer_hash", "prompt_version",
+            unique=True,
+        ),
+        Index("ix_grade_cache_last_used_at", "last_used_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    card_id: Mapped[int] = mapped_column(ForeignKey("cards.id", ondelete="CASCADE"), nullable=False)
+    back_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    answer_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    prompt_version: Mapped[str] = mapped_column(String(16), nullable=False)
+    result: Mapped[str] = mapped_column(String(16), nullable=False)
+    feedback: Mapped[str] = mapped_column(Text, nullable=False)
+    latency_ms: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow, nullable=False)
+    last_used_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return (f"GradeCacheEntry(id={self.id!r}, card_id={self.card_id!r}, "
+                f"result={self.result!r}, last_used_at={self.last_used_at!r})")
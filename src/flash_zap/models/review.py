@@ -0,0 +1,35 @@
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime, timezone
+from typing import Optional
+
+from flash_zap.models.base import Base
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class Review(Base):
+    """One graded answer to a card, as recorded in the review log."""
+    __tablename__ = "reviews"
+    __table_args__ = (
+        # A card's history in order, e.g. to replay it under another scheduler.
+        Index("ix_reviews_card_id_reviewed_at", "card_id", "reviewed_at"),
+        # Range scans by age, for reporting and for the retention policy.
+        Index("ix_reviews_reviewed_at", "reviewed_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    card_id: Mapped[int] = mapped_column(ForeignKey("cards.id", ondelete="CASCADE"), nullable=False)
+    reviewed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow, nullable=False)
+    # Cleared once the review is older than REVIEW_LOG_ANSWER_RETENTION_DAYS.
+    answer: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    grade: Mapped[str] = mapped_column(String(16), nullable=False)
+    latency_ms: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    old_mastery_level: Mapped[int] = mapped_column(Integer, nullable=False)
+    new_mastery_level: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return (f"Review(id={self.id!r}, card_id={self.card_id!r}, grade={self.grade!r}, "
+                f"reviewed_at={self.reviewed_at!r})")
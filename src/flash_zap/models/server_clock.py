@@ -0,0 +1,30 @@
+"""
+The current time as the database sees it, for columns that must be stamped by
+the database rather than by whichever client wrote the row.
+
+On SQLite the time is rendered in the same text format SQLAlchemy stores
+datetimes in, so that stamps compare correctly with bound datetime values.
+"""
+from sqlalchemy import DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# SQLAlchemy stores SQLite datetimes as "YYYY-MM-DD HH:MM:SS.ffffff"; SQLite's
+# %f only gives milliseconds ("SS.SSS").
+SQLITE_NOW = "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+class server_now(FunctionElement):
+    """The database's current UTC time."""
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(server_now)
+def _compile_server_now(element, compiler, **kw) -> str:
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(server_now, "sqlite")
+def _compile_server_now_sqlite(element, compiler, **kw) -> str:
+    return f"({SQLITE_NOW})"
@@ -0,0 +1,17 @@
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from typing import Optional
+
+from flash_zap.models.base import Base
+
+
+class SyncState(Base):
+    """A sync watermark: the newest `changed_at` already copied in one direction."""
+    __tablename__ = "sync_state"
+
+    name: Mapped[str] = mapped_column(String(32), primary_key=True)
+    watermark: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"SyncState(name={self.name!r}, watermark={self.watermark!r})"
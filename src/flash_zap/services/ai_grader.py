@@ -1,57 +1,242 @@
 """
 This module provides an AI-powered grading service using the Gemini API.
 """
+import json
 import logging
-import google.generativeai as genai
+import threading
+from json import JSONDecodeError
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
 from flash_zap.config import settings
 from flash_zap.core.exceptions import AIGraderError
 
-# The Gemini client will automatically be configured with the API key
-# from the GEMINI_API_KEY environment variable loaded by the settings.
-genai.configure(api_key=settings.GEMINI_API_KEY)
 
-def grade_answer(question: str, user_answer: str, correct_answer: str) -> tuple[str, str]:
+def __getattr__(name: str):
+    # The Gemini SDK takes a large share of startup time, so it is only imported
+    # when a grader is created; `ai_grader.genai` still resolves to it.
+    if name == "genai":
+        import google.generativeai as genai
+        return genai
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class GradingItem(NamedTuple):
+    """One answer to grade in a batch."""
+    question: str
+    correct_answer: str
+    user_answer: str
+
+
+class AIGrader:
     """
-    Grades a user's answer against a correct answer using an AI model.
+    Grades answers with a Gemini model.
+
+    The model and its generation config are built once, when the grader is
+    created. The Gemini SDK keeps one API client per process, so creating a
+    grader (re)configures that shared client with its API key and transport.
+    """
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        api_key: Optional[str] = None,
+        transport: Optional[str] = None,
+    ):
+        import google.generativeai as genai
+
+        genai.configure(
+            api_key=api_key or settings.GEMINI_API_KEY,
+            transport=transport or settings.AI_GRADER_TRANSPORT,
+        )
+        self._generation_config = genai.GenerationConfig(temperature=0.1)
+        self._model = genai.GenerativeModel(
+            model_name or settings.AI_GRADER_MODEL_NAME,
+            generation_config=self._generation_config,
+        )
+
+    def grade_answer(self, question: str, user_answer: str, correct_answer: str) -> tuple[str, str]:
+        """
+        Grades a user's answer against a correct answer using the AI model.
+
+        Args:
+            question: The question that was asked.
+            user_answer: The answer provided by the user.
+            correct_answer: The correct answer for the flashcard.
+
+        Returns:
+            A tuple containing the grade ("Correct" or "Incorrect") and feedback.
+
+        Raises:
+            AIGraderError: If the API call fails or the response is malformed.
+        """
+        prompt = settings.AI_GRADER_PROMPT_TEMPLATE.format(
+            question=question,
+            correct_answer=correct_answer,
+            user_answer=user_answer,
+        )
+
+        try:
+            logging.info("Sending prompt to AI for grading.")
+            logging.debug(f"AI Grader Prompt: {prompt}")
+            response = self._model.generate_content(prompt)
+            logging.info("Received response from AI.")
+            logging.debug(f"AI Grader Response Text: {response.text}")
+
+            lines = response.text.strip().split('\n')
+            if len(lines) < 2 or not lines[0].startswith("Result:") or not lines[1].startswith("Feedback:"):
+                raise AIGraderError("Malformed response from AI grader.")
+
+            result = lines[0].replace("Result:", "").strip()
+            feedback = lines[1].replace("Feedback:", "").strip()
+
+            if result not in ["Correct", "Incorrect"]:
+                raise AIGraderError(f"Unexpected result from AI grader: {result}")
+
+            return result, feedback
+        except Exception as e:
+            logging.error("Error communicating with the AI grader.", exc_info=True)
+            raise AIGraderError(f"An error occurred while grading the answer: {e}")
+
+    def grade_answers(self, items: Sequence[GradingItem]) -> List[Tuple[str, str]]:
+        """
+        Grades several answers with one model request per batch.
+
+        Items are sent in batches of AI_GRADER_BATCH_SIZE, each as a single
+        prompt asking for a JSON array of results. Items whose result is missing
+        or malformed, or every item of a batch whose reply is not a JSON array,
+        are graded one by one with `grade_answer` instead.
+
+        Args:
+            items: (question, correct answer, user answer) triples.
+
+        Returns:
+            A (grade, feedback) tuple for every item, in the order of `items`.
+
+        Raises:
+            AIGraderError: If the API call fails or an item cannot be graded at all.
+        """
+        results: List[Tuple[str, str]] = []
+        batch_size = max(1, settings.AI_GRADER_BATCH_SIZE)
+        for start in range(0, len(items), batch_size):
+            results.extend(self._grade_batch([GradingItem(*item) for item in items[start:start + batch_size]]))
+        return results
+
+    def _grade_batch(self, items: List[GradingItem]) -> List[Tuple[str, str]]:
+        if len(items) == 1:
+            return [self.grade_answer(items[0].question, items[0].user_answer, items[0].correct_answer)]
 
-    Args:
-        question: The question that was asked.
-        user_answer: The answer provided by the user.
-        correct_answer: The correct answer for the flashcard.
+        prompt = settings.AI_GRADER_BATCH_PROMPT_TEMPLATE.format(items=json.dumps(
+            [
+                {
+                    "index": index,
+                    "question": item.question,
+                    "correct_answer": item.correct_answer,
+                    "user_answer": item.user_answer,
+                }
+                for index, item in enumerate(items)
+            ],
+            ensure_ascii=False,
+            indent=2,
+        ))
+
+        try:
+            logging.info(f"Sending batch of {len(items)} answers to AI for grading.")
+            logging.debug(f"AI Grader Batch Prompt: {prompt}")
+            response = self._model.generate_content(prompt)
+            logging.info("Received batch response from AI.")
+            logging.debug(f"AI Grader Batch Response Text: {response.text}")
+            parsed = _parse_batch_response(response.text, len(items))
+        except Exception as e:
+            logging.error("Error communicating with the AI grader.", exc_info=True)
+            raise AIGraderError(f"An error occurred while grading the answers: {e}")
+
+        results = []
+        for index, item in enumerate(items):
+            result = parsed.get(index)
+            if result is None:
+                logging.warning(f"Batch grading returned no valid result for item {index}; grading it on its own.")
+                result = self.grade_answer(item.question, item.user_answer, item.correct_answer)
+            results.append(result)
+        return results
+
+
+def _strip_code_fence(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3]
+    return text.strip()
+
+
+def _parse_batch_response(text: str, item_count: int) -> Dict[int, Tuple[str, str]]:
+    """
+    Extracts the valid per-item results from a batch grading reply.
 
     Returns:
-        A tuple containing the grade ("Correct" or "Incorrect") and feedback.
+        A mapping of item index to (grade, feedback); invalid items, and items
+        the reply grades more than once, are left out.
+    """
+    try:
+        data = json.loads(_strip_code_fence(text))
+    except JSONDecodeError:
+        logging.warning("Batch grading reply is not valid JSON.")
+        return {}
+    if not isinstance(data, list):
+        logging.warning("Batch grading reply is not a JSON array.")
+        return {}
+
+    results = {}
+    seen, repeated = set(), set()
+    for entry in data:
+        if not isinstance(entry, dict):
+            continue
+        index, result, feedback = entry.get("index"), entry.get("result"), entry.get("feedback")
+        # bool is a subclass of int, but `true` is not an item index.
+        if not isinstance(index, int) or isinstance(index, bool) or not 0 <= index < item_count:
+            continue
+        if index in seen:
+            repeated.add(index)
+            continue
+        seen.add(index)
+        if result not in ["Correct", "Incorrect"] or not isinstance(feedback, str):
+            continue
+        results[index] = (result, feedback.strip())
+    # Two grades for one item cannot both be trusted; grade it on its own.
+    for index in repeated:
+        results.pop(index, None)
+    return results
+
+
+_default_grader: Optional[AIGrader] = None
+_default_grader_lock = threading.Lock()
 
-    Raises:
-        AIGraderError: If the API call fails or the response is malformed.
+
+def get_default_grader() -> AIGrader:
+    """
+    Returns the process-wide AIGrader, creating it on first use.
     """
-    model = genai.GenerativeModel(settings.AI_GRADER_MODEL_NAME)
+    global _default_grader
+    if _default_grader is None:
+        with _default_grader_lock:
+            if _default_grader is None:
+                _default_grader = AIGrader()
+    return _default_grader
 
-    prompt = settings.AI_GRADER_PROMPT_TEMPLATE.format(
-        question=question,
-        correct_answer=correct_answer,
-        user_answer=user_answer,
-    )
 
-    try:
-        logging.info("Sending prompt to AI for grading.")
-        logging.debug(f"AI Grader Prompt: {prompt}")
-        generation_config = genai.GenerationConfig(temperature=0.1)
-        response = model.generate_content(prompt, generation_config=generation_config)
-        logging.info("Received response from AI.")
-        logging.debug(f"AI Grader Response Text: {response.text}")
-        
-        lines = response.text.strip().split('\n')
-        if len(lines) < 2 or not lines[0].startswith("Result:") or not lines[1].startswith("Feedback:"):
-            raise AIGraderError("Malformed response from AI grader.")
-
-        result = lines[0].replace("Result:", "").strip()
-        feedback = lines[1].replace("Feedback:", "").strip()
-
-        if result not in ["Correct", "Incorrect"]:
-            raise AIGraderError(f"Unexpected result from AI grader: {result}")
-
-        return result, feedback
-    except Exception as e:
-        logging.error("Error communicating with the AI grader.", exc_info=True)
-        raise AIGraderError(f"An error occurred while grading the answer: {e}") 
\ No newline at end of file
+def grade_answer(question: str, user_answer: str, correct_answer: str) -> tuple[str, str]:
+    """
+    Grades a user's answer with the process-wide AIGrader.
+
+    See `AIGrader.grade_answer` for arguments, return value and errors.
+    """
+    return get_default_grader().grade_answer(question, user_answer, correct_answer)
+
+
+def grade_answers(items: Sequence[GradingItem]) -> List[Tuple[str, str]]:
+    """
+    Grades several answers in batched requests with the process-wide AIGrader.
+
+    See `AIGrader.grade_answers` for arguments, return value and errors.
+    """
+    return get_default_grader().grade_answers(items)
@@ -0,0 +1,186 @@
+"""
+This module forecasts how many cards fall due on each of the coming days.
+
+The forecast is loaded with one GROUP BY query and then kept in memory:
+`SRSEngine` and the card editors report every card they reschedule once it
+is committed, so the main menu can show the counts without querying the
+database again. Bulk changes (imports, bulk rescheduling, sync) simply
+invalidate it.
+
+SQLAlchemy is only imported when the forecast is loaded, so the main menu
+can use the cached forecast without slowing down startup.
+"""
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from flash_zap.config import settings
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+@dataclass
+class DueForecast:
+    """
+    Due card counts by (day, mastery level) for `days` days from `today`.
+
+    Overdue cards are counted as due today.
+    """
+    today: date
+    days: int
+    counts: Dict[Tuple[date, int], int] = field(default_factory=dict)
+
+    @property
+    def horizon(self) -> date:
+        """The first day after the forecast."""
+        return self.today + timedelta(days=self.days)
+
+    def due_on(self, day: date) -> int:
+        return sum(count for (due, _), count in self.counts.items() if due == day)
+
+    @property
+    def due_today(self) -> int:
+        return self.due_on(self.today)
+
+    @property
+    def due_tomorrow(self) -> int:
+        return self.due_on(self.today + timedelta(days=1))
+
+    def per_day(self) -> List[Tuple[date, int]]:
+        """Due counts for every day of the forecast, in order, including days with none."""
+        totals: Dict[date, int] = {}
+        for (due, _), count in self.counts.items():
+            totals[due] = totals.get(due, 0) + count
+        return [(day, totals.get(day, 0)) for day in (self.today + timedelta(days=i) for i in range(self.days))]
+
+    def per_level(self, through: Optional[date] = None) -> Dict[int, int]:
+        """Counts of the cards due by `through` (today by default), by mastery level."""
+        through = through or self.today
+        levels: Dict[int, int] = {}
+        for (due, level), count in self.counts.items():
+            if due <= through:
+                levels[level] = levels.get(level, 0) + count
+        return dict(sorted(levels.items()))
+
+    def _add(self, due: Optional[date], level: int, count: int) -> None:
+        if due is None or due >= self.horizon:
+            return
+        key = (max(due, self.today), level)
+        remaining = self.counts.get(key, 0) + count
+        if remaining > 0:
+            self.counts[key] = remaining
+        else:
+            self.counts.pop(key, None)
+
+    def move(self, old_due: Optional[date], old_level: int, new_due: date, new_level: int) -> None:
+        """Moves one card from its old due day and level to the new ones."""
+        self._add(old_due, old_level, -1)
+        self._add(new_due, new_level, 1)
+
+
+_lock = threading.Lock()
+_cached: Optional[DueForecast] = None
+# Key of the card moves waiting for a commit in `Session.info`.
+_PENDING_MOVES = "due_forecast_pending_moves"
+
+
+def load_due_forecast(db_session: "Session", days: Optional[int] = None) -> DueForecast:
+    """Computes the forecast with a single GROUP BY on next_review_date and mastery_level."""
+    from sqlalchemy import func, select
+    from flash_zap.models.card import Card
+
+    days = settings.DUE_FORECAST_DAYS if days is None else days
+    forecast = DueForecast(_today(), days)
+    query = (
+        select(Card.next_review_date, Card.mastery_level, func.count())
+        .where(Card.next_review_date < forecast.horizon)
+        .group_by(Card.next_review_date, Card.mastery_level)
+    )
+    for due, level, count in db_session.execute(query):
+        forecast._add(due, level, count)
+    logging.info(f"Loaded the due forecast for {days} days: {forecast.due_today} cards due today.")
+    return forecast
+
+
+def get_due_forecast(db_session: "Session", days: Optional[int] = None) -> DueForecast:
+    """Returns the cached forecast, loading it if there is none yet or the day has changed."""
+    global _cached
+    days = settings.DUE_FORECAST_DAYS if days is None else days
+    forecast = cached_due_forecast()
+    if forecast is not None and forecast.days == days:
+        return forecast
+    forecast = load_due_forecast(db_session, days)
+    with _lock:
+        _cached = forecast
+    return forecast
+
+
+def cached_due_forecast() -> Optional[DueForecast]:
+    """Returns the cached forecast if it is still current, without touching the database."""
+    with _lock:
+        if _cached is not None and _cached.today == _today():
+            return _cached
+        return None
+
+
+def card_rescheduled(
+    old_due: Optional[date],
+    old_level: int,
+    new_due: date,
+    new_level: int,
+    db_session: Optional["Session"] = None,
+) -> None:
+    """
+    Updates the cached forecast for one card whose due date or mastery level changed.
+
+    With a `db_session`, the change is held back until the session commits
+    and dropped if it rolls back, so the cache never counts a schedule that
+    is not in the database.
+    """
+    move = (old_due, old_level, new_due, new_level)
+    if db_session is None:
+        _apply_moves([move])
+        return
+    if _PENDING_MOVES not in db_session.info:
+        from sqlalchemy import event
+
+        db_session.info[_PENDING_MOVES] = []
+        event.listen(db_session, "after_commit", _apply_pending_moves)
+        event.listen(db_session, "after_rollback", _drop_pending_moves)
+    db_session.info[_PENDING_MOVES].append(move)
+
+
+def _apply_moves(moves: List[Tuple[Optional[date], int, date, int]]) -> None:
+    with _lock:
+        if _cached is not None:
+            for move in moves:
+                _cached.move(*move)
+
+
+def _apply_pending_moves(db_session: "Session") -> None:
+    moves = db_session.info.get(_PENDING_MOVES)
+    if moves:
+        _apply_moves(moves)
+        moves.clear()
+
+
+def _drop_pending_moves(db_session: "Session") -> None:
+    db_session.info.get(_PENDING_MOVES, []).clear()
+
+
+def invalidate_due_forecast() -> None:
+    """Drops the cached forecast after changes that were not reported card by card."""
+    global _cached
+    with _lock:
+        _cached = None
+
+
+def format_due_summary(forecast: DueForecast) -> str:
+    return f"Due today: {forecast.due_today}, tomorrow: {forecast.due_tomorrow}"
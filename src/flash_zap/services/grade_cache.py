@@ -0,0 +1,149 @@
+"""
+This module provides a persistent cache of AI grades, so an answer that was
+already graded for a card is not sent to the AI grading service again.
+"""
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from flash_zap.config import settings
+from flash_zap.models.grade_cache_entry import GradeCacheEntry
+from flash_zap.utils.text import normalize_answer
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def prompt_version() -> str:
+    """
+    Identifies the grading prompt and model, so changing either starts a fresh cache.
+    """
+    return _sha256(settings.AI_GRADER_MODEL_NAME + "\x00" + settings.AI_GRADER_PROMPT_TEMPLATE)[:16]
+
+
+class GradeCache:
+    """
+    Stores AI grades keyed by (card id, hash of the card back, normalized answer,
+    prompt version) in the `grade_cache` table.
+
+    A changed card back or prompt simply stops matching old entries; edits made
+    through `card_manager.update_card_back` also delete the card's entries right
+    away. Entries older than `ttl_days` are ignored, and `evict` trims the table
+    to `max_entries`, dropping the least recently used entries first.
+
+    The cache uses the caller's session and never commits or flushes; lookups
+    and new entries are persisted with the caller's next commit.
+    """
+
+    def __init__(self, db_session: Session, max_entries: Optional[int] = None, ttl_days: Optional[int] = None):
+        self._db = db_session
+        self._max_entries = settings.GRADE_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self._ttl = timedelta(days=settings.GRADE_CACHE_TTL_DAYS if ttl_days is None else ttl_days)
+        self._prompt_version = prompt_version()
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def _key(self, card_id: int, correct_answer: str, user_answer: str) -> dict:
+        return {
+            "card_id": card_id,
+            "back_hash": _sha256(correct_answer),
+            "answer_hash": _sha256(normalize_answer(user_answer)),
+            "prompt_version": self._prompt_version,
+        }
+
+    def _find(self, key: dict) -> Optional[GradeCacheEntry]:
+        # Entries added since the last commit are matched in memory, so lookups
+        # never need to flush the session (and with it any deferred review progress).
+        for entry in self._db.new:
+            if isinstance(entry, GradeCacheEntry) and all(getattr(entry, name) == value for name, value in key.items()):
+                return entry
+        with self._db.no_autoflush:
+            return self._db.scalars(select(GradeCacheEntry).filter_by(**key)).first()
+
+    def get(self, card_id: int, correct_answer: str, user_answer: str) -> Optional[Tuple[str, str]]:
+        """
+        Returns the cached (result, feedback) for an answer, or None on a miss.
+        """
+        now = datetime.now(timezone.utc)
+        entry = self._find(self._key(card_id, correct_answer, user_answer))
+        if entry is None or _as_utc(entry.created_at) < now - self._ttl:
+            self.misses += 1
+            return None
+        entry.last_used_at = now
+        self.hits += 1
+        self.saved_seconds += entry.latency_ms / 1000
+        logging.info(f"Grade cache hit for card id {card_id}.")
+        return entry.result, entry.feedback
+
+    def put(
+        self,
+        card_id: int,
+        correct_answer: str,
+        user_answer: str,
+        result: str,
+        feedback: str,
+        latency_seconds: float = 0.0,
+    ) -> None:
+        """Stores the AI grade for an answer, replacing any older entry for it."""
+        now = datetime.now(timezone.utc)
+        key = self._key(card_id, correct_answer, user_answer)
+        entry = self._find(key)
+        if entry is None:
+            entry = GradeCacheEntry(**key)
+            self._db.add(entry)
+        entry.result = result
+        entry.feedback = feedback
+        entry.latency_ms = int(latency_seconds * 1000)
+        entry.created_at = now
+        entry.last_used_at = now
+
+    def invalidate_card(self, card_id: int) -> None:
+        """Drops every cached grade for a card."""
+        invalidate_card(self._db, card_id)
+
+    def evict(self) -> int:
+        """
+        Deletes expired entries and, above `max_entries`, the least recently used ones.
+
+        Returns:
+            The number of entries deleted.
+        """
+        cutoff = datetime.now(timezone.utc) - self._ttl
+        removed = self._db.execute(
+            delete(GradeCacheEntry).where(GradeCacheEntry.created_at < cutoff),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        count = self._db.execute(select(func.count()).select_from(GradeCacheEntry)).scalar_one()
+        excess = count - self._max_entries
+        if excess > 0:
+            oldest = (
+                select(GradeCacheEntry.id)
+                .order_by(GradeCacheEntry.last_used_at, GradeCacheEntry.id)
+                .limit(excess)
+            )
+            removed += self._db.execute(
+                delete(GradeCacheEntry).where(GradeCacheEntry.id.in_(oldest)),
+                execution_options={"synchronize_session": False},
+            ).rowcount
+        if removed:
+            logging.info(f"Evicted {removed} entries from the grade cache.")
+        return removed
+
+
+def invalidate_card(db_session: Session, card_id: int) -> None:
+    """Drops every cached grade for a card, e.g. after its back was edited."""
+    db_session.execute(
+        delete(GradeCacheEntry).where(GradeCacheEntry.card_id == card_id),
+        execution_options={"synchronize_session": False},
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands timezone-aware columns back as naive datetimes in UTC.
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
@@ -1,71 +1,432 @@
 from rich import print
-import json
+from rich.markup import escape
+import csv
+import io
+import glob
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from json import JSONDecodeError
 import logging
-from typing import List, Dict, Any
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
+from flash_zap.config import settings
 from flash_zap.core.exceptions import InvalidFileError, ValidationError
-from flash_zap.models.card import Card
+from flash_zap.models.card import Card, new_sync_id
+from flash_zap.services.due_forecast import invalidate_due_forecast
+from flash_zap.utils.json_stream import NotAnArrayError, iter_json_array
+from flash_zap.utils.text import card_content_hash
 
-def _parse_and_validate_file(file_path: str):
+_COPY_COLUMNS = ("front", "back", "mastery_level", "next_review_date", "sync_id", "updated_at")
+_GLOB_CHARS = "*?["
+# A worker's result for one file: (number of cards, None) or (None, error message).
+_ValidationResult = Tuple[Optional[int], Optional[str]]
+
+def _validate_item(index: int, item: Any):
+    if not isinstance(item, dict):
+        logging.error(f"Validation Error: Item at index {index} is not an object.")
+        raise ValidationError("JSON list item is not an object.")
+    if "front" not in item or "back" not in item:
+        logging.error(f"Validation Error: Item at index {index} is missing 'front' or 'back' key.")
+        raise ValidationError("Missing 'front' or 'back' key in object.")
+    if not isinstance(item["front"], str) or not isinstance(item["back"], str):
+        logging.error(f"Validation Error: Item at index {index} has a 'front' or 'back' that is not a string.")
+        raise ValidationError(f"Item at index {index}: 'front' and 'back' must be strings.")
+    if len(item["front"]) > 200 or len(item["back"]) > 200:
+        logging.error(f"Validation Error: Item at index {index} exceeds character limit.")
+        raise ValidationError("Card content exceeds 200 characters.")
+
+
+def _iter_cards(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Streams validated card dicts from a JSON file, one at a time.
+
+    The file is parsed incrementally, so only the current item is held in
+    memory. An invalid item raises as soon as it is reached, after the items
+    before it have been yielded.
+    """
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+            for i, item in enumerate(iter_json_array(f)):
+                _validate_item(i, item)
+                yield item
     except FileNotFoundError as e:
         logging.error(f"File not found at path: {file_path}", exc_info=True)
         raise e
     except JSONDecodeError as e:
         logging.error(f"Failed to decode JSON from file: {file_path}", exc_info=True)
         raise InvalidFileError(f"The file '{file_path}' is not a valid JSON file.") from e
-
-    if not isinstance(data, list):
+    except NotAnArrayError as e:
         logging.error("Validation Error: JSON root is not a list.")
-        raise ValidationError("JSON root is not a list.")
-    
-    logging.info(f"Found {len(data)} cards in the JSON file.")
+        raise ValidationError("JSON root is not a list.") from e
 
-    for i, item in enumerate(data):
-        if not isinstance(item, dict):
-            logging.error(f"Validation Error: Item at index {i} is not an object.")
-            raise ValidationError("JSON list item is not an object.")
-        if "front" not in item or "back" not in item:
-            logging.error(f"Validation Error: Item at index {i} is missing 'front' or 'back' key.")
-            raise ValidationError("Missing 'front' or 'back' key in object.")
-        if len(item["front"]) > 200 or len(item["back"]) > 200:
-            logging.error(f"Validation Error: Item at index {i} exceeds character limit.")
-            raise ValidationError("Card content exceeds 200 characters.")
 
+def _count_valid_cards(file_path: str) -> int:
+    """
+    Validates the whole file in one streaming pass and returns the number of cards.
+    """
+    count = sum(1 for _ in _iter_cards(file_path))
+    logging.info(f"Found {count} cards in the JSON file.")
+    return count
+
+
+def _parse_and_validate_file(file_path: str):
+    data = list(_iter_cards(file_path))
+    logging.info(f"Found {len(data)} cards in the JSON file.")
     return data
 
-def _save_cards_to_db(cards_data: List[Dict[str, Any]], db_session: Session):
+def _card_rows(cards_data: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
     """
-    Saves a list of card data to the database.
+    Turns card data into `cards` table rows, yielded in lists of `batch_size`.
     """
+    now = datetime.now(timezone.utc)
+    batch = []
     for card_data in cards_data:
-        card = Card(front=card_data["front"], back=card_data["back"])
-        db_session.add(card)
-    db_session.commit()
-    logging.info(f"Successfully saved {len(cards_data)} cards to the database.")
+        batch.append({
+            "front": card_data["front"],
+            "back": card_data["back"],
+            "mastery_level": 0,
+            "next_review_date": now.date(),
+            "sync_id": new_sync_id(),
+            "updated_at": now,
+        })
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _copy_rows(db_session: Session, rows: List[Dict[str, Any]]):
+    """
+    Inserts rows with PostgreSQL's COPY FROM STDIN through the psycopg2 cursor.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row[column] for column in _COPY_COLUMNS])
+    buffer.seek(0)
+    dbapi_connection = db_session.connection().connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY cards ({', '.join(_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+
+def _insert_rows(db_session: Session, rows: List[Dict[str, Any]]):
+    if db_session.get_bind().dialect.name == "postgresql":
+        _copy_rows(db_session, rows)
+    else:
+        # One executemany of INSERT ... VALUES for the whole batch.
+        db_session.execute(insert(Card), rows)
+
+
+def _save_cards_to_db(
+    cards_data: Iterable[Dict[str, Any]],
+    db_session: Session,
+    batch_size: Optional[int] = None,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Saves card data to the database in bulk.
+
+    Cards are inserted in batches of `batch_size` (IMPORT_BATCH_SIZE by default)
+    with a single executemany INSERT, or COPY FROM STDIN on PostgreSQL, and
+    each batch is committed on its own. If a batch fails it is rolled back, so
+    the database holds exactly the batches reported as saved.
+
+    Args:
+        cards_data: Validated card dicts with "front" and "back" keys.
+        db_session: The database session to write with.
+        batch_size: Number of cards per batch and transaction.
+        progress: Called with the running total of saved cards after each batch.
+
+    Returns:
+        The number of cards saved.
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    saved = 0
+    for rows in _card_rows(cards_data, batch_size):
+        try:
+            _insert_rows(db_session, rows)
+            db_session.commit()
+            invalidate_due_forecast()
+        except Exception:
+            db_session.rollback()
+            logging.error(f"Saving a batch of cards failed after {saved} cards were saved.", exc_info=True)
+            raise
+        saved += len(rows)
+        logging.info(f"Saved {saved} cards so far.")
+        if progress is not None:
+            progress(saved)
+    logging.info(f"Successfully saved {saved} cards to the database.")
+    return saved
+
+@dataclass
+class ImportSummary:
+    """What a deduplicating import did with each card it read."""
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.skipped
+
+
+def _dialect_insert(db_session: Session):
+    if db_session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(Card.__table__)
+    return sqlite.insert(Card.__table__)
+
+
+def _upsert_rows(db_session: Session, rows: List[Dict[str, Any]], summary: ImportSummary):
+    # Later copies of a card within the same batch are duplicates too.
+    first_copies: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        first_copies.setdefault(row["content_hash"], row)
+    unique_rows = list(first_copies.values())
+    summary.skipped += len(rows) - len(unique_rows)
+
+    # One set-based statement inserts the new cards and skips every card whose
+    # hash is already taken (ON CONFLICT DO NOTHING on both PostgreSQL and SQLite).
+    insert_stmt = (
+        _dialect_insert(db_session)
+        .on_conflict_do_nothing(index_elements=["content_hash"])
+        .returning(Card.__table__.c.content_hash)
+    )
+    inserted = set(db_session.execute(insert_stmt, unique_rows).scalars())
+    summary.inserted += len(inserted)
+
+    conflicting = {row["content_hash"]: row for row in unique_rows if row["content_hash"] not in inserted}
+    if not conflicting:
+        return
+    existing = db_session.execute(
+        select(Card.id, Card.front, Card.back, Card.content_hash)
+        .where(Card.content_hash.in_(conflicting))
+    ).all()
+    updates = []
+    for card_id, front, back, content_hash in existing:
+        row = conflicting[content_hash]
+        if (front, back) == (row["front"], row["back"]):
+            continue
+        # Only refresh the wording of cards that still hold the content they were
+        # imported with; cards edited since then keep the user's changes.
+        if card_content_hash(front, back) == content_hash:
+            updates.append({"card_id": card_id, "front": row["front"], "back": row["back"]})
+    if updates:
+        db_session.execute(
+            update(Card.__table__)
+            .where(Card.__table__.c.id == bindparam("card_id"))
+            .values(front=bindparam("front"), back=bindparam("back")),
+            updates,
+        )
+    summary.updated += len(updates)
+    summary.skipped += len(conflicting) - len(updates)
+
 
-def import_cards_from_json(db_session: Session):
+def _save_cards_deduplicated(
+    cards_data: Iterable[Dict[str, Any]],
+    db_session: Session,
+    batch_size: Optional[int] = None,
+    progress: Optional[Callable[[int], None]] = None,
+) -> ImportSummary:
+    """
+    Saves card data to the database, skipping cards that are already there.
+
+    Each card is identified by `card_content_hash` of its front and back, stored
+    in the unique `content_hash` column. New cards are inserted; a card whose
+    hash already exists is skipped, or has its front and back rewritten if only
+    case or whitespace changed, keeping its review progress. Batches are
+    committed one by one, like in `_save_cards_to_db`.
+
+    Returns:
+        An ImportSummary with the inserted, updated and skipped counts.
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    summary = ImportSummary()
+    for rows in _card_rows(cards_data, batch_size):
+        for row in rows:
+            row["content_hash"] = card_content_hash(row["front"], row["back"])
+        try:
+            _upsert_rows(db_session, rows, summary)
+            db_session.commit()
+            invalidate_due_forecast()
+        except Exception:
+            db_session.rollback()
+            logging.error(f"Saving a batch of cards failed after {summary.total} cards were processed.", exc_info=True)
+            raise
+        logging.info(f"Processed {summary.total} cards so far.")
+        if progress is not None:
+            progress(summary.total)
+    logging.info(
+        f"Deduplicating import finished: {summary.inserted} inserted, "
+        f"{summary.updated} updated, {summary.skipped} skipped."
+    )
+    return summary
+
+def _report_progress(saved: int, total: int):
+    if saved < total:
+        print(f"[dim]Imported {saved} of {total} cards...[/dim]")
+
+
+@dataclass
+class FileImportResult:
+    """The outcome of importing one file of a multi-file import."""
+    file_path: str
+    summary: Optional[ImportSummary] = None
+    error: Optional[str] = None
+
+
+def _is_multi_file_target(target: str) -> bool:
+    return os.path.isdir(target) or any(char in target for char in _GLOB_CHARS)
+
+
+def _resolve_import_paths(target: str) -> List[str]:
+    """
+    Expands an import target into JSON file paths.
+
+    A directory yields every *.json file below it, a glob pattern (recursive
+    "**" is supported) yields its matches, and anything else is a single file.
+    """
+    if os.path.isdir(target):
+        return sorted(str(path) for path in Path(target).rglob("*.json") if path.is_file())
+    if any(char in target for char in _GLOB_CHARS):
+        return sorted(path for path in glob.glob(target, recursive=True) if os.path.isfile(path))
+    return [target]
+
+
+def _validate_file(file_path: str) -> _ValidationResult:
+    """Validates one file in a worker process; only its card count is sent back."""
+    try:
+        return _count_valid_cards(file_path), None
+    except FileNotFoundError:
+        return None, "File not found."
+    except (InvalidFileError, ValidationError) as e:
+        return None, str(e)
+    except Exception as e:
+        logging.critical(f"An unexpected error occurred while reading {file_path}.", exc_info=True)
+        return None, f"An unexpected error occurred: {e}"
+
+
+def _validate_files(file_paths: List[str], max_workers: int) -> Iterator[Tuple[str, _ValidationResult]]:
+    """
+    Validates files in a process pool and yields (path, result) in the given order.
+
+    At most two files per worker are in flight, so the workers do not run far
+    ahead of the writer.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        paths = iter(file_paths)
+        for file_path in paths:
+            pending.append((file_path, executor.submit(_validate_file, file_path)))
+            if len(pending) >= max_workers * 2:
+                break
+        while pending:
+            file_path, future = pending.popleft()
+            next_path = next(paths, None)
+            if next_path is not None:
+                pending.append((next_path, executor.submit(_validate_file, next_path)))
+            yield file_path, future.result()
+
+
+def import_cards_from_files(
+    db_session: Session,
+    target: str,
+    max_workers: Optional[int] = None,
+) -> List[FileImportResult]:
+    """
+    Imports every JSON file in a directory tree or matching a glob pattern.
+
+    Files are validated in parallel worker processes (IMPORT_MAX_WORKERS, by
+    default one per CPU core), which send back only their card counts. Each
+    valid file is then streamed again and written in batches through the
+    single `db_session` with the deduplicating bulk insert, so no file is ever
+    held in memory or passed between processes whole. An invalid file is
+    reported and skipped before any of its cards are written; it does not stop
+    the other files.
+
+    Returns:
+        One FileImportResult per file, in path order.
+    """
+    file_paths = _resolve_import_paths(target)
+    max_workers = max_workers or settings.IMPORT_MAX_WORKERS or os.cpu_count() or 1
+    logging.info(f"Importing {len(file_paths)} files from {target} with {max_workers} workers.")
+    results = []
+    for file_path, (count, error) in _validate_files(file_paths, max_workers):
+        result = FileImportResult(file_path, error=error)
+        if count is not None:
+            try:
+                result.summary = _save_cards_deduplicated(_iter_cards(file_path), db_session)
+            except Exception as e:
+                logging.error(f"Saving cards from {file_path} failed.", exc_info=True)
+                result.error = f"An unexpected error occurred: {e}"
+        # Paths and messages can contain '[', which rich would read as markup.
+        if result.error is not None:
+            logging.error(f"Import of {file_path} failed: {result.error}")
+            print(f"[bold red]{escape(file_path)}: Error: {escape(result.error)}[/bold red]")
+        else:
+            print(f"[green]{escape(file_path)}: imported {result.summary.inserted} cards[/green] "
+                  f"({result.summary.updated} updated, {result.summary.skipped} skipped)")
+        results.append(result)
+    return results
+
+
+def _import_multiple_files(db_session: Session, target: str):
+    results = import_cards_from_files(db_session, target)
+    if not results:
+        print(f"[bold red]Error: No JSON files found for '{escape(target)}'.[/bold red]")
+        return
+    imported = sum(result.summary.inserted for result in results if result.summary)
+    failed = sum(1 for result in results if result.error is not None)
+    print(f"[green]Successfully imported {imported} cards from {len(results) - failed} files.[/green]")
+    if failed:
+        print(f"[bold red]{failed} files could not be imported.[/bold red]")
+
+
+def import_cards_from_json(db_session: Session, deduplicate: bool = True):
     """
     Orchestrates the import process from a JSON file, handling exceptions.
+
+    With `deduplicate` (the default), cards already in the collection are
+    skipped or updated instead of being added again. A directory or glob
+    pattern imports every matching file with `import_cards_from_files`.
     """
     logging.info("Starting flashcard import process.")
     try:
-        file_path = input("Enter the path to the JSON file: ")
+        file_path = input("Enter the path to a JSON file, a directory or a glob pattern: ")
         logging.info(f"Attempting to import from file: {file_path}")
-        cards_data = _parse_and_validate_file(file_path)
-        _save_cards_to_db(cards_data, db_session)
-        print(f"[green]Successfully imported {len(cards_data)} cards.[/green]")
+        if _is_multi_file_target(file_path):
+            _import_multiple_files(db_session, file_path)
+            logging.info("Flashcard import process finished.")
+            return
+        # Validate everything before writing anything, then stream the cards
+        # into the database; neither pass holds the whole deck in memory.
+        total = _count_valid_cards(file_path)
+        progress = lambda saved: _report_progress(saved, total)
+        if deduplicate:
+            summary = _save_cards_deduplicated(_iter_cards(file_path), db_session, progress=progress)
+            print(f"[green]Successfully imported {summary.inserted} cards.[/green]")
+            if summary.updated or summary.skipped:
+                print(f"Updated {summary.updated} and skipped {summary.skipped} cards already in your collection.")
+        else:
+            _save_cards_to_db(_iter_cards(file_path), db_session, progress=progress)
+            print(f"[green]Successfully imported {total} cards.[/green]")
         logging.info("Flashcard import process finished successfully.")
     except FileNotFoundError:
         print(f"[bold red]Error: File not found.[/bold red]")
         logging.warning("Import failed because file was not found.")
     except (InvalidFileError, ValidationError) as e:
-        print(f"[bold red]Error: {e}[/bold red]")
+        print(f"[bold red]Error: {escape(str(e))}[/bold red]")
         logging.error(f"Import failed due to validation or file error: {e}", exc_info=True)
     except Exception as e:
-        print(f"[bold red]An unexpected error occurred: {e}[/bold red]")
+        print(f"[bold red]An unexpected error occurred: {escape(str(e))}[/bold red]")
         logging.critical("An unexpected error occurred during the import process.", exc_info=True) 
\ No newline at end of file
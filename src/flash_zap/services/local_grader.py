@@ -0,0 +1,85 @@
+"""
+This module provides a local pre-grader that recognizes clearly correct answers
+without calling the AI grading service.
+"""
+import logging
+import threading
+from typing import Optional, Tuple
+
+from flash_zap.config import settings
+from flash_zap.utils.text import edit_distance, normalize_answer, parse_date
+
+
+class LocalGrader:
+    """
+    Grades answers that can be recognized as correct without the AI.
+
+    An answer is accepted when, after normalization (case, whitespace,
+    sentence punctuation and diacritics), it matches the card back exactly,
+    names the same calendar date (in any format or Polish month case), or is
+    within a small edit distance of a long back. A typo is only tolerated in
+    answers without digits or symbols and never in the first letter, so
+    "1410" is not accepted for "1411", nor "Prussia" for "Russia". The local
+    grader only ever says "Correct"; anything it is unsure about is left to
+    the AI grader.
+    """
+
+    def __init__(
+        self,
+        max_edit_distance: Optional[int] = None,
+        min_fuzzy_length: Optional[int] = None,
+    ):
+        self._max_edit_distance = (
+            settings.LOCAL_GRADER_MAX_EDIT_DISTANCE if max_edit_distance is None else max_edit_distance
+        )
+        self._min_fuzzy_length = (
+            settings.LOCAL_GRADER_MIN_FUZZY_LENGTH if min_fuzzy_length is None else min_fuzzy_length
+        )
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of answers graded locally, i.e. AI calls saved."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def grade_answer(self, question: str, user_answer: str, correct_answer: str) -> Optional[Tuple[str, str]]:
+        """
+        Grades an answer locally if the result is certain.
+
+        Returns:
+            ("Correct", feedback) when the answer is recognized as correct,
+            otherwise None to signal that the AI grader should decide.
+        """
+        reason = self._match(user_answer, correct_answer)
+        with self._lock:
+            self.lookups += 1
+            if reason is not None:
+                self.hits += 1
+        if reason is None:
+            return None
+        logging.info(f"Local grader accepted the answer ({reason}).")
+        return "Correct", f"Poprawna odpowiedź: {correct_answer}"
+
+    def _match(self, user_answer: str, correct_answer: str) -> Optional[str]:
+        user = normalize_answer(user_answer)
+        correct = normalize_answer(correct_answer)
+        if not user or not correct:
+            return None
+        if user == correct:
+            return "exact match"
+
+        correct_date = parse_date(correct_answer)
+        if correct_date is not None and parse_date(user_answer) == correct_date:
+            return "same date"
+
+        if not all(char.isalpha() or char == " " for char in user + correct):
+            return None
+        if len(correct) < self._min_fuzzy_length or self._max_edit_distance <= 0:
+            return None
+        if user[0] != correct[0]:
+            return None
+        if edit_distance(user, correct, limit=self._max_edit_distance) <= self._max_edit_distance:
+            return "minor typo"
+        return None
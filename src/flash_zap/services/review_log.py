@@ -0,0 +1,153 @@
+"""
+This module records every graded answer in the `reviews` table, for tuning
+the scheduler and auditing grades, and keeps that log from growing forever.
+"""
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from flash_zap.config import settings
+from flash_zap.models.card import Card
+from flash_zap.models.review import Review
+
+_reviews = Review.__table__
+
+
+class ReviewLogWriter:
+    """
+    Appends reviews to the log in bulk.
+
+    `append` only buffers a row in memory; `flush` writes the whole buffer
+    with one executemany INSERT in the caller's session, without ORM objects
+    and without committing. A `ReviewSession` flushes right before it commits
+    review progress, so the log and the cards it describes are saved
+    together. The buffer is also flushed once it holds `buffer_size` rows.
+    """
+
+    def __init__(self, db_session: Session, buffer_size: Optional[int] = None):
+        self._db = db_session
+        self._buffer_size = settings.REVIEW_LOG_BUFFER_SIZE if buffer_size is None else buffer_size
+        self._buffer: List[Dict[str, Any]] = []
+        self.written = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def append(
+        self,
+        card_id: int,
+        answer: str,
+        grade: str,
+        old_mastery_level: int,
+        new_mastery_level: int,
+        latency_seconds: float = 0.0,
+        reviewed_at: Optional[datetime] = None,
+    ) -> None:
+        self._buffer.append({
+            "card_id": card_id,
+            "reviewed_at": reviewed_at or datetime.now(timezone.utc),
+            "answer": answer,
+            "grade": grade,
+            "latency_ms": int(latency_seconds * 1000),
+            "old_mastery_level": old_mastery_level,
+            "new_mastery_level": new_mastery_level,
+        })
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """Writes the buffered reviews; returns how many were written."""
+        if not self._buffer:
+            return 0
+        rows, self._buffer = self._buffer, []
+        self._db.execute(insert(_reviews), rows)
+        self.written += len(rows)
+        return len(rows)
+
+    def compact(self) -> Tuple[int, int]:
+        """Applies the retention policy; see `compact_review_log`."""
+        return compact_review_log(self._db)
+
+
+def compact_review_log(
+    db_session: Session,
+    retention_days: Optional[int] = None,
+    answer_retention_days: Optional[int] = None,
+) -> Tuple[int, int]:
+    """
+    Deletes reviews older than `retention_days` and clears the answer text of
+    reviews older than `answer_retention_days`.
+
+    The answers take up most of the space, while the grades and mastery
+    changes are what scheduling is tuned on, so those are kept longer. Both
+    steps are range scans on `ix_reviews_reviewed_at`. Does not commit.
+
+    Returns:
+        The number of reviews deleted and the number of answers cleared.
+    """
+    now = datetime.now(timezone.utc)
+    retention = settings.REVIEW_LOG_RETENTION_DAYS if retention_days is None else retention_days
+    answer_retention = (
+        settings.REVIEW_LOG_ANSWER_RETENTION_DAYS if answer_retention_days is None else answer_retention_days
+    )
+    deleted = db_session.execute(
+        delete(_reviews).where(_reviews.c.reviewed_at < now - timedelta(days=retention))
+    ).rowcount
+    compacted = db_session.execute(
+        update(_reviews)
+        .where(_reviews.c.reviewed_at < now - timedelta(days=answer_retention), _reviews.c.answer.is_not(None))
+        .values(answer=None)
+    ).rowcount
+    if deleted or compacted:
+        logging.info(f"Compacted the review log: {deleted} reviews deleted, {compacted} answers cleared.")
+    return deleted, compacted
+
+
+def review_history(
+    db_session: Session, card_ids: Optional[Sequence[int]] = None
+) -> Tuple[List[int], List[bool], List[date]]:
+    """
+    Returns the logged reviews in order, as the card ids, outcomes and review
+    days that `bulk_schedule.replay_reviews` takes, e.g. to reschedule cards
+    under another algorithm after resetting them.
+    """
+    query = select(_reviews.c.card_id, _reviews.c.grade, _reviews.c.reviewed_at).order_by(
+        _reviews.c.reviewed_at, _reviews.c.id
+    )
+    if card_ids is not None:
+        query = query.where(_reviews.c.card_id.in_(card_ids))
+    ids, outcomes, days = [], [], []
+    for card_id, grade, reviewed_at in db_session.execute(query):
+        ids.append(card_id)
+        outcomes.append(grade == "Correct")
+        days.append(reviewed_at.date())
+    return ids, outcomes, days
+
+
+def studied_today(db_session: Session, today: date) -> Tuple[int, int]:
+    """
+    Returns how many new cards and how many other cards were reviewed on `today`.
+
+    A card counts as new if its first logged review is today. The cards
+    reviewed today come from `last_review_date`; the new ones can only be told
+    apart through the log, so with the log disabled every card counts as a
+    review.
+    """
+    start = datetime.combine(today, time.min, tzinfo=timezone.utc)
+    studied = db_session.execute(
+        select(func.count()).select_from(Card).where(Card.last_review_date == today)
+    ).scalar_one()
+    earlier = _reviews.alias("earlier")
+    new = db_session.execute(
+        select(func.count(_reviews.c.card_id.distinct())).where(
+            _reviews.c.reviewed_at >= start,
+            ~select(earlier.c.id)
+            .where(earlier.c.card_id == _reviews.c.card_id, earlier.c.reviewed_at < start)
+            .exists(),
+        )
+    ).scalar_one()
+    return new, max(studied - new, 0)
+
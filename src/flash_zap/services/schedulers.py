@@ -0,0 +1,245 @@
+"""
+This module provides the scheduling algorithms that decide when a card is
+reviewed next. `SRSEngine` applies the one selected by `SRS_ALGORITHM`.
+"""
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Type
+
+from flash_zap.config import settings
+
+# The Card columns that make up a card's scheduling state.
+STATE_COLUMNS = (
+    "mastery_level",
+    "next_review_date",
+    "ease_factor",
+    "interval_days",
+    "stability",
+    "difficulty",
+    "last_review_date",
+)
+
+DEFAULT_EASE_FACTOR = 2.5
+
+
+@dataclass
+class ReviewState:
+    """
+    The scheduling state of one card, detached from the database.
+
+    `mastery_level` counts correct answers (the linear schedule) or successful
+    reviews in a row (SM-2 and FSRS). The other fields are only used by the
+    algorithms that need them: `ease_factor` by SM-2, `stability` and
+    `difficulty` by FSRS.
+    """
+    mastery_level: int = 0
+    next_review_date: Optional[date] = None
+    ease_factor: float = DEFAULT_EASE_FACTOR
+    interval_days: int = 0
+    stability: Optional[float] = None
+    difficulty: Optional[float] = None
+    last_review_date: Optional[date] = None
+
+    @classmethod
+    def from_card(cls, card) -> "ReviewState":
+        # Column defaults are only filled in on insert, so a new Card may still hold None.
+        return cls(
+            mastery_level=card.mastery_level or 0,
+            next_review_date=card.next_review_date,
+            ease_factor=card.ease_factor if card.ease_factor is not None else DEFAULT_EASE_FACTOR,
+            interval_days=card.interval_days or 0,
+            stability=card.stability,
+            difficulty=card.difficulty,
+            last_review_date=card.last_review_date,
+        )
+
+    def apply_to(self, card) -> None:
+        for name in STATE_COLUMNS:
+            setattr(card, name, getattr(self, name))
+
+    def elapsed_days(self, review_date: date) -> int:
+        """Days since the previous review, estimated from the schedule if it was never recorded."""
+        if self.last_review_date is not None:
+            return max((review_date - self.last_review_date).days, 0)
+        if self.next_review_date is not None:
+            return max((review_date - self.next_review_date).days + self.interval_days, 0)
+        return self.interval_days
+
+
+class Scheduler(ABC):
+    """A spaced repetition algorithm: turns a review outcome into the card's next state."""
+
+    name: str
+
+    def __init__(self, maximum_interval_days: Optional[int] = None):
+        self.maximum_interval_days = (
+            settings.SRS_MAXIMUM_INTERVAL_DAYS if maximum_interval_days is None else maximum_interval_days
+        )
+
+    @abstractmethod
+    def review(self, state: ReviewState, correct: bool, review_date: date) -> ReviewState:
+        """Returns the state of a card after it was answered on `review_date`."""
+
+    def review_many(
+        self, states: Sequence[ReviewState], outcomes: Sequence[bool], review_dates: Sequence[date]
+    ) -> List[ReviewState]:
+        return [self.review(*review) for review in zip(states, outcomes, review_dates)]
+
+    def _next_state(
+        self, state: ReviewState, review_date: date, mastery_level: int, interval_days: int, **changes
+    ) -> ReviewState:
+        interval_days = min(interval_days, self.maximum_interval_days)
+        values = {
+            **vars(state),
+            **changes,
+            "mastery_level": mastery_level,
+            "interval_days": interval_days,
+            "next_review_date": review_date + timedelta(days=interval_days),
+            "last_review_date": review_date,
+        }
+        return ReviewState(**values)
+
+
+class LinearScheduler(Scheduler):
+    """
+    The original FlashZap schedule: a correct answer raises the mastery level by
+    one, a wrong one lowers it by one (not below 0), and the next review is
+    `mastery_level` days away.
+    """
+
+    name = "linear"
+
+    def review(self, state: ReviewState, correct: bool, review_date: date) -> ReviewState:
+        level = state.mastery_level + 1 if correct else max(state.mastery_level - 1, 0)
+        return self._next_state(state, review_date, level, level)
+
+
+class SM2Scheduler(Scheduler):
+    """
+    SuperMemo 2. Intervals grow by the card's ease factor after the first two
+    successful reviews (1 and 6 days). A wrong answer restarts the sequence:
+    the card drops to mastery level 0 and is due again the same day.
+
+    FlashZap grades are binary, so answers are scored as SM-2 quality
+    `CORRECT_QUALITY` or `INCORRECT_QUALITY` on its 0-5 scale.
+    """
+
+    name = "sm2"
+    CORRECT_QUALITY = 4
+    INCORRECT_QUALITY = 2
+    MINIMUM_EASE_FACTOR = 1.3
+
+    def review(self, state: ReviewState, correct: bool, review_date: date) -> ReviewState:
+        quality = self.CORRECT_QUALITY if correct else self.INCORRECT_QUALITY
+        ease = state.ease_factor + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+        ease = max(ease, self.MINIMUM_EASE_FACTOR)
+        if not correct:
+            return self._next_state(state, review_date, 0, 0, ease_factor=ease)
+        if state.mastery_level == 0:
+            interval = 1
+        elif state.mastery_level == 1:
+            interval = 6
+        else:
+            interval = round(max(state.interval_days, 1) * state.ease_factor)
+        return self._next_state(state, review_date, state.mastery_level + 1, interval, ease_factor=ease)
+
+
+class FSRSScheduler(Scheduler):
+    """
+    FSRS 4.5 with its published default parameters.
+
+    Each card has a memory `stability` (days until recall probability falls to
+    90%) and a `difficulty` between 1 and 10. The next interval is chosen so
+    the predicted recall probability is `desired_retention` on the due date. A
+    wrong answer drops the card to mastery level 0, due again the same day.
+
+    Correct answers are rated "Good" and wrong ones "Again".
+    """
+
+    name = "fsrs"
+    WEIGHTS = (
+        0.4872, 1.4003, 3.7145, 13.8206, 5.1618, 1.2298, 0.8975, 0.031, 1.6474,
+        0.1367, 1.0461, 2.1072, 0.0793, 0.3246, 1.587, 0.2272, 2.8755,
+    )
+    DECAY = -0.5
+    FACTOR = 19 / 81
+    AGAIN, GOOD = 1, 3
+
+    def __init__(self, desired_retention: Optional[float] = None, maximum_interval_days: Optional[int] = None):
+        super().__init__(maximum_interval_days)
+        self.desired_retention = (
+            settings.FSRS_DESIRED_RETENTION if desired_retention is None else desired_retention
+        )
+        self._interval_factor = (self.desired_retention ** (1 / self.DECAY) - 1) / self.FACTOR
+
+    def retrievability(self, elapsed_days: float, stability: float) -> float:
+        """The predicted probability of recalling a card `elapsed_days` after its last review."""
+        return (1 + self.FACTOR * elapsed_days / stability) ** self.DECAY
+
+    def _initial_difficulty(self, rating: int) -> float:
+        w = self.WEIGHTS
+        return min(max(w[4] - (rating - 3) * w[5], 1.0), 10.0)
+
+    def _next_difficulty(self, difficulty: float, rating: int) -> float:
+        w = self.WEIGHTS
+        difficulty -= w[6] * (rating - 3)
+        # Mean reversion towards the default difficulty.
+        difficulty = w[7] * w[4] + (1 - w[7]) * difficulty
+        return min(max(difficulty, 1.0), 10.0)
+
+    def _recall_stability(self, difficulty: float, stability: float, retrievability: float) -> float:
+        w = self.WEIGHTS
+        return stability * (
+            1 + math.exp(w[8]) * (11 - difficulty) * stability ** -w[9] * (math.exp(w[10] * (1 - retrievability)) - 1)
+        )
+
+    def _forget_stability(self, difficulty: float, stability: float, retrievability: float) -> float:
+        w = self.WEIGHTS
+        forgotten = (
+            w[11] * difficulty ** -w[12] * ((stability + 1) ** w[13] - 1) * math.exp(w[14] * (1 - retrievability))
+        )
+        return min(forgotten, stability)
+
+    def review(self, state: ReviewState, correct: bool, review_date: date) -> ReviewState:
+        rating = self.GOOD if correct else self.AGAIN
+        if state.stability is None and state.mastery_level == 0:
+            stability = self.WEIGHTS[rating - 1]
+            difficulty = self._initial_difficulty(rating)
+        else:
+            # Cards scheduled by another algorithm start from their current interval.
+            stability = state.stability if state.stability is not None else float(max(state.interval_days, 1))
+            difficulty = state.difficulty if state.difficulty is not None else self._initial_difficulty(self.GOOD)
+            retrievability = self.retrievability(state.elapsed_days(review_date), stability)
+            if correct:
+                stability = self._recall_stability(difficulty, stability, retrievability)
+            else:
+                stability = self._forget_stability(difficulty, stability, retrievability)
+            difficulty = self._next_difficulty(difficulty, rating)
+        stability = max(stability, 0.1)
+
+        if not correct:
+            return self._next_state(state, review_date, 0, 0, stability=stability, difficulty=difficulty)
+        interval = max(round(stability * self._interval_factor), 1)
+        return self._next_state(
+            state, review_date, state.mastery_level + 1, interval, stability=stability, difficulty=difficulty
+        )
+
+
+SCHEDULERS: Dict[str, Type[Scheduler]] = {
+    scheduler.name: scheduler for scheduler in (LinearScheduler, SM2Scheduler, FSRSScheduler)
+}
+
+
+def get_scheduler(name: Optional[str] = None) -> Scheduler:
+    """
+    Returns the scheduler called `name`, or the one configured by SRS_ALGORITHM.
+
+    Raises:
+        ValueError: If there is no scheduler with that name.
+    """
+    name = (name or settings.SRS_ALGORITHM).lower()
+    if name not in SCHEDULERS:
+        raise ValueError(f"Unknown scheduling algorithm '{name}'. Choose one of: {', '.join(SCHEDULERS)}.")
+    return SCHEDULERS[name]()
@@ -1,34 +1,78 @@
 import logging
-from datetime import datetime, timedelta, timezone
-from typing import List
+from datetime import date, datetime, timezone
+from typing import List, Optional, Sequence
+
+from sqlalchemy.orm import object_session
 
 from flash_zap.models.card import Card
+from flash_zap.services import due_forecast
+from flash_zap.services.schedulers import ReviewState, Scheduler, get_scheduler
 
 
 class SRSEngine:
-    """Handles the Spaced Repetition System (SRS) logic."""
+    """
+    Handles the Spaced Repetition System (SRS) logic.
+
+    The intervals come from a `Scheduler`, by default the one selected by the
+    SRS_ALGORITHM setting (see services/schedulers.py).
+    """
+
+    def __init__(self, scheduler: Optional[Scheduler] = None):
+        self.scheduler = scheduler if scheduler is not None else get_scheduler()
+
+    def _review(self, card: Card, correct: bool) -> int:
+        today = datetime.now(timezone.utc).date()
+        old_state = ReviewState.from_card(card)
+        state = self.scheduler.review(old_state, correct, today)
+        state.apply_to(card)
+        due_forecast.card_rescheduled(
+            old_state.next_review_date, old_state.mastery_level, state.next_review_date, state.mastery_level,
+            object_session(card),
+        )
+        return state.interval_days
 
     def promote_card(self, card: Card):
         """
         Promotes a card to the next mastery level and sets the next review date.
         """
         logging.info(f"Promoting card id {card.id}. Current mastery level: {card.mastery_level}")
-        card.mastery_level += 1
-
-        interval_days = card.mastery_level
-        card.next_review_date = (datetime.now(timezone.utc) + timedelta(days=interval_days)).date()
+        interval_days = self._review(card, correct=True)
         logging.info(f"Card id {card.id} promoted to mastery level {card.mastery_level}. Next review in {interval_days} days.")
 
     def demote_card(self, card: Card):
         """
-        Demotes a card to the previous mastery level and sets the next review date.
+        Demotes a card after a wrong answer and sets the next review date.
 
-        A card's mastery level will not be demoted below level 0.
+        A card's mastery level will not be demoted below level 0. With the SM-2
+        and FSRS schedulers a wrong answer always drops it to level 0.
         """
         logging.info(f"Demoting card id {card.id}. Current mastery level: {card.mastery_level}")
-        if card.mastery_level > 0:
-            card.mastery_level -= 1
+        interval_days = self._review(card, correct=False)
+        logging.info(f"Card id {card.id} demoted to mastery level {card.mastery_level}. Next review in {interval_days} days.")
 
-        interval_days = card.mastery_level
-        card.next_review_date = (datetime.now(timezone.utc) + timedelta(days=interval_days)).date()
-        logging.info(f"Card id {card.id} demoted to mastery level {card.mastery_level}. Next review in {interval_days} days.") 
\ No newline at end of file
+    def schedule_many(
+        self,
+        states: Sequence[ReviewState],
+        outcomes: Sequence[bool],
+        review_dates: Optional[Sequence[date]] = None,
+    ) -> List[ReviewState]:
+        """
+        Applies one review outcome to each of many cards at once.
+
+        Uses the same rules as `promote_card` (outcome True) and `demote_card`
+        (outcome False), but on detached `ReviewState`s instead of Card objects,
+        so large batches need no ORM objects and read the clock only once.
+
+        Args:
+            states: Current scheduling state of each card.
+            outcomes: Whether each card was answered correctly.
+            review_dates: The day each review happened; today by default.
+
+        Returns:
+            The new state of each card, aligned with the input.
+        """
+        if len(states) != len(outcomes):
+            raise ValueError("states and outcomes must have the same length.")
+        if review_dates is None:
+            review_dates = [datetime.now(timezone.utc).date()] * len(states)
+        return self.scheduler.review_many(states, outcomes, review_dates)
@@ -0,0 +1,400 @@
+"""
+This module keeps the local SQLite replica used in "local" database mode in
+sync with the cloud database.
+
+Decks and tags travel with their cards by name, as their ids are local to each
+database like card ids: a card's deck is created on the other side if it does
+not exist there yet, and its tags replace the other side's.
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Connection, Engine, Select, bindparam, delete, insert, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from flash_zap.config import settings
+from flash_zap.models.card import Card
+from flash_zap.models.card_deletion import CardDeletion
+from flash_zap.models.card_tag import CardTag
+from flash_zap.models.deck import Deck
+from flash_zap.models.grade_cache_entry import GradeCacheEntry
+from flash_zap.models.review import Review
+from flash_zap.models.sync_state import SyncState
+from flash_zap.services.due_forecast import invalidate_due_forecast
+
+# Everything that makes up a card on both sides, besides its deck and tags; ids
+# are local to each database.
+SYNC_COLUMNS = (
+    "sync_id", "front", "back", "mastery_level", "next_review_date", "content_hash", "updated_at",
+    "ease_factor", "interval_days", "stability", "difficulty", "last_review_date",
+)
+
+DELETION_COLUMNS = ("sync_id", "deleted_at")
+
+_cards = Card.__table__
+_deletions = CardDeletion.__table__
+_decks = Deck.__table__
+_card_tags = CardTag.__table__
+_sync_state = SyncState.__table__
+# Rows that belong to a card and are deleted with it.
+_card_dependents = (GradeCacheEntry.__table__, Review.__table__, _card_tags)
+
+
+@dataclass
+class SyncResult:
+    """How many cards one sync copied, and deleted, in each direction."""
+    pushed: int = 0
+    pulled: int = 0
+    pushed_deletions: int = 0
+    pulled_deletions: int = 0
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite hands timezone-aware columns back as naive datetimes in UTC.
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def _get_watermark(conn: Connection, name: str) -> Optional[datetime]:
+    watermark = conn.execute(
+        select(_sync_state.c.watermark).where(_sync_state.c.name == name)
+    ).scalar_one_or_none()
+    return _as_utc(watermark)
+
+
+def _set_watermark(conn: Connection, name: str, watermark: datetime) -> None:
+    updated = conn.execute(
+        update(_sync_state).where(_sync_state.c.name == name).values(watermark=watermark)
+    ).rowcount
+    if not updated:
+        conn.execute(insert(_sync_state).values(name=name, watermark=watermark))
+
+
+def _card_changes() -> Select:
+    """The cards with their source id and the name of their deck, in `changed_at` order."""
+    return (
+        select(
+            *[_cards.c[column] for column in SYNC_COLUMNS],
+            _cards.c.id,
+            _decks.c.name.label("deck_name"),
+            _cards.c.changed_at,
+        )
+        .select_from(_cards.outerjoin(_decks, _cards.c.deck_id == _decks.c.id))
+        .order_by(_cards.c.changed_at, _cards.c.id)
+    )
+
+
+def _deletion_changes() -> Select:
+    """The tombstones of deleted cards, in `changed_at` order."""
+    return (
+        select(*[_deletions.c[column] for column in DELETION_COLUMNS], _deletions.c.changed_at)
+        .order_by(_deletions.c.changed_at, _deletions.c.sync_id)
+    )
+
+
+def _deck_ids(target: Connection, names: Sequence[str]) -> Dict[str, int]:
+    """Returns the target's ids of the named decks, creating the missing ones."""
+    if not names:
+        return {}
+    query = select(_decks.c.name, _decks.c.id).where(_decks.c.name.in_(names))
+    ids = dict(target.execute(query).all())
+    missing = [name for name in names if name not in ids]
+    if missing:
+        target.execute(insert(_decks), [{"name": name} for name in missing])
+        ids = dict(target.execute(query).all())
+    return ids
+
+
+def _apply_batch(source: Connection, target: Connection, rows: List[Dict[str, Any]]) -> int:
+    """
+    Writes a batch of source cards, with their deck and tags, to the target,
+    last writer wins.
+
+    A card is matched by its sync_id or, failing that, by its content hash (the
+    same deck imported on both sides before they were synced). A hash match
+    adopts the source's sync_id, so the two copies are linked from then on.
+
+    Returns:
+        The number of target cards inserted or updated.
+    """
+    sync_ids = [row["sync_id"] for row in rows]
+    hashes = [row["content_hash"] for row in rows if row["content_hash"] is not None]
+    deleted_at = {
+        sync_id: _as_utc(deleted)
+        for sync_id, deleted in target.execute(
+            select(_deletions.c.sync_id, _deletions.c.deleted_at).where(_deletions.c.sync_id.in_(sync_ids))
+        )
+    }
+    by_sync_id: Dict[str, Tuple[int, datetime]] = {}
+    by_hash: Dict[str, Tuple[int, datetime]] = {}
+    for card_id, sync_id, content_hash, updated_at in target.execute(
+        select(_cards.c.id, _cards.c.sync_id, _cards.c.content_hash, _cards.c.updated_at)
+        .where(or_(_cards.c.sync_id.in_(sync_ids), _cards.c.content_hash.in_(hashes)))
+    ):
+        by_sync_id[sync_id] = (card_id, _as_utc(updated_at))
+        if content_hash is not None:
+            by_hash[content_hash] = (card_id, _as_utc(updated_at))
+
+    now = datetime.now(timezone.utc)
+    inserts, updates, relinks, revived = [], [], [], []
+    for row in rows:
+        if row["sync_id"] in deleted_at:
+            # Deleted on the target: only an edit made after the deletion
+            # brings the card back.
+            if row["updated_at"] <= deleted_at[row["sync_id"]]:
+                continue
+            revived.append(row["sync_id"])
+        match = by_sync_id.get(row["sync_id"])
+        linked = match is not None
+        if match is None and row["content_hash"] is not None:
+            match = by_hash.get(row["content_hash"])
+        if match is None:
+            inserts.append(row)
+            continue
+        target_id, target_updated_at = match
+        if row["updated_at"] > target_updated_at:
+            updates.append((target_id, row))
+        elif not linked:
+            # The target copy is newer: keep its content, but link it and bump
+            # its timestamp so it is copied back on the next sync.
+            relinks.append({"target_id": target_id, "new_sync_id": row["sync_id"], "new_updated_at": now})
+
+    deck_ids = _deck_ids(
+        target, sorted({row["deck_name"] for row in inserts + [row for _, row in updates] if row["deck_name"]})
+    )
+
+    def card_values(row: Dict[str, Any]) -> Dict[str, Any]:
+        return {**{name: row[name] for name in SYNC_COLUMNS}, "deck_id": deck_ids.get(row["deck_name"])}
+
+    if revived:
+        target.execute(delete(_deletions).where(_deletions.c.sync_id.in_(revived)))
+    if inserts:
+        target.execute(insert(_cards), [card_values(row) for row in inserts])
+    if updates:
+        target.execute(
+            update(_cards)
+            .where(_cards.c.id == bindparam("target_id"))
+            .values({name: bindparam(f"new_{name}") for name in (*SYNC_COLUMNS, "deck_id")}),
+            [
+                {"target_id": target_id, **{f"new_{name}": value for name, value in card_values(row).items()}}
+                for target_id, row in updates
+            ],
+        )
+    if relinks:
+        target.execute(
+            update(_cards)
+            .where(_cards.c.id == bindparam("target_id"))
+            .values(sync_id=bindparam("new_sync_id"), updated_at=bindparam("new_updated_at")),
+            relinks,
+        )
+    _copy_tags(source, target, inserts + [row for _, row in updates])
+    return len(inserts) + len(updates)
+
+
+def _copy_tags(source: Connection, target: Connection, rows: List[Dict[str, Any]]) -> None:
+    """Replaces the target's tags of the cards just written with the source's."""
+    if not rows:
+        return
+    tags = source.execute(
+        select(_card_tags.c.card_id, _card_tags.c.tag).where(_card_tags.c.card_id.in_([row["id"] for row in rows]))
+    ).all()
+    target_ids = dict(
+        target.execute(
+            select(_cards.c.sync_id, _cards.c.id).where(_cards.c.sync_id.in_([row["sync_id"] for row in rows]))
+        ).all()
+    )
+    sync_ids = {row["id"]: row["sync_id"] for row in rows}
+    target.execute(delete(_card_tags).where(_card_tags.c.card_id.in_(target_ids.values())))
+    if tags:
+        target.execute(
+            insert(_card_tags), [{"card_id": target_ids[sync_ids[card_id]], "tag": tag} for card_id, tag in tags]
+        )
+
+
+def _apply_deletions(source: Connection, target: Connection, rows: List[Dict[str, Any]]) -> int:
+    """
+    Deletes the target's copies of a batch of deleted source cards and stores
+    their tombstones, last writer wins: a copy edited after the deletion is
+    kept, and is copied back to bring the card back on the source.
+
+    Returns:
+        The number of target cards deleted.
+    """
+    sync_ids = [row["sync_id"] for row in rows]
+    known = set(target.execute(select(_deletions.c.sync_id).where(_deletions.c.sync_id.in_(sync_ids))).scalars())
+    copies = {
+        sync_id: (card_id, _as_utc(updated_at))
+        for card_id, sync_id, updated_at in target.execute(
+            select(_cards.c.id, _cards.c.sync_id, _cards.c.updated_at).where(_cards.c.sync_id.in_(sync_ids))
+        )
+    }
+    card_ids, tombstones = [], []
+    for row in rows:
+        if row["sync_id"] in known:
+            continue
+        copy = copies.get(row["sync_id"])
+        if copy is not None:
+            if copy[1] > row["deleted_at"]:
+                continue
+            card_ids.append(copy[0])
+        tombstones.append(row)
+
+    if card_ids:
+        # Dependent rows are deleted explicitly, as SQLite does not enforce
+        # ON DELETE CASCADE unless foreign keys are switched on.
+        for table in _card_dependents:
+            target.execute(delete(table).where(table.c.card_id.in_(card_ids)))
+        target.execute(delete(_cards).where(_cards.c.id.in_(card_ids)))
+    if tombstones:
+        target.execute(insert(_deletions), tombstones)
+    return len(card_ids)
+
+
+def _copy_changes(
+    source: Connection,
+    target: Connection,
+    state: Connection,
+    name: str,
+    batch_size: int,
+    overlap: float,
+    query: Select,
+    apply: Callable[[Connection, Connection, List[Dict[str, Any]]], int],
+) -> int:
+    """
+    Copies the rows of `query` changed on `source` since the `name` watermark
+    to `target` with `apply`: cards, or the tombstones of deleted cards.
+
+    The watermark is the newest `changed_at` already copied, kept in the local
+    `sync_state` table. `changed_at` is stamped by the source database itself
+    whenever it stores a change, including one copied from another device, so
+    an edit made offline long ago is still found once it reaches the cloud.
+    The rows stamped within `overlap` seconds before the watermark are looked
+    at again, in case a transaction that started earlier committed after the
+    last sync read; that is harmless, as last writer wins makes copying
+    idempotent.
+    """
+    since = _get_watermark(state, name)
+    changed_at = query.selected_columns.changed_at
+    if since is not None:
+        query = query.where(changed_at >= since - timedelta(seconds=overlap))
+
+    copied = 0
+    watermark = None
+    result = source.execution_options(yield_per=batch_size).execute(query).mappings()
+    for partition in result.partitions():
+        batch = [
+            {
+                column: _as_utc(value) if isinstance(value, datetime) else value
+                for column, value in row.items() if column != "changed_at"
+            }
+            for row in partition
+        ]
+        copied += apply(source, target, batch)
+        watermark = _as_utc(partition[-1]["changed_at"])
+    target.commit()
+    if watermark is not None and (since is None or watermark > since):
+        _set_watermark(state, name, watermark)
+        state.commit()
+    return copied
+
+
+def _copy_cards(
+    source: Connection, target: Connection, state: Connection, name: str, batch_size: int, overlap: float
+) -> int:
+    return _copy_changes(source, target, state, name, batch_size, overlap, _card_changes(), _apply_batch)
+
+
+def _copy_deletions(
+    source: Connection, target: Connection, state: Connection, name: str, batch_size: int, overlap: float
+) -> int:
+    return _copy_changes(
+        source, target, state, f"{name}_deletions", batch_size, overlap, _deletion_changes(), _apply_deletions
+    )
+
+
+def sync_once(
+    local_engine: Engine,
+    remote_engine: Engine,
+    batch_size: Optional[int] = None,
+    overlap: Optional[float] = None,
+) -> SyncResult:
+    """
+    Pushes local card changes and deletions to the cloud database, then pulls
+    remote ones.
+
+    Conflicts are resolved per card by last writer wins on `updated_at`, or on
+    `deleted_at` for a deleted card.
+    """
+    batch_size = batch_size or settings.SYNC_BATCH_SIZE
+    overlap = settings.SYNC_WATERMARK_OVERLAP_SECONDS if overlap is None else overlap
+    with local_engine.connect() as local, remote_engine.connect() as remote:
+        result = SyncResult()
+        result.pushed = _copy_cards(local, remote, local, "push", batch_size, overlap)
+        result.pushed_deletions = _copy_deletions(local, remote, local, "push", batch_size, overlap)
+        result.pulled = _copy_cards(remote, local, local, "pull", batch_size, overlap)
+        result.pulled_deletions = _copy_deletions(remote, local, local, "pull", batch_size, overlap)
+    if result.pulled or result.pulled_deletions:
+        invalidate_due_forecast()
+    if result.pushed or result.pulled or result.pushed_deletions or result.pulled_deletions:
+        logging.info(
+            f"Synced cards: {result.pushed} pushed, {result.pulled} pulled, "
+            f"{result.pushed_deletions} deleted in the cloud, {result.pulled_deletions} deleted locally."
+        )
+    return result
+
+
+class SyncWorker:
+    """
+    Syncs the local replica with the cloud database every `interval` seconds
+    on a background thread.
+
+    A failed sync, e.g. while offline, is logged and retried at the next
+    interval; the application keeps working on the local replica meanwhile.
+    """
+
+    def __init__(self, local_engine: Engine, remote_engine: Engine, interval: Optional[float] = None):
+        self._local_engine = local_engine
+        self._remote_engine = remote_engine
+        self._interval = settings.SYNC_INTERVAL_SECONDS if interval is None else interval
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.last_result: Optional[SyncResult] = None
+        self.last_error: Optional[Exception] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sync-worker", daemon=True)
+        self._thread.start()
+        logging.info(f"Sync worker started with a {self._interval} s interval.")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.sync_now()
+            self._stop.wait(self._interval)
+
+    def sync_now(self) -> Optional[SyncResult]:
+        """Runs one sync; returns None if it failed."""
+        with self._lock:
+            try:
+                self.last_result = sync_once(self._local_engine, self._remote_engine)
+                self.last_error = None
+            except (SQLAlchemyError, OSError) as e:
+                logging.warning(f"Sync with the cloud database failed: {e}")
+                self.last_error = e
+                return None
+            return self.last_result
+
+    def stop(self, final_sync: bool = True) -> None:
+        """Stops the worker and, by default, runs one last sync to push recent changes."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if final_sync:
+            self.sync_now()
+        logging.info("Sync worker stopped.")
@@ -1,14 +1,90 @@
 import readchar
+from sqlalchemy.orm import sessionmaker
 
+from flash_zap.core.card_list import CardListPager
 from flash_zap.core.card_manager import (
+    CardEditor,
+    bulk_delete_cards,
+    bulk_find_replace,
+    bulk_lower_mastery,
+    bulk_reset_schedule,
     get_card_by_id,
-    update_card_front,
-    update_card_back,
-    update_card_mastery,
+    search_card_ids,
+    search_cards,
 )
+from flash_zap.core.decks import get_or_create_deck, move_cards_to_deck, tag_cards
 from flash_zap.utils.terminal import clear_screen
 
 
+def show_card_details(session, card):
+    """
+    Shows a card with its edit options until the user goes back. Edits are
+    saved together, with one commit, when the user leaves the menu.
+    """
+    editor = CardEditor(session, card)
+    while True:
+        clear_screen()
+        print("--- Card Details ---")
+        print(f"ID: {card.id}")
+        print(f"Front: {editor.front}")
+        print(f"Back: {editor.back}")
+        print(f"Mastery Level: {editor.mastery_level}")
+        print(f"Next Review: {card.next_review_date}")
+        print("--------------------")
+
+        print("\n--- Edit Options ---")
+        print("1. Edit front")
+        print("2. Edit back")
+        print("3. Lower mastery level")
+        print("4. Save and go back")
+        print("5. Discard changes and go back")
+        print("--------------------")
+
+        choice = readchar.readkey()
+
+        if choice == "1":
+            clear_screen()
+            print(f"Current front: {editor.front}")
+            new_front = input("Enter the new text for the front: ")
+            editor.set_front(new_front)
+            print("Card front changed.")
+            print("\nPress any key to continue...")
+            readchar.readkey()
+        elif choice == "2":
+            clear_screen()
+            print(f"Current back: {editor.back}")
+            new_back = input("Enter the new text for the back: ")
+            editor.set_back(new_back)
+            print("Card back changed.")
+            print("\nPress any key to continue...")
+            readchar.readkey()
+        elif choice == "3":
+            clear_screen()
+            print(f"Current mastery level: {editor.mastery_level}")
+            new_mastery_level_str = input("Enter the new mastery level: ")
+            try:
+                new_mastery_level = int(new_mastery_level_str)
+                if editor.lower_mastery(new_mastery_level):
+                    print("Mastery level changed.")
+                else:
+                    print(
+                        "New mastery level cannot be higher than the current one."
+                    )
+            except ValueError:
+                print("Invalid input. Please enter a number.")
+            print("\nPress any key to continue...")
+            readchar.readkey()
+        elif choice == "4":
+            if editor.save():
+                print("Card saved successfully.")
+                print("\nPress any key to continue...")
+                readchar.readkey()
+            break
+        elif choice == "5":
+            editor.discard()
+            break
+
+
 def show_card_view(session):
     """Shows a detailed view of a single card for viewing or editing."""
     clear_screen()
@@ -18,65 +94,7 @@ def show_card_view(session):
         card = get_card_by_id(session, card_id)
 
         if card:
-            while True:
-                clear_screen()
-                print("--- Card Details ---")
-                print(f"ID: {card.id}")
-                print(f"Front: {card.front}")
-                print(f"Back: {card.back}")
-                print(f"Mastery Level: {card.mastery_level}")
-                print(f"Next Review: {card.next_review_date}")
-                print("--------------------")
-
-                print("\n--- Edit Options ---")
-                print("1. Edit front")
-                print("2. Edit back")
-                print("3. Lower mastery level")
-                print("4. Cancel")
-                print("--------------------")
-
-                choice = readchar.readkey()
-
-                if choice == "1":
-                    clear_screen()
-                    print(f"Current front: {card.front}")
-                    new_front = input("Enter the new text for the front: ")
-                    update_card_front(session, card.id, new_front)
-                    card.front = new_front
-                    print("Card front updated successfully.")
-                    print("\nPress any key to continue...")
-                    readchar.readkey()
-                elif choice == "2":
-                    clear_screen()
-                    print(f"Current back: {card.back}")
-                    new_back = input("Enter the new text for the back: ")
-                    update_card_back(session, card.id, new_back)
-                    card.back = new_back
-                    print("Card back updated successfully.")
-                    print("\nPress any key to continue...")
-                    readchar.readkey()
-                elif choice == "3":
-                    clear_screen()
-                    print(f"Current mastery level: {card.mastery_level}")
-                    new_mastery_level_str = input("Enter the new mastery level: ")
-                    try:
-                        new_mastery_level = int(new_mastery_level_str)
-                        if new_mastery_level <= card.mastery_level:
-                            update_card_mastery(
-                                session, card.id, new_mastery_level
-                            )
-                            card.mastery_level = new_mastery_level
-                            print("Mastery level updated successfully.")
-                        else:
-                            print(
-                                "New mastery level cannot be higher than the current one."
-                            )
-                    except ValueError:
-                        print("Invalid input. Please enter a number.")
-                    print("\nPress any key to continue...")
-                    readchar.readkey()
-                elif choice == "4":
-                    break
+            show_card_details(session, card)
         else:
             print("Card not found.")
             print("\nPress any key to return to the main menu...")
@@ -85,4 +103,168 @@ def show_card_view(session):
     except ValueError:
         print("Invalid ID. Please enter a number.")
         print("\nPress any key to return to the main menu...")
-        readchar.readkey() 
\ No newline at end of file
+        readchar.readkey() 
+
+def _shorten(text, width=40):
+    text = " ".join(text.split())
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def search_cards_view(session):
+    """Searches card fronts and backs and lets the user open a result."""
+    clear_screen()
+    query = input("Enter the text to search for: ")
+    page = 1
+    while True:
+        results = search_cards(session, query, page=page)
+        clear_screen()
+        print(f"--- Search results for \"{query}\" (page {page}) ---")
+        if not results.cards:
+            print("No cards found.")
+        for card in results.cards:
+            print(f"{card.id:>7} | {_shorten(card.front)} | {_shorten(card.back)}")
+        print("--------------------")
+
+        options = ["an ID to open a card"]
+        if results.cards:
+            options.append("'a' to edit all results")
+        if results.has_next:
+            options.append("'n' for the next page")
+        if page > 1:
+            options.append("'p' for the previous page")
+        choice = input(f"Enter {', '.join(options)}, or press Enter to go back: ").strip().lower()
+
+        if choice == "":
+            break
+        elif choice == "n" and results.has_next:
+            page += 1
+        elif choice == "p" and page > 1:
+            page -= 1
+        elif choice == "a" and results.cards:
+            bulk_edit_view(session, search_card_ids(session, query))
+            page = 1
+        elif choice.isdigit():
+            card = get_card_by_id(session, int(choice))
+            if card:
+                show_card_details(session, card)
+            else:
+                print("Card not found.")
+                print("\nPress any key to continue...")
+                readchar.readkey()
+
+
+def bulk_edit_view(session, card_ids):
+    """Applies one edit to all the given cards at once."""
+    clear_screen()
+    print(f"--- Edit {len(card_ids)} cards ---")
+    print("1. Lower mastery level")
+    print("2. Reset schedule")
+    print("3. Find and replace text")
+    print("4. Delete cards")
+    print("5. Move to deck")
+    print("6. Add tags")
+    print("7. Cancel")
+    print("--------------------")
+
+    choice = readchar.readkey()
+
+    if choice == "1":
+        try:
+            new_mastery_level = int(input("Enter the new mastery level: "))
+            changed = bulk_lower_mastery(session, card_ids, new_mastery_level)
+            print(f"Lowered the mastery level of {changed} cards.")
+        except ValueError:
+            print("Invalid input. Please enter a number.")
+    elif choice == "2":
+        changed = bulk_reset_schedule(session, card_ids)
+        print(f"Reset the schedule of {changed} cards.")
+    elif choice == "3":
+        find = input("Enter the text to find: ")
+        if find:
+            replace = input("Enter the text to replace it with: ")
+            result = bulk_find_replace(session, card_ids, find, replace)
+            print(f"Changed {result.changed} cards.")
+            if result.too_long:
+                print(f"Skipped {result.too_long} cards whose text would exceed 200 characters.")
+        else:
+            print("Nothing to find.")
+    elif choice == "4":
+        if input(f"Delete {len(card_ids)} cards? Type 'yes' to confirm: ").strip().lower() == "yes":
+            deleted = bulk_delete_cards(session, card_ids)
+            print(f"Deleted {deleted} cards.")
+        else:
+            print("Nothing was deleted.")
+    elif choice == "5":
+        name = input("Enter the deck name (leave empty to take the cards out of their deck): ").strip()
+        try:
+            deck_id = get_or_create_deck(session, name).id if name else None
+            moved = move_cards_to_deck(session, card_ids, deck_id)
+            print(f"Moved {moved} cards.")
+        except ValueError as e:
+            print(e)
+    elif choice == "6":
+        tags = input("Enter the tags, separated by spaces: ").split()
+        try:
+            added = tag_cards(session, card_ids, tags)
+            print(f"Added {added} tags.")
+        except ValueError as e:
+            print(e)
+    else:
+        return
+    print("\nPress any key to continue...")
+    readchar.readkey()
+
+
+def list_cards_view(session):
+    """Shows every card in a list that can be scrolled a page at a time."""
+    # The pager prefetches on a background thread, which needs sessions of its own.
+    pager = CardListPager(sessionmaker(bind=session.get_bind()))
+    try:
+        while True:
+            page = pager.page
+            clear_screen()
+            print("--- All Cards ---")
+            if not page.items:
+                print("There are no cards yet.")
+            for item in page.items:
+                print(
+                    f"{item.id:>7} | {_shorten(item.front)} | {_shorten(item.back)} | "
+                    f"level {item.mastery_level} | due {item.next_review_date}"
+                )
+            print("--------------------")
+            print("n: next page | p: previous page | o: open a card | q: back")
+
+            choice = readchar.readkey()
+            if choice in ("n", readchar.key.RIGHT, readchar.key.DOWN):
+                pager.next_page()
+            elif choice in ("p", readchar.key.LEFT, readchar.key.UP):
+                pager.previous_page()
+            elif choice == "o":
+                card_id_str = input("Enter the ID of the card you want to open: ")
+                card = get_card_by_id(session, int(card_id_str)) if card_id_str.strip().isdigit() else None
+                if card:
+                    show_card_details(session, card)
+                    pager.reload()
+            elif choice == "q":
+                break
+    finally:
+        pager.close()
+
+
+def browse_cards(session):
+    """Lets the user list cards, find one by ID or search their text."""
+    clear_screen()
+    print("--- Browse Cards ---")
+    print("1. Find a card by ID")
+    print("2. Search cards by text")
+    print("3. List all cards")
+    print("4. Back")
+    print("--------------------")
+
+    choice = readchar.readkey()
+    if choice == "1":
+        show_card_view(session)
+    elif choice == "2":
+        search_cards_view(session)
+    elif choice == "3":
+        list_cards_view(session)
@@ -1,17 +1,80 @@
 import os
 import readchar
 import logging
+import threading
+from typing import Optional
 
-from flash_zap.config import SessionLocal, engine
-from flash_zap.models.base import Base
-from flash_zap.services.import_service import import_cards_from_json
-from flash_zap.tui import review_view, browse_view
+from flash_zap.config import get_engine, get_session_factory, settings
+from flash_zap.services import due_forecast
+from flash_zap.utils.db_timing import DbTimer, warm_up
 
+# Views, services and the database layer are imported when a menu option first
+# needs them, so drawing the main menu does not wait for SQLAlchemy, rich or
+# the Gemini SDK to load.
 
-def display_main_menu():
-    """Displays the main menu."""
+# Logs connect time versus query time for every view opened from the menu.
+db_timer = DbTimer()
+_warm_up_thread: Optional[threading.Thread] = None
+# Set after loading the due forecast failed, so an unreachable database does
+# not delay every redraw of the menu.
+_due_forecast_failed = False
+
+
+def _wait_for_warm_up():
+    """Waits for the startup warm-up, so the tables exist before a view uses them."""
+    if _warm_up_thread is not None:
+        _warm_up_thread.join()
+
+
+def _create_tables(engine):
+    from flash_zap.models.base import Base
+    # Import all models here to ensure they are registered with Base
+    from flash_zap.models import card, card_deletion, card_tag, deck, grade_cache_entry, review, sync_state  # noqa: F401
+    from flash_zap.models.card_search import ensure_search_index
+
+    Base.metadata.create_all(bind=engine)
+    # create_all skips the existing cards table, and with it the search index.
+    with engine.begin() as connection:
+        ensure_search_index(connection)
+
+
+def _load_due_forecast(engine):
+    from sqlalchemy.orm import Session
+
+    with Session(engine) as db_session:
+        due_forecast.get_due_forecast(db_session)
+
+
+def _due_summary() -> Optional[str]:
+    """
+    Returns the "Due today" line for the menu, or None while it is unknown.
+
+    The forecast is normally cached and kept current by the review session;
+    it is only loaded here after an import or sync invalidated it, and never
+    before the startup warm-up has finished, so drawing the menu never waits
+    for the connection to be set up.
+    """
+    global _due_forecast_failed
+    forecast = due_forecast.cached_due_forecast()
+    warmed_up = _warm_up_thread is not None and not _warm_up_thread.is_alive()
+    if forecast is None and warmed_up and not _due_forecast_failed:
+        db_session = get_session_factory()()
+        try:
+            forecast = due_forecast.get_due_forecast(db_session)
+        except Exception:
+            _due_forecast_failed = True
+            logging.warning("Loading the due forecast failed.", exc_info=True)
+        finally:
+            db_session.close()
+    return due_forecast.format_due_summary(forecast) if forecast is not None else None
+
+
+def display_main_menu(due_summary: Optional[str] = None):
+    """Displays the main menu, with the due card summary if one is given."""
+    summary_line = f"{due_summary}\n" if due_summary else ""
     return (
         "--- FlashZap Main Menu ---\n"
+        f"{summary_line}"
         "1. Review Due Cards\n"
         "2. Import Flashcards from JSON\n"
         "3. Browse Cards\n"
@@ -23,9 +86,13 @@ def display_main_menu():
 def navigate_to_review_session():
     """Starts the review session flow."""
     logging.info("Creating DB session for review session.")
-    db_session = SessionLocal()
+    from flash_zap.tui import review_view
+
+    _wait_for_warm_up()
+    db_session = get_session_factory()()
     try:
-        review_view.start_review_session(db_session)
+        with db_timer.measure("review session"):
+            review_view.start_review_session(db_session)
     finally:
         db_session.close()
         logging.info("DB session for review session closed.")
@@ -34,9 +101,13 @@ def navigate_to_review_session():
 def navigate_to_browse_view():
     """Starts the browse card view flow."""
     logging.info("Creating DB session for browse view.")
-    db_session = SessionLocal()
+    from flash_zap.tui import browse_view
+
+    _wait_for_warm_up()
+    db_session = get_session_factory()()
     try:
-        browse_view.show_card_view(db_session)
+        with db_timer.measure("browse view"):
+            browse_view.browse_cards(db_session)
     finally:
         db_session.close()
         logging.info("DB session for browse view closed.")
@@ -45,9 +116,13 @@ def navigate_to_browse_view():
 def _handle_import_json():
     """Handles the JSON import flow."""
     logging.info("Creating DB session for JSON import.")
-    db_session = SessionLocal()
+    from flash_zap.services.import_service import import_cards_from_json
+
+    _wait_for_warm_up()
+    db_session = get_session_factory()()
     try:
-        import_cards_from_json(db_session)
+        with db_timer.measure("JSON import"):
+            import_cards_from_json(db_session)
     finally:
         db_session.close()
         logging.info("DB session for JSON import closed.")
@@ -76,18 +151,40 @@ def handle_menu_input(key):
         return None
 
 
+def _start_sync_worker():
+    """Starts syncing the local replica with the cloud database in "local" mode."""
+    if settings.DATABASE_MODE != "local":
+        return None
+    from flash_zap.config import create_cloud_engine
+    from flash_zap.services.sync_service import SyncWorker
+
+    # The local replica's tables must exist before the first sync.
+    _wait_for_warm_up()
+    worker = SyncWorker(get_engine(), create_cloud_engine())
+    worker.start()
+    return worker
+
+
 def run_main_menu_loop():
     """Displays the main menu and handles user input."""
-    Base.metadata.create_all(bind=engine)
-    while True:
-        # Clear the screen
-        os.system('cls' if os.name == 'nt' else 'clear')
+    global _warm_up_thread
+    # Create the engine and missing tables, open the first connection and load
+    # the due forecast while the menu is drawn.
+    _warm_up_thread = warm_up(get_engine, db_timer.attach, _create_tables, _load_due_forecast)
+    sync_worker = _start_sync_worker()
+    try:
+        while True:
+            # Clear the screen
+            os.system('cls' if os.name == 'nt' else 'clear')
 
-        print(display_main_menu())
+            print(display_main_menu(_due_summary()))
 
-        key = readchar.readkey()
+            key = readchar.readkey()
 
-        action = handle_menu_input(key)
+            action = handle_menu_input(key)
 
-        if action == "exit":
-            break 
\ No newline at end of file
+            if action == "exit":
+                break
+    finally:
+        if sync_worker is not None:
+            sync_worker.stop() 
\ No newline at end of file
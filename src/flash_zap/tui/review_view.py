@@ -1,61 +1,134 @@
 from rich.console import Console
 from rich.prompt import Prompt
 from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
 import logging
 
-from flash_zap.core.exceptions import AIGraderError
-from flash_zap.core.review_session import ReviewSession
+from flash_zap.core.decks import list_decks, list_tags, normalize_tags
+from flash_zap.core.review_session import GradedAnswer, ReviewSession
 from flash_zap.models.card import Card
+from flash_zap.config import settings
+from flash_zap.services import ai_grader
+from flash_zap.services.grade_cache import GradeCache
+from flash_zap.services.local_grader import LocalGrader
+from flash_zap.services.review_log import ReviewLogWriter
+
+
+def choose_review_scope(db_session: Session, console: Console) -> Tuple[Optional[int], Optional[List[str]]]:
+    """
+    Lets the user pick a deck and/or tags to review, if the collection has any.
+
+    Returns:
+        The chosen deck id and tags, each None for no restriction.
+    """
+    decks = list_decks(db_session)
+    tags = list_tags(db_session)
+    if not decks and not tags:
+        return None, None
+    console.print("0. All cards")
+    for number, deck in enumerate(decks, start=1):
+        console.print(f"{number}. {deck.name} ({deck.due} due of {deck.cards})")
+    if tags:
+        console.print("Tags: " + ", ".join(f"#{tag} ({count})" for tag, count in tags))
+    answer = Prompt.ask("Choose a deck, optionally followed by #tags", default="0")
+    words = answer.split()
+    chosen_tags = normalize_tags(word for word in words if word.startswith("#")) or None
+    numbers = [word for word in words if not word.startswith("#")]
+    deck_id = None
+    if numbers and numbers[0].isdigit() and 1 <= int(numbers[0]) <= len(decks):
+        deck_id = decks[int(numbers[0]) - 1].id
+    return deck_id, chosen_tags
 
 
 def start_review_session(db_session: Session) -> None:
-    """Starts a review session."""
+    """
+    Starts a review session.
+
+    Answers are graded in the background: the next card is shown as soon as
+    an answer is submitted, and grades are reported as they arrive.
+    """
     logging.info("Starting a new review session.")
     console = Console()
-    session = ReviewSession(db_session)
-
-    card = session.get_next_card()
-    if not card:
-        logging.info("No cards due for review. Ending session.")
-        display_no_cards_due_message(console)
-        return
-
-    while card:
-        console.clear()
-        display_progress_indicator(console, session.remaining_cards_count)
-        display_card_front(card, console)
-        logging.info(f"Presenting card id {card.id} to the user.")
-        user_answer = Prompt.ask("Your answer")
-
-        if user_answer.lower() == "exit":
-            logging.info("User typed 'exit'. Ending review session.")
-            break
-
-        logging.info(f"User submitted an answer for card id {card.id}.")
-
-        try:
-            with console.status("[yellow]Grading...[/yellow]", spinner="dots"):
-                grade, feedback, old_mastery_level = session.grade_and_update_card(card, user_answer)
+    deck_id, tags = choose_review_scope(db_session, console)
+    pre_grader = LocalGrader() if settings.LOCAL_GRADER_ENABLED else None
+    cache = GradeCache(db_session) if settings.GRADE_CACHE_ENABLED else None
+    session = ReviewSession(
+        db_session,
+        grader=ai_grader.get_default_grader(),
+        pre_grader=pre_grader,
+        grade_cache=cache,
+        review_log=ReviewLogWriter(db_session) if settings.REVIEW_LOG_ENABLED else None,
+        deck_id=deck_id,
+        tags=tags,
+    )
+
+    try:
+        card = session.get_next_card()
+        if not card:
+            logging.info("No cards due for review. Ending session.")
+            display_no_cards_due_message(console)
+            return
+
+        graded_answers = []
+        while True:
+            graded_answers.extend(session.collect_graded_answers())
+            card = session.get_next_card()
+            if card is None:
+                if not session.has_pending_grades:
+                    break
+                # Grades still in flight may put demoted cards back into the deck.
+                with console.status("[yellow]Grading...[/yellow]", spinner="dots"):
+                    graded_answers.extend(session.collect_graded_answers(wait=True))
+                continue
 
-            logging.info(f"AI feedback for card id {card.id}: {feedback}")
-            
             console.clear()
             display_progress_indicator(console, session.remaining_cards_count)
+            for graded in graded_answers:
+                display_graded_answer(graded, console)
+            graded_answers = []
             display_card_front(card, console)
-            console.print(f"Your answer: {user_answer}")
+            logging.info(f"Presenting card id {card.id} to the user.")
+            user_answer = Prompt.ask("Your answer")
 
-            display_grade_and_feedback(grade, feedback, card, old_mastery_level, console)
-        except AIGraderError as e:
-            logging.error("AIGraderError occurred during review session.", exc_info=True)
-            display_service_error_message(console)
+            if user_answer.lower() == "exit":
+                logging.info("User typed 'exit'. Ending review session.")
+                break
 
-        Prompt.ask("Press Enter to continue...")
-        card = session.get_next_card()
+            logging.info(f"User submitted an answer for card id {card.id}.")
+            session.submit_answer(card, user_answer)
 
+        if session.has_pending_grades:
+            with console.status("[yellow]Grading...[/yellow]", spinner="dots"):
+                graded_answers.extend(session.wait_for_pending_grades())
+        if graded_answers:
+            console.clear()
+            for graded in graded_answers:
+                display_graded_answer(graded, console)
+            Prompt.ask("Press Enter to continue...")
+    finally:
+        session.close()
+
+    if pre_grader is not None and pre_grader.lookups:
+        display_local_grader_stats(pre_grader, console)
+    if cache is not None and cache.hits + cache.misses:
+        display_grade_cache_stats(cache, console)
     console.print("Review session ended.")
     logging.info("Review session finished.")
 
 
+def display_graded_answer(graded: GradedAnswer, console: Console) -> None:
+    """Displays the outcome of a background grade for a previously answered card."""
+    display_card_front(graded.card, console)
+    console.print(f"Your answer: {graded.user_answer}")
+    if graded.error is not None:
+        display_service_error_message(console)
+        return
+    logging.info(f"AI feedback for card id {graded.card.id}: {graded.feedback}")
+    display_grade_and_feedback(
+        graded.grade, graded.feedback, graded.card, graded.old_mastery_level, console
+    )
+
+
 def display_progress_indicator(console: Console, remaining_count: int) -> None:
     """Displays the review session progress."""
     console.print(f"Remaining: {remaining_count}", justify="left")
@@ -81,6 +154,30 @@ def display_grade_and_feedback(
     console.print(f"[dim]Mastery level updated from {old_mastery_level} to: {card.mastery_level}[/dim]")
 
 
+def display_local_grader_stats(pre_grader: LocalGrader, console: Console) -> None:
+    """Displays how many answers were graded locally, without an AI call."""
+    logging.info(
+        f"Local grader answered {pre_grader.hits} of {pre_grader.lookups} answers "
+        f"(hit rate {pre_grader.hit_rate:.0%})."
+    )
+    console.print(
+        f"[dim]Graded locally: {pre_grader.hits} of {pre_grader.lookups} answers "
+        f"({pre_grader.hit_rate:.0%} AI calls saved)[/dim]"
+    )
+
+
+def display_grade_cache_stats(cache: GradeCache, console: Console) -> None:
+    """Displays how many grades came from the grade cache and the time saved."""
+    logging.info(
+        f"Grade cache: {cache.hits} hits, {cache.misses} misses, "
+        f"~{cache.saved_seconds:.1f}s of AI grading saved."
+    )
+    console.print(
+        f"[dim]Cached grades: {cache.hits} hits, {cache.misses} misses "
+        f"(~{cache.saved_seconds:.1f}s of grading saved)[/dim]"
+    )
+
+
 def display_no_cards_due_message(console: Console) -> None:
     """Displays a message when no cards are due for review."""
     console.print("Great job! No cards are due for review.")
@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterator
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+
+@dataclass
+class DbTimings:
+    """Time spent opening database connections and running statements."""
+    connections: int = 0
+    connect_seconds: float = 0.0
+    statements: int = 0
+    query_seconds: float = 0.0
+
+    def __sub__(self, other: "DbTimings") -> "DbTimings":
+        return DbTimings(
+            self.connections - other.connections,
+            self.connect_seconds - other.connect_seconds,
+            self.statements - other.statements,
+            self.query_seconds - other.query_seconds,
+        )
+
+
+class DbTimer:
+    """
+    Measures connect time and query time of an engine through SQLAlchemy events.
+
+    Connect time covers opening new DBAPI connections (TCP, TLS and login);
+    query time covers every statement sent on any connection, including ones
+    that fail. Use `measure` to log both for one view or action.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = DbTimings()
+        self._local = threading.local()
+
+    def attach(self, engine: "Engine") -> None:
+        from sqlalchemy import event
+
+        event.listen(engine, "do_connect", self._before_connect)
+        event.listen(engine, "connect", self._after_connect)
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def snapshot(self) -> DbTimings:
+        with self._lock:
+            return DbTimings(**vars(self._totals))
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Logs the connect and query time spent while the block runs."""
+        before = self.snapshot()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            spent = self.snapshot() - before
+            logging.info(
+                f"DB timing for {name}: connect {spent.connect_seconds * 1000:.1f} ms "
+                f"({spent.connections} connections), queries {spent.query_seconds * 1000:.1f} ms "
+                f"({spent.statements} statements), {elapsed * 1000:.1f} ms in total."
+            )
+
+    def _before_connect(self, dialect, conn_rec, cargs, cparams):
+        self._local.connect_start = time.perf_counter()
+
+    def _after_connect(self, dbapi_connection, connection_record):
+        start = getattr(self._local, "connect_start", None)
+        if start is None:
+            return
+        self._local.connect_start = None
+        with self._lock:
+            self._totals.connections += 1
+            self._totals.connect_seconds += time.perf_counter() - start
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("db_timer_starts", {})[id(cursor)] = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self._record(conn.info["db_timer_starts"].pop(id(cursor)))
+
+    def _handle_error(self, exception_context):
+        # A failed statement never reaches after_cursor_execute; drop its start
+        # time here, so the connection does not collect one per error.
+        conn, context = exception_context.connection, exception_context.execution_context
+        cursor = getattr(context, "cursor", None)
+        if conn is None or cursor is None:
+            return
+        start = conn.info.get("db_timer_starts", {}).pop(id(cursor), None)
+        if start is not None:
+            self._record(start)
+
+    def _record(self, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._totals.statements += 1
+            self._totals.query_seconds += elapsed
+
+
+def warm_up(get_engine: Callable[[], "Engine"], *setup: Callable[["Engine"], None]) -> threading.Thread:
+    """
+    Creates the engine and opens a pooled connection on a background thread,
+    so the first view does not pay for imports and connection setup.
+
+    Any `setup` callables are run with the engine first (e.g. creating missing
+    tables). Join the returned thread before relying on them.
+    """
+    def run():
+        start = time.perf_counter()
+        try:
+            engine = get_engine()
+            for step in setup:
+                step(engine)
+            with engine.connect() as conn:
+                conn.exec_driver_sql("SELECT 1")
+        except Exception:
+            # The first view reports connection problems to the user.
+            logging.warning("Database warm-up failed.", exc_info=True)
+            return
+        logging.info(f"Database connection warmed up in {(time.perf_counter() - start) * 1000:.1f} ms.")
+
+    thread = threading.Thread(target=run, name="db-warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,102 @@
+import json
+import re
+from typing import Any, Iterator, TextIO
+
+_READ_CHUNK_SIZE = 64 * 1024
+_WHITESPACE = " \t\n\r"
+_OPENERS = "{[\""
+_SCALAR_END = re.compile(r"[,\]}\s]")
+
+
+class NotAnArrayError(TypeError):
+    """Raised when a file is valid JSON, but its root is not an array."""
+
+
+class _ArrayReader:
+    """Reads a JSON document from a text file in chunks, keeping only a small buffer."""
+
+    def __init__(self, file: TextIO, chunk_size: int):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def read_more(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop the consumed part of the buffer so it never grows past one item plus a chunk.
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def next_char(self) -> str:
+        """Skips whitespace and returns the next character without consuming it ("" at the end)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read_more():
+                return ""
+
+    def decode_value(self) -> Any:
+        if self.next_char() not in _OPENERS:
+            # A number or literal has no closing character; make sure it is
+            # followed by a delimiter so a chunk boundary cannot cut it short.
+            while not _SCALAR_END.search(self.buffer, self.pos) and self.read_more():
+                pass
+        while True:
+            try:
+                value, self.pos = self._decoder.raw_decode(self.buffer, self.pos)
+                return value
+            except json.JSONDecodeError:
+                if not self.read_more():
+                    raise
+
+    def rest(self) -> str:
+        while self.read_more():
+            pass
+        return self.buffer[self.pos:]
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+
+def iter_json_array(file: TextIO, chunk_size: int = _READ_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yields the items of a top-level JSON array one at a time.
+
+    The file is read in chunks of `chunk_size` characters, so memory use depends
+    on the size of the largest item rather than on the size of the file.
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON. Items before the
+            error have already been yielded.
+        NotAnArrayError: If the file is valid JSON, but its root is not an array.
+    """
+    reader = _ArrayReader(file, chunk_size)
+    if reader.next_char() != "[":
+        json.loads(reader.rest())
+        raise NotAnArrayError("JSON root is not an array.")
+    reader.pos += 1
+
+    if reader.next_char() == "]":
+        reader.pos += 1
+    else:
+        while True:
+            yield reader.decode_value()
+            separator = reader.next_char()
+            reader.pos += 1
+            if separator == "]":
+                break
+            if separator != ",":
+                raise reader.error("Expecting ',' delimiter")
+
+    if reader.next_char():
+        raise reader.error("Extra data")
@@ -0,0 +1,137 @@
+import hashlib
+import re
+import unicodedata
+from typing import Optional, Tuple
+
+# Letters that Unicode does not decompose into a base letter plus a diacritic.
+_EXTRA_FOLDS = str.maketrans({"ł": "l", "ø": "o", "đ": "d", "ß": "ss", "æ": "ae", "œ": "oe"})
+# Punctuation that only decorates an answer. A '.' or ',' between two digits
+# is a decimal separator and is kept; every other symbol ("-", "+", "%", "/",
+# "°", ...) can change what an answer means ("-5" is not "5") and is kept too.
+_DECORATIVE_PUNCTUATION = re.compile(r"(?!(?<=\d)[.,]\d)[.,!?¿¡;:\"'`()\[\]{}…«»„“”‘’–—]")
+# A hyphen joining two words ("Bielsko-Biała") separates them like a space.
+_WORD_HYPHEN = re.compile(r"(?<=[^\W\d_])-(?=[^\W\d_])")
+_DECIMAL_COMMA = re.compile(r"(?<=\d),(?=\d)")
+_SPACED_SYMBOL = re.compile(r"\s*([^\w\s])\s*")
+_WHITESPACE = re.compile(r"\s+")
+
+# Month names after normalize_answer (so without diacritics), in every case a
+# Polish date commonly uses them, plus English names.
+_MONTH_NAMES = {
+    1: ("styczen", "stycznia", "styczniu", "january", "jan"),
+    2: ("luty", "lutego", "lutym", "february", "feb"),
+    3: ("marzec", "marca", "marcu", "march", "mar"),
+    4: ("kwiecien", "kwietnia", "kwietniu", "april", "apr"),
+    5: ("maj", "maja", "maju", "may"),
+    6: ("czerwiec", "czerwca", "czerwcu", "june", "jun"),
+    7: ("lipiec", "lipca", "lipcu", "july", "jul"),
+    8: ("sierpien", "sierpnia", "sierpniu", "august", "aug"),
+    9: ("wrzesien", "wrzesnia", "wrzesniu", "september", "sep"),
+    10: ("pazdziernik", "pazdziernika", "pazdzierniku", "october", "oct"),
+    11: ("listopad", "listopada", "listopadzie", "november", "nov"),
+    12: ("grudzien", "grudnia", "grudniu", "december", "dec"),
+}
+_ROMAN_MONTHS = ("i", "ii", "iii", "iv", "v", "vi", "vii", "viii", "ix", "x", "xi", "xii")
+_MONTHS = {name: month for month, names in _MONTH_NAMES.items() for name in names}
+_MONTHS.update({roman: month for month, roman in enumerate(_ROMAN_MONTHS, start=1)})
+
+_NUMERIC_DATE = re.compile(r"^(\d{1,4})[./-](\d{1,2})[./-](\d{1,4})$")
+_YEAR_SUFFIXES = ("r", "roku", "rok")
+
+
+def normalize_answer(text: str) -> str:
+    """
+    Normalizes an answer for comparison.
+
+    Case-folds the text, strips diacritics, removes sentence punctuation and
+    collapses whitespace, so "  Gdańsk, Polska! " and "gdansk polska" compare
+    equal. Signs and symbols are kept, so "-5" is not "5" and "50%" is not
+    "50"; only the spaces around them are dropped ("50 %" is "50%"), and a
+    decimal comma is written as a point ("3,14" is "3.14").
+    """
+    text = unicodedata.normalize("NFKD", text.casefold().translate(_EXTRA_FOLDS))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = _DECORATIVE_PUNCTUATION.sub(" ", text)
+    text = _WORD_HYPHEN.sub(" ", text)
+    text = _DECIMAL_COMMA.sub(".", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    return _SPACED_SYMBOL.sub(r"\1", text)
+
+
+def card_content_hash(front: str, back: str) -> str:
+    """
+    Fingerprints a card's content for deduplicating imports.
+
+    Case and whitespace are ignored, but punctuation and diacritics are kept,
+    since they can change what a card asks ("2+2" is not "2-2").
+
+    Returns:
+        A 64 character SHA-256 hex digest.
+    """
+    normalized = [
+        _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip().casefold()
+        for text in (front, back)
+    ]
+    return hashlib.sha256("\x00".join(normalized).encode("utf-8")).hexdigest()
+
+
+def parse_date(text: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Parses a whole answer as a calendar date.
+
+    Understands numeric dates (15.07.1410, 1410-07-15, 15/07/1410) and day,
+    month and year written with a month name in any Polish case or as a Roman
+    numeral ("15 lipca 1410", "15 lipiec 1410 r.", "15 VII 1410").
+
+    Returns:
+        A (day, month, year) tuple, or None if the text is not just a date.
+    """
+    compact = text.strip().casefold()
+    match = _NUMERIC_DATE.match(compact)
+    if match:
+        first, month, last = (int(part) for part in match.groups())
+        day, year = (last, first) if len(match.group(1)) == 4 else (first, last)
+        return _valid_date(day, month, year)
+
+    words = normalize_answer(text).split()
+    if words and words[-1] in _YEAR_SUFFIXES:
+        words = words[:-1]
+    if len(words) != 3 or not words[0].isdigit() or not words[2].isdigit():
+        return None
+    month = int(words[1]) if words[1].isdigit() else _MONTHS.get(words[1])
+    if month is None:
+        return None
+    return _valid_date(int(words[0]), month, int(words[2]))
+
+
+def _valid_date(day: int, month: int, year: int) -> Optional[Tuple[int, int, int]]:
+    if 1 <= day <= 31 and 1 <= month <= 12:
+        return day, month, year
+    return None
+
+
+def edit_distance(first: str, second: str, limit: Optional[int] = None) -> int:
+    """
+    Returns the Levenshtein distance between two strings.
+
+    If `limit` is given, stops early and returns `limit + 1` as soon as the
+    distance is known to exceed it.
+    """
+    if len(first) < len(second):
+        first, second = second, first
+    if limit is not None and len(first) - len(second) > limit:
+        return limit + 1
+
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, start=1):
+        current = [i]
+        for j, second_char in enumerate(second, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (first_char != second_char),
+            ))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
@@ -9,6 +9,12 @@ from sqlalchemy.orm import sessionmaker
 from flash_zap.models.base import Base
 # Import all models here to ensure they are registered with Base
 from flash_zap.models.card import Card
+from flash_zap.models.card_deletion import CardDeletion
+from flash_zap.models.card_tag import CardTag
+from flash_zap.models.deck import Deck
+from flash_zap.models.grade_cache_entry import GradeCacheEntry
+from flash_zap.models.review import Review
+from flash_zap.models.sync_state import SyncState
 
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
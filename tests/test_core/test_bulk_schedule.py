@@ -0,0 +1,96 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from flash_zap.core import bulk_schedule
+from flash_zap.models.card import Card
+
+
+def _add_cards(session: Session, *levels_and_dates):
+    cards = [
+        Card(front=f"Q{i}", back=f"A{i}", mastery_level=level, next_review_date=due)
+        for i, (level, due) in enumerate(levels_and_dates)
+    ]
+    session.add_all(cards)
+    session.commit()
+    return [card.id for card in cards]
+
+
+def _state(session: Session):
+    return session.execute(
+        select(Card.mastery_level, Card.next_review_date).order_by(Card.id)
+    ).all()
+
+
+def test_reset_cards_resets_only_the_selected_cards(test_db_session: Session):
+    # Arrange
+    today = datetime.now(timezone.utc).date()
+    later = today + timedelta(days=9)
+    ids = _add_cards(test_db_session, (5, later), (7, later), (3, later))
+
+    # Act
+    reset = bulk_schedule.reset_cards(test_db_session, ids[:2])
+
+    # Assert
+    assert reset == 2
+    assert _state(test_db_session) == [(0, today), (0, today), (3, later)]
+
+
+def test_shift_due_dates_moves_every_card(test_db_session: Session):
+    # Arrange
+    _add_cards(test_db_session, (1, date(2026, 2, 27)), (2, date(2026, 12, 30)))
+
+    # Act
+    shifted = bulk_schedule.shift_due_dates(test_db_session, 3)
+
+    # Assert
+    assert shifted == 2
+    assert _state(test_db_session) == [(1, date(2026, 3, 2)), (2, date(2027, 1, 2))]
+
+
+def test_shift_due_dates_can_bring_cards_forward(test_db_session: Session):
+    # Arrange
+    ids = _add_cards(test_db_session, (1, date(2026, 3, 2)))
+
+    # Act
+    bulk_schedule.shift_due_dates(test_db_session, -2, ids)
+
+    # Assert
+    assert _state(test_db_session) == [(1, date(2026, 2, 28))]
+
+
+def test_replay_reviews_applies_repeated_reviews_in_order(test_db_session: Session):
+    """
+    GIVEN: Two cards and a review log where the first card is reviewed three times.
+    WHEN: The log is replayed.
+    THEN: Each card ends in the state the SRS engine reaches after its reviews, in log order.
+    """
+    # GIVEN
+    ids = _add_cards(test_db_session, (2, date(2026, 1, 1)), (0, date(2026, 1, 1)))
+    day = date(2026, 1, 5)
+    log = [
+        (ids[0], True, day),
+        (ids[1], False, day),
+        (ids[0], True, day + timedelta(days=3)),
+        (ids[0], False, day + timedelta(days=7)),
+    ]
+
+    # WHEN
+    updated = bulk_schedule.replay_reviews(
+        test_db_session,
+        [entry[0] for entry in log],
+        [entry[1] for entry in log],
+        [entry[2] for entry in log],
+    )
+
+    # THEN
+    assert updated == 2
+    # 2 -> 3 -> 4 -> 3, due 3 days after the last review; 0 stays 0.
+    assert _state(test_db_session) == [(3, date(2026, 1, 15)), (0, day)]
+
+
+def test_replay_reviews_rejects_misaligned_input(test_db_session: Session):
+    with pytest.raises(ValueError):
+        bulk_schedule.replay_reviews(test_db_session, [1, 2], [True])
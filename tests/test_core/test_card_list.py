@@ -0,0 +1,101 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from flash_zap.core.card_list import CardListPager
+from flash_zap.models.base import Base
+from flash_zap.models.card import Card
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # A file database, so the prefetching thread sees the same cards.
+    engine = create_engine(f"sqlite:///{tmp_path / 'cards.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        session.add_all([Card(front=f"Q{i}", back=f"A{i}") for i in range(7)])
+        session.commit()
+    yield factory
+    engine.dispose()
+
+
+def _fronts(page):
+    return [item.front for item in page.items]
+
+
+def test_pager_scrolls_forward_and_back(session_factory):
+    # Arrange
+    pager = CardListPager(session_factory, page_size=3)
+
+    # Act / Assert
+    assert _fronts(pager.page) == ["Q0", "Q1", "Q2"]
+    assert _fronts(pager.next_page()) == ["Q3", "Q4", "Q5"]
+    assert _fronts(pager.next_page()) == ["Q6"]
+    assert _fronts(pager.next_page()) == ["Q6"]
+    assert _fronts(pager.previous_page()) == ["Q3", "Q4", "Q5"]
+    assert _fronts(pager.previous_page()) == ["Q0", "Q1", "Q2"]
+    pager.close()
+
+
+def test_pager_serves_the_next_page_from_the_prefetch(session_factory):
+    # Arrange
+    pager = CardListPager(session_factory, page_size=3)
+    key, future = pager._prefetch
+    prefetched = future.result()
+
+    # Act
+    page = pager.next_page()
+
+    # Assert
+    assert key == (pager.page.first_id - 1, None)
+    assert page is prefetched
+    assert pager._prefetch is not None
+    pager.close()
+
+
+def test_pager_reload_shows_edits(session_factory):
+    # Arrange
+    pager = CardListPager(session_factory, page_size=3)
+    with session_factory() as session:
+        session.get(Card, pager.page.first_id).front = "Edited"
+        session.commit()
+
+    # Act
+    page = pager.reload()
+
+    # Assert
+    assert _fronts(page) == ["Edited", "Q1", "Q2"]
+    pager.close()
+
+
+def test_pager_reload_keeps_a_partly_filled_last_page(session_factory):
+    # Arrange
+    pager = CardListPager(session_factory, page_size=3)
+    pager.next_page()
+    pager.next_page()
+
+    # Act
+    page = pager.reload()
+
+    # Assert
+    assert _fronts(page) == ["Q6"]
+    assert (page.has_next, page.has_previous) == (False, True)
+    assert _fronts(pager.next_page()) == ["Q6"]
+    pager.close()
+
+
+def test_pager_knows_the_first_page_after_scrolling_back(session_factory):
+    # Arrange
+    pager = CardListPager(session_factory, page_size=3)
+    pager.next_page()
+    pager.next_page()
+
+    # Act
+    page = pager.previous_page()
+
+    # Assert
+    assert _fronts(page) == ["Q3", "Q4", "Q5"]
+    assert (page.has_next, page.has_previous) == (True, True)
+    assert pager.reload().has_previous is True
+    pager.close()
@@ -12,13 +12,11 @@ def test_get_card_by_id_returns_card_when_found():
     expected_card = Card(front="Front", back="Back")
     expected_card.id = 1
 
-    # Mock the query chain
-    mock_session.query.return_value.filter_by.return_value.first.return_value = expected_card
+    mock_session.get.return_value = expected_card
 
     card = get_card_by_id(mock_session, 1)
 
-    mock_session.query.assert_called_once_with(Card)
-    mock_session.query.return_value.filter_by.assert_called_once_with(id=1)
+    mock_session.get.assert_called_once_with(Card, 1)
     assert card == expected_card
 
 def test_get_card_by_id_returns_none_when_not_found():
@@ -27,13 +25,11 @@ def test_get_card_by_id_returns_none_when_not_found():
     """
     mock_session = Mock()
 
-    # Mock the query chain to return None
-    mock_session.query.return_value.filter_by.return_value.first.return_value = None
+    mock_session.get.return_value = None
 
     card = get_card_by_id(mock_session, 999)
 
-    mock_session.query.assert_called_once_with(Card)
-    mock_session.query.return_value.filter_by.assert_called_once_with(id=999)
+    mock_session.get.assert_called_once_with(Card, 999)
     assert card is None
 
 def test_update_card_front(test_db_session):
@@ -116,4 +112,262 @@ def test_update_card_mastery_level_fail_on_increase(test_db_session):
     # Assert
     assert success is False
     assert updated_card.mastery_level == 3
-    assert card.mastery_level == 3 
\ No newline at end of file
+    assert card.mastery_level == 3 
+
+def _add_search_cards(session):
+    cards = [
+        Card(front="Stolica Francji?", back="Paryż"),
+        Card(front="Capital of France?", back="Paris"),
+        Card(front="Paris, Texas", back="A film by Wim Wenders"),
+        Card(front="Bitwa pod Grunwaldem", back="1410"),
+    ]
+    session.add_all(cards)
+    session.commit()
+    return cards
+
+
+def test_search_cards_matches_prefixes_of_every_word_ignoring_accents(test_db_session):
+    # Arrange
+    from flash_zap.core.card_manager import search_cards
+    cards = _add_search_cards(test_db_session)
+
+    # Act
+    accented = search_cards(test_db_session, "PARYŻ")
+    unaccented = search_cards(test_db_session, "paryz")
+    prefix = search_cards(test_db_session, "capit fran")
+    no_match = search_cards(test_db_session, "capital texas")
+
+    # Assert
+    assert [card.id for card in accented.cards] == [card.id for card in unaccented.cards] == [cards[0].id]
+    assert [card.id for card in prefix.cards] == [cards[1].id]
+    assert no_match.cards == []
+
+
+def test_search_cards_pages_through_results(test_db_session):
+    # Arrange
+    from flash_zap.core.card_manager import search_cards
+    _add_search_cards(test_db_session)
+
+    # Act
+    first = search_cards(test_db_session, "paris", page=1, page_size=1)
+    second = search_cards(test_db_session, "paris", page=2, page_size=1)
+
+    # Assert
+    assert (len(first.cards), first.has_next) == (1, True)
+    assert (len(second.cards), second.has_next) == (1, False)
+    assert first.cards[0].id != second.cards[0].id
+
+
+def test_search_index_follows_edits_and_deletes(test_db_session):
+    # Arrange
+    from flash_zap.core.card_manager import search_cards, update_card_front
+    cards = _add_search_cards(test_db_session)
+
+    # Act
+    update_card_front(test_db_session, cards[3].id, "Battle of Grunwald")
+    test_db_session.delete(cards[1])
+    test_db_session.commit()
+
+    # Assert
+    assert [card.id for card in search_cards(test_db_session, "battle").cards] == [cards[3].id]
+    assert search_cards(test_db_session, "bitwa").cards == []
+    assert cards[1].id not in [card.id for card in search_cards(test_db_session, "paris").cards]
+
+
+def test_search_cards_ignores_queries_without_words(test_db_session):
+    from flash_zap.core.card_manager import search_cards
+
+    assert search_cards(test_db_session, ' "*" ').cards == []
+
+
+def test_list_cards_page_walks_the_list_by_keyset(test_db_session):
+    # Arrange
+    from flash_zap.core.card_manager import list_cards_page
+    test_db_session.add_all([Card(front=f"Q{i}", back=f"A{i}") for i in range(5)])
+    test_db_session.commit()
+
+    # Act
+    first = list_cards_page(test_db_session, limit=2)
+    second = list_cards_page(test_db_session, after_id=first.last_id, limit=2)
+    last = list_cards_page(test_db_session, after_id=second.last_id, limit=2)
+    back = list_cards_page(test_db_session, before_id=last.first_id, limit=2)
+
+    # Assert
+    assert [item.front for item in first.items] == ["Q0", "Q1"]
+    assert (first.has_previous, first.has_next) == (False, True)
+    assert [item.front for item in last.items] == ["Q4"]
+    assert (last.has_previous, last.has_next) == (True, False)
+    assert back == second
+
+
+def test_list_cards_page_going_back_to_the_start_returns_a_full_first_page(test_db_session):
+    # Arrange
+    from flash_zap.core.card_manager import list_cards_page
+    test_db_session.add_all([Card(front=f"Q{i}", back=f"A{i}") for i in range(5)])
+    test_db_session.commit()
+    ids = [item.id for item in list_cards_page(test_db_session, limit=5).items]
+
+    # Act
+    page = list_cards_page(test_db_session, before_id=ids[1], limit=3)
+
+    # Assert
+    assert [item.id for item in page.items] == ids[:3]
+    assert page.has_previous is False
+
+
+def _add_bulk_cards(session):
+    cards = [Card(front=f"Q{i} colour", back=f"A{i} colour", mastery_level=i) for i in range(4)]
+    session.add_all(cards)
+    session.commit()
+    return cards
+
+
+def test_bulk_lower_mastery_never_raises_a_level(test_db_session):
+    # Arrange
+    from flash_zap.core.card_manager import bulk_lower_mastery
+    cards = _add_bulk_cards(test_db_session)
+
+    # Act
+    changed = bulk_lower_mastery(test_db_session, [card.id for card in cards[:3]], 1)
+    test_db_session.expire_all()
+
+    # Assert
+    assert changed == 1
+    assert [card.mastery_level for card in cards] == [0, 1, 1, 3]
+
+
+def test_bulk_find_replace_edits_both_sides_and_drops_stale_grades(test_db_session):
+    # Arrange
+    from flash_zap.core.card_manager import bulk_find_replace, search_cards
+    from flash_zap.models.grade_cache_entry import GradeCacheEntry
+    cards = _add_bulk_cards(test_db_session)
+    cards.append(Card(front="Unrelated", back="Unrelated"))
+    test_db_session.add(cards[-1])
+    test_db_session.flush()
+    for card in (cards[0], cards[-1]):
+        test_db_session.add(GradeCacheEntry(
+            card_id=card.id, back_hash="b", answer_hash="a", prompt_version="v", result="Correct", feedback="",
+        ))
+    test_db_session.commit()
+
+    # Act
+    result = bulk_find_replace(test_db_session, None, "colour", "color")
+    test_db_session.expire_all()
+
+    # Assert
+    assert (result.changed, result.too_long) == (4, 0)
+    assert (cards[0].front, cards[0].back) == ("Q0 color", "A0 color")
+    assert [entry.card_id for entry in test_db_session.query(GradeCacheEntry)] == [cards[-1].id]
+    assert len(search_cards(test_db_session, "color").cards) == 4
+
+
+def test_bulk_find_replace_skips_cards_whose_text_would_be_too_long(test_db_session):
+    # Arrange
+    from flash_zap.core.card_manager import bulk_find_replace
+    from flash_zap.models.grade_cache_entry import GradeCacheEntry
+    short, long = Card(front="Q x", back="A x"), Card(front="Q " + "x" * 190, back="A x")
+    test_db_session.add_all([short, long])
+    test_db_session.flush()
+    test_db_session.add(GradeCacheEntry(
+        card_id=long.id, back_hash="b", answer_hash="a", prompt_version="v", result="Correct", feedback="",
+    ))
+    test_db_session.commit()
+
+    # Act
+    result = bulk_find_replace(test_db_session, [short.id, long.id], "x", "xx")
+    test_db_session.expire_all()
+
+    # Assert
+    assert (result.changed, result.too_long) == (1, 1)
+    assert (short.front, short.back) == ("Q xx", "A xx")
+    assert (long.front, long.back) == ("Q " + "x" * 190, "A x")
+    assert test_db_session.query(GradeCacheEntry).count() == 1
+
+
+def test_bulk_find_replace_updates_the_content_hash_used_by_imports(test_db_session):
+    # Arrange
+    from flash_zap.core.card_manager import bulk_find_replace
+    from flash_zap.services.import_service import _save_cards_deduplicated
+    _save_cards_deduplicated(
+        [{"front": "Q colour", "back": "A colour"}, {"front": "Q color", "back": "A color"}], test_db_session
+    )
+
+    # Act
+    result = bulk_find_replace(test_db_session, None, "colour", "color")
+    reimport = _save_cards_deduplicated(
+        [{"front": "Q colour", "back": "A colour"}, {"front": "Q color", "back": "A color"}], test_db_session
+    )
+
+    # Assert
+    assert result.changed == 1
+    assert (reimport.inserted, reimport.skipped) == (1, 1)
+    assert test_db_session.query(Card).count() == 3
+
+
+def test_bulk_delete_cards_removes_cards_and_their_history(test_db_session):
+    # Arrange
+    from datetime import datetime, timezone
+    from flash_zap.core.card_manager import bulk_delete_cards
+    from flash_zap.models.review import Review
+    cards = _add_bulk_cards(test_db_session)
+    test_db_session.add(Review(
+        card_id=cards[0].id, reviewed_at=datetime.now(timezone.utc), answer="a", grade="Correct",
+        latency_ms=0, old_mastery_level=0, new_mastery_level=1,
+    ))
+    test_db_session.commit()
+
+    # Act
+    deleted = bulk_delete_cards(test_db_session, [cards[0].id, cards[1].id])
+
+    # Assert
+    assert deleted == 2
+    assert test_db_session.query(Card).count() == 2
+    assert test_db_session.query(Review).count() == 0
+
+
+def test_card_editor_saves_all_staged_edits_in_one_commit(test_db_session):
+    # Arrange
+    from sqlalchemy import event
+    from flash_zap.core.card_manager import CardEditor
+    card = Card(front="Old Front", back="Old Back", mastery_level=3)
+    test_db_session.add(card)
+    test_db_session.commit()
+    editor = CardEditor.for_id(test_db_session, card.id)
+    statements = []
+    event.listen(test_db_session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    # Act
+    editor.set_front("New Front")
+    editor.set_back("New Back")
+    raised = editor.lower_mastery(4)
+    lowered = editor.lower_mastery(1)
+    staged_front = card.front
+    saved = editor.save()
+
+    # Assert
+    assert (raised, lowered, saved) == (False, True, True)
+    assert staged_front == "Old Front"
+    assert sum(statement.startswith("UPDATE cards") for statement in statements) == 1
+    test_db_session.expire_all()
+    assert (card.front, card.back, card.mastery_level) == ("New Front", "New Back", 1)
+    assert editor.save() is False
+
+
+def test_card_editor_updates_the_content_hash_so_the_original_can_be_reimported(test_db_session):
+    # Arrange
+    from flash_zap.core.card_manager import CardEditor
+    from flash_zap.services.import_service import _save_cards_deduplicated
+    _save_cards_deduplicated([{"front": "Stolica Polski?", "back": "Krakow"}], test_db_session)
+    editor = CardEditor(test_db_session, test_db_session.query(Card).one())
+
+    # Act
+    editor.set_back("Warszawa")
+    editor.save()
+    reimport = _save_cards_deduplicated(
+        [{"front": "Stolica Polski?", "back": "Krakow"}, {"front": "Stolica Polski?", "back": "Warszawa"}],
+        test_db_session,
+    )
+
+    # Assert
+    assert (reimport.inserted, reimport.skipped) == (1, 1)
+    assert sorted(card.back for card in test_db_session.query(Card)) == ["Krakow", "Warszawa"]
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from flash_zap.core import decks
+from flash_zap.models.card import Card
+from flash_zap.models.card_tag import CardTag
+
+
+def _add_cards(session, count=3):
+    cards = [Card(front=f"Q{i}", back=f"A{i}") for i in range(count)]
+    session.add_all(cards)
+    session.commit()
+    return cards
+
+
+def test_get_or_create_deck_reuses_a_deck_with_the_same_name(test_db_session):
+    first = decks.get_or_create_deck(test_db_session, "Spanish ")
+    second = decks.get_or_create_deck(test_db_session, "Spanish")
+
+    assert first.id == second.id
+    with pytest.raises(ValueError):
+        decks.get_or_create_deck(test_db_session, "  ")
+
+
+def test_list_decks_counts_cards_and_due_cards(test_db_session):
+    # Arrange
+    cards = _add_cards(test_db_session)
+    cards[2].next_review_date = datetime.now(timezone.utc).date() + timedelta(days=5)
+    spanish = decks.get_or_create_deck(test_db_session, "Spanish")
+    decks.get_or_create_deck(test_db_session, "Empty")
+
+    # Act
+    moved = decks.move_cards_to_deck(test_db_session, [card.id for card in cards], spanish.id)
+    summaries = decks.list_decks(test_db_session)
+
+    # Assert
+    assert moved == 3
+    assert [(s.name, s.cards, s.due) for s in summaries] == [("Empty", 0, 0), ("Spanish", 3, 2)]
+
+
+def test_tag_cards_skips_existing_tags_and_untag_cards_removes_them(test_db_session):
+    # Arrange
+    cards = _add_cards(test_db_session)
+    ids = [card.id for card in cards]
+
+    # Act
+    first = decks.tag_cards(test_db_session, ids[:2], ["#Verbs", "week1", "verbs"])
+    second = decks.tag_cards(test_db_session, ids, ["verbs"])
+    removed = decks.untag_cards(test_db_session, ids, ["week1"])
+
+    # Assert
+    assert (first, second, removed) == (4, 1, 2)
+    assert decks.list_tags(test_db_session) == [("verbs", 3)]
+    assert test_db_session.query(CardTag).count() == 3
+
+
+def test_deck_names_and_tags_longer_than_their_columns_are_rejected(test_db_session):
+    cards = _add_cards(test_db_session, count=1)
+
+    with pytest.raises(ValueError):
+        decks.get_or_create_deck(test_db_session, "d" * (decks.MAX_DECK_NAME_LENGTH + 1))
+    with pytest.raises(ValueError):
+        decks.tag_cards(test_db_session, [cards[0].id], ["ok", "t" * (decks.MAX_TAG_LENGTH + 1)])
+    assert decks.list_decks(test_db_session) == []
+    assert decks.list_tags(test_db_session) == []
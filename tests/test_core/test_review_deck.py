@@ -0,0 +1,241 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from flash_zap.core.review_deck import DueCardDeck
+from flash_zap.core.review_session import due_cards_filter
+from flash_zap.models.card import Card
+
+
+def _seed_cards(session: Session, count: int, days_offset: int = 0):
+    review_date = datetime.now(timezone.utc).date() + timedelta(days=days_offset)
+    cards = [Card(front=f"Q{i}", back=f"A{i}", next_review_date=review_date) for i in range(count)]
+    session.add_all(cards)
+    session.commit()
+    return cards
+
+
+def _due_deck(session: Session, batch_size: int) -> DueCardDeck:
+    today = datetime.now(timezone.utc).date()
+    return DueCardDeck(session, due_cards_filter(today), batch_size=batch_size)
+
+
+def test_deck_streams_all_due_cards_in_batches(test_db_session: Session):
+    """
+    Tests that the deck yields every due card exactly once across several batches.
+    """
+    # Arrange
+    due_cards = _seed_cards(test_db_session, 7)
+    _seed_cards(test_db_session, 3, days_offset=5)
+    deck = _due_deck(test_db_session, batch_size=3)
+
+    # Act
+    seen_ids = []
+    while deck.peek() is not None:
+        seen_ids.append(deck.pop_front().id)
+
+    # Assert
+    assert seen_ids == [card.id for card in due_cards]
+    assert len(deck) == 0
+
+
+def test_deck_keeps_only_one_batch_in_memory(test_db_session: Session):
+    """
+    Tests that the deck only materializes a bounded window of cards.
+    """
+    # Arrange
+    _seed_cards(test_db_session, 10)
+    deck = _due_deck(test_db_session, batch_size=4)
+
+    # Act
+    deck.peek()
+
+    # Assert
+    assert len(deck._window) == 4
+    assert len(deck) == 10
+
+
+def test_deck_count_tracks_local_changes(test_db_session: Session):
+    """
+    Tests that the remaining count starts from a COUNT query and is adjusted locally.
+    """
+    # Arrange
+    _seed_cards(test_db_session, 3)
+    deck = _due_deck(test_db_session, batch_size=2)
+
+    # Act / Assert
+    assert len(deck) == 3
+    card = deck.pop_front()
+    assert len(deck) == 2
+    deck.push_back(card)
+    assert len(deck) == 3
+
+
+def test_requeued_cards_come_back_after_all_other_cards(test_db_session: Session):
+    """
+    Tests that a requeued card is reviewed again only after the rest of the deck.
+    """
+    # Arrange
+    cards = _seed_cards(test_db_session, 5)
+    deck = _due_deck(test_db_session, batch_size=2)
+
+    # Act
+    requeued = deck.pop_front()
+    deck.push_back(requeued)
+    order = []
+    while deck.peek() is not None:
+        order.append(deck.pop_front().id)
+
+    # Assert
+    assert requeued.id == cards[0].id
+    assert order == [card.id for card in cards[1:]] + [cards[0].id]
+
+
+def test_pop_front_on_empty_deck_raises(test_db_session: Session):
+    """
+    Tests that removing a card from an empty deck raises an IndexError.
+    """
+    # Arrange
+    deck = _due_deck(test_db_session, batch_size=2)
+
+    # Act / Assert
+    assert deck.peek() is None
+    with pytest.raises(IndexError):
+        deck.pop_front()
+
+
+def _deal_all(deck: DueCardDeck):
+    dealt = []
+    while deck.peek() is not None:
+        dealt.append(deck.pop_front())
+    return dealt
+
+
+def test_deck_deals_cards_in_the_chosen_order(test_db_session: Session):
+    """
+    Tests that the overdue and mastery orders are applied by the database across batches.
+    """
+    # Arrange
+    today = datetime.now(timezone.utc).date()
+    cards = [
+        Card(front="Q0", back="A0", mastery_level=2, next_review_date=today - timedelta(days=1)),
+        Card(front="Q1", back="A1", mastery_level=0, next_review_date=today),
+        Card(front="Q2", back="A2", mastery_level=1, next_review_date=today - timedelta(days=3)),
+        Card(front="Q3", back="A3", mastery_level=0, next_review_date=today - timedelta(days=2)),
+    ]
+    test_db_session.add_all(cards)
+    test_db_session.commit()
+
+    # Act
+    overdue = _deal_all(DueCardDeck(test_db_session, due_cards_filter(today), batch_size=3, order="overdue"))
+    mastery = _deal_all(DueCardDeck(test_db_session, due_cards_filter(today), batch_size=3, order="mastery"))
+
+    # Assert
+    assert [card.front for card in overdue] == ["Q2", "Q3", "Q0", "Q1"]
+    assert [card.front for card in mastery] == ["Q3", "Q1", "Q2", "Q0"]
+
+
+def test_random_order_depends_only_on_the_seed(test_db_session: Session):
+    """
+    Tests that the random order deals every card once, in the same order for the same seed.
+    """
+    # Arrange
+    cards = _seed_cards(test_db_session, 20)
+    today = datetime.now(timezone.utc).date()
+
+    def deal(seed):
+        deck = DueCardDeck(test_db_session, due_cards_filter(today), batch_size=6, order="random", seed=seed)
+        return [card.id for card in _deal_all(deck)]
+
+    def is_rotation(order, other):
+        return len(order) == len(other) and " ".join(map(str, order)) in " ".join(map(str, other + other))
+
+    # Act
+    first, again = deal(7), deal(7)
+    others = [deal(seed) for seed in (8, 5555555, 99999)]
+
+    # Assert
+    assert first == again
+    assert sorted(first) == [card.id for card in cards]
+    assert first != sorted(first)
+    for other in others:
+        assert not is_rotation(first, other)
+
+
+def test_random_order_is_drawn_once_per_session(test_db_session: Session):
+    """
+    Tests that the random order is sorted by one query and then dealt in batches loaded by id.
+    """
+    # Arrange
+    _seed_cards(test_db_session, 20)
+    today = datetime.now(timezone.utc).date()
+    statements = []
+    engine = test_db_session.get_bind()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        # Act
+        deck = DueCardDeck(test_db_session, due_cards_filter(today), batch_size=6, order="random", seed=3)
+        dealt = _deal_all(deck)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    # Assert
+    assert len(dealt) == 20
+    assert len([statement for statement in statements if "ORDER BY" in statement]) == 1
+
+
+def test_unknown_order_is_rejected(test_db_session: Session):
+    with pytest.raises(ValueError):
+        DueCardDeck(test_db_session, due_cards_filter(datetime.now(timezone.utc).date()), order="oldest")
+
+
+def test_limits_deal_reviews_first_and_load_no_card_beyond_them(test_db_session: Session):
+    """
+    Tests that review and new card limits are applied in SQL, reviews before new cards.
+    """
+    # Arrange
+    today = datetime.now(timezone.utc).date()
+    new_cards = _seed_cards(test_db_session, 4)
+    review_cards = _seed_cards(test_db_session, 4)
+    for card in review_cards:
+        card.last_review_date = today - timedelta(days=1)
+    test_db_session.commit()
+    deck = DueCardDeck(test_db_session, due_cards_filter(today), batch_size=10, new_limit=1, review_limit=2)
+
+    # Act
+    deck.peek()
+    window = len(deck._window)
+    dealt = _deal_all(deck)
+
+    # Assert
+    assert window == 2
+    assert [card.id for card in dealt] == [review_cards[0].id, review_cards[1].id, new_cards[0].id]
+
+
+def test_cards_rescheduled_during_the_session_are_not_dealt_twice(test_db_session: Session):
+    """
+    Tests that a requeued card whose committed due date sorts after the keyset position is only dealt from the requeue.
+    """
+    # Arrange
+    today = datetime.now(timezone.utc).date()
+    cards = [Card(front=f"Q{i}", back=f"A{i}", next_review_date=today - timedelta(days=2 - i)) for i in range(3)]
+    test_db_session.add_all(cards)
+    test_db_session.commit()
+    deck = DueCardDeck(test_db_session, due_cards_filter(today), batch_size=1, order="overdue")
+
+    # Act
+    first = deck.pop_front()
+    first.next_review_date = today
+    deck.push_back(first)
+    test_db_session.commit()
+    rest = _deal_all(deck)
+
+    # Assert
+    assert [card.id for card in rest] == [cards[1].id, cards[2].id, cards[0].id]
+    assert deck._requeued_ids == set()
@@ -1,10 +1,13 @@
 import pytest
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 from datetime import datetime, timedelta, timezone
 
 from flash_zap.models.card import Card
+from flash_zap.models.review import Review
 from flash_zap.core.review_session import ReviewSession
+from flash_zap.services.review_log import ReviewLogWriter
 
 
 def test_get_next_card_returns_unseen_card(test_db_session: Session):
@@ -18,7 +21,7 @@ def test_get_next_card_returns_unseen_card(test_db_session: Session):
     test_db_session.commit()
 
     # Act
-    session = ReviewSession(test_db_session, shuffle=False)
+    session = ReviewSession(test_db_session, order="id")
 
     # Assert: First call returns the first card
     next_card_1 = session.get_next_card()
@@ -47,7 +50,7 @@ def test_get_next_card_returns_none_when_all_cards_are_seen(test_db_session: Ses
     test_db_session.commit()
 
     # Act
-    session = ReviewSession(test_db_session, shuffle=False)
+    session = ReviewSession(test_db_session, order="id")
 
     # Assert: First call returns the card
     first_call = session.get_next_card()
@@ -76,7 +79,7 @@ def test_get_next_card_returns_only_due_cards(test_db_session: Session):
     test_db_session.commit()
 
     # Act
-    session = ReviewSession(test_db_session, shuffle=False)
+    session = ReviewSession(test_db_session, order="id")
 
     # Assert: First call should return the due card
     next_card_1 = session.get_next_card()
@@ -144,6 +147,7 @@ def test_grade_and_update_card_persists_changes(mock_grade_answer, test_db_sessi
 
     # Act
     session.grade_and_update_card(card, user_answer)
+    session.close()
 
     # Assert
     # Verify the AI grader was called
@@ -167,10 +171,11 @@ def test_grade_and_update_card_calls_srs_engine(
     mock_grade_answer.return_value = (grade, "Feedback")
     mock_srs_engine_instance = mock_srs_engine_cls.return_value
     
-    session = ReviewSession(test_db_session)
     card = Card(front="Q", back="A")
+    test_db_session.add(card)
+    test_db_session.commit()
+    session = ReviewSession(test_db_session)
     user_answer = "A"
-    session._review_deck = [card] # Manually set the deck
 
     # Act
     session.grade_and_update_card(card, user_answer)
@@ -183,4 +188,333 @@ def test_grade_and_update_card_calls_srs_engine(
     # Verify the other method was not called
     unexpected_call = "demote_card" if expected_call == "promote_card" else "promote_card"
     unexpected_method = getattr(mock_srs_engine_instance, unexpected_call)
-    unexpected_method.assert_not_called() 
\ No newline at end of file
+    unexpected_method.assert_not_called() 
+
+def test_due_cards_query_uses_next_review_date_index(test_db_session: Session):
+    """
+    Tests that the due-card lookup is answered by an index search rather than a table scan.
+    """
+    # Arrange
+    from sqlalchemy import select, text
+    from flash_zap.core.review_session import due_cards_filter
+
+    query = select(Card.id).where(due_cards_filter(datetime.now(timezone.utc).date()))
+    compiled = query.compile(test_db_session.get_bind(), compile_kwargs={"literal_binds": True})
+
+    # Act
+    plan = test_db_session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).fetchall()
+
+    # Assert
+    details = " ".join(row[-1] for row in plan)
+    assert "SEARCH" in details
+    assert "ix_cards_next_review_date_id" in details
+
+
+
+def test_review_session_can_be_scoped_to_a_deck_and_tags(test_db_session: Session):
+    """
+    Tests that a session limited to a deck and/or tags only deals out the matching due cards.
+    """
+    # Arrange
+    from flash_zap.core.decks import get_or_create_deck, move_cards_to_deck, tag_cards
+    cards = [Card(front=f"Question {i}", back=f"Answer {i}") for i in range(4)]
+    test_db_session.add_all(cards)
+    test_db_session.commit()
+    deck = get_or_create_deck(test_db_session, "Polish")
+    move_cards_to_deck(test_db_session, [cards[0].id, cards[1].id], deck.id)
+    tag_cards(test_db_session, [cards[1].id, cards[2].id], ["verbs"])
+
+    def dealt(**scope):
+        session = ReviewSession(test_db_session, order="id", **scope)
+        return [card.id for card in session._review_deck._fetch_batch()]
+
+    # Act / Assert
+    assert dealt(deck_id=deck.id) == [cards[0].id, cards[1].id]
+    assert dealt(tags=["verbs"]) == [cards[1].id, cards[2].id]
+    assert dealt(deck_id=deck.id, tags=["verbs"]) == [cards[1].id]
+    assert len(ReviewSession(test_db_session, deck_id=deck.id, tags=["verbs"])._review_deck) == 1
+
+
+
+def test_daily_limits_subtract_what_was_studied_today(test_db_session: Session, monkeypatch):
+    """
+    Tests that a session only deals what is left of today's new card and review caps.
+    """
+    # Arrange
+    from flash_zap import config
+    today = datetime.now(timezone.utc).date()
+    new_cards = [Card(front=f"New {i}", back="A") for i in range(5)]
+    old_cards = [Card(front=f"Old {i}", back="A") for i in range(5)]
+    test_db_session.add_all(new_cards + old_cards)
+    test_db_session.flush()
+    for card in old_cards:
+        card.last_review_date = today - timedelta(days=1)
+    studied = Card(front="Studied", back="A", mastery_level=1, next_review_date=today + timedelta(days=1))
+    studied.last_review_date = today
+    test_db_session.add(studied)
+    test_db_session.commit()
+    monkeypatch.setattr(config.settings, "NEW_CARDS_PER_DAY", 2)
+    monkeypatch.setattr(config.settings, "REVIEWS_PER_DAY", 4)
+
+    # Act
+    session = ReviewSession(test_db_session, order="id")
+
+    # Assert: the studied card has no logged review, so it counts against the review cap.
+    assert session.remaining_cards_count == 3 + 2
+
+def test_deck_due_query_uses_the_deck_index(test_db_session: Session):
+    """
+    Tests that the due-card lookup for one deck is an index search on its deck.
+    """
+    # Arrange
+    from sqlalchemy import text
+    from flash_zap.core.review_session import due_cards_filter
+
+    query = select(Card.id).where(due_cards_filter(datetime.now(timezone.utc).date(), deck_id=1))
+    compiled = query.compile(test_db_session.get_bind(), compile_kwargs={"literal_binds": True})
+
+    # Act
+    plan = test_db_session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).fetchall()
+
+    # Assert
+    details = " ".join(row[-1] for row in plan)
+    assert "SEARCH" in details
+    assert "ix_cards_deck_id_next_review_date" in details
+
+def test_background_grades_arriving_out_of_order_are_applied_to_the_right_cards(test_db_session: Session):
+    """
+    Tests that grades completing in any order update the card they were submitted for,
+    including re-queueing a card demoted to mastery level 0.
+    """
+    # Arrange
+    import threading
+
+    card1 = Card(front="Q1", back="A1", mastery_level=1)
+    card2 = Card(front="Q2", back="A2", mastery_level=2)
+    test_db_session.add_all([card1, card2])
+    test_db_session.commit()
+    release_first = threading.Event()
+
+    def fake_grade(question, user_answer, correct_answer):
+        if question == "Q1":
+            release_first.wait(timeout=5)
+            return "Incorrect", "Wrong"
+        return "Correct", "Right"
+
+    session = ReviewSession(test_db_session, order="id")
+
+    with patch("flash_zap.core.review_session.ai_grader.grade_answer", side_effect=fake_grade):
+        # Act: answer both cards without waiting for the grades
+        session.submit_answer(session.get_next_card(), "wrong")
+        session.submit_answer(session.get_next_card(), "A2")
+        assert session.get_next_card() is None
+        first_results = session.collect_graded_answers(wait=True)
+        release_first.set()
+        later_results = session.wait_for_pending_grades()
+    session.close()
+
+    # Assert
+    assert [result.card.id for result in first_results] == [card2.id]
+    assert [result.card.id for result in later_results] == [card1.id]
+    test_db_session.refresh(card1)
+    test_db_session.refresh(card2)
+    assert card2.mastery_level == 3
+    assert card1.mastery_level == 0
+    assert later_results[0].old_mastery_level == 1
+    # The demoted card is back in the deck for another attempt
+    assert session.get_next_card().id == card1.id
+    assert session.remaining_cards_count == 1
+
+
+def test_background_grading_error_puts_card_back_in_deck(test_db_session: Session):
+    """
+    Tests that a card whose background grading failed is reviewed again later.
+    """
+    # Arrange
+    from flash_zap.core.exceptions import AIGraderError
+
+    card = Card(front="Q", back="A", mastery_level=2)
+    test_db_session.add(card)
+    test_db_session.commit()
+    session = ReviewSession(test_db_session)
+
+    with patch("flash_zap.core.review_session.ai_grader.grade_answer", side_effect=AIGraderError("down")):
+        # Act
+        session.submit_answer(session.get_next_card(), "A")
+        results = session.wait_for_pending_grades()
+    session.close()
+
+    # Assert
+    assert isinstance(results[0].error, AIGraderError)
+    assert card.mastery_level == 2
+    assert session.get_next_card() is card
+
+
+def test_review_session_uses_injected_grader(test_db_session: Session):
+    """
+    Tests that ReviewSession grades through an injected grader when one is given.
+    """
+    # Arrange
+    grader = Mock()
+    grader.grade_answer.return_value = ("Incorrect", "Nope")
+    card = Card(front="Question", back="Answer")
+    session = ReviewSession(test_db_session, grader=grader)
+
+    # Act
+    result, feedback = session.process_answer(card, "Wrong")
+
+    # Assert
+    grader.grade_answer.assert_called_once_with("Question", "Wrong", "Answer")
+    assert (result, feedback) == ("Incorrect", "Nope")
+
+
+@patch("flash_zap.core.review_session.ai_grader.grade_answer")
+def test_pre_grader_hit_skips_ai_grader(mock_grade_answer, test_db_session: Session):
+    """
+    Tests that an answer recognized by the local pre-grader never reaches the AI grader,
+    and that unrecognized answers still do.
+    """
+    # Arrange
+    from flash_zap.services.local_grader import LocalGrader
+
+    mock_grade_answer.return_value = ("Incorrect", "AI feedback")
+    card = Card(front="Capital of Poland?", back="Warszawa")
+    session = ReviewSession(test_db_session, pre_grader=LocalGrader())
+
+    # Act
+    local_result = session.process_answer(card, "warszawa")
+    ai_result = session.process_answer(card, "Kraków")
+
+    # Assert
+    assert local_result[0] == "Correct"
+    assert ai_result == ("Incorrect", "AI feedback")
+    mock_grade_answer.assert_called_once()
+
+
+@patch("flash_zap.core.review_session.ai_grader.grade_answer")
+def test_grade_cache_hit_skips_ai_grader(mock_grade_answer, test_db_session: Session):
+    """
+    Tests that a repeated answer to the same card is served from the grade cache.
+    """
+    # Arrange
+    from flash_zap.services.grade_cache import GradeCache
+
+    mock_grade_answer.return_value = ("Incorrect", "AI feedback")
+    card = Card(front="Question", back="Answer")
+    test_db_session.add(card)
+    test_db_session.commit()
+    cache = GradeCache(test_db_session)
+    session = ReviewSession(test_db_session, grade_cache=cache)
+
+    # Act
+    first = session.process_answer(card, "Wrong")
+    second = session.process_answer(card, "wrong")
+
+    # Assert
+    assert first == second == ("Incorrect", "AI feedback")
+    mock_grade_answer.assert_called_once()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@patch("flash_zap.core.review_session.ai_grader.grade_answer")
+def test_review_progress_is_committed_in_batches(mock_grade_answer, test_db_session: Session):
+    """
+    Tests that SRS changes are written behind: nothing is committed until
+    `commit_every` cards are graded, then all of them are committed together.
+    """
+    # Arrange
+    mock_grade_answer.return_value = ("Correct", "Feedback")
+    for i in range(5):
+        test_db_session.add(Card(front=f"Q{i}", back=f"A{i}", mastery_level=1))
+    test_db_session.commit()
+    session = ReviewSession(test_db_session, order="id", commit_every=3, commit_interval=3600)
+
+    with patch.object(test_db_session, "commit", wraps=test_db_session.commit) as commit:
+        # Act / Assert
+        for _ in range(2):
+            session.grade_and_update_card(session.get_next_card(), "A")
+        assert commit.call_count == 0
+        assert session.uncommitted_count == 2
+
+        session.grade_and_update_card(session.get_next_card(), "A")
+        assert commit.call_count == 1
+        assert session.uncommitted_count == 0
+
+        session.grade_and_update_card(session.get_next_card(), "A")
+        session.close()
+        assert session.uncommitted_count == 0
+
+    test_db_session.expire_all()
+    levels = test_db_session.execute(select(Card.mastery_level).order_by(Card.id)).scalars().all()
+    assert levels == [2, 2, 2, 2, 1]
+
+
+@patch("flash_zap.core.review_session.ai_grader.grade_answer")
+def test_review_progress_is_committed_after_the_commit_interval(mock_grade_answer, test_db_session: Session):
+    # Arrange
+    mock_grade_answer.return_value = ("Correct", "Feedback")
+    test_db_session.add_all([Card(front="Q1", back="A1"), Card(front="Q2", back="A2")])
+    test_db_session.commit()
+    session = ReviewSession(test_db_session, order="id", commit_every=100, commit_interval=0)
+
+    # Act
+    session.grade_and_update_card(session.get_next_card(), "A")
+
+    # Assert
+    assert session.uncommitted_count == 0
+
+
+def test_close_commits_graded_cards_when_interrupted(test_db_session: Session):
+    """
+    Tests that review progress already applied is committed even if waiting
+    for outstanding grades is interrupted with Ctrl+C.
+    """
+    # Arrange
+    test_db_session.add_all([Card(front="Q1", back="A1"), Card(front="Q2", back="A2")])
+    test_db_session.commit()
+    grader = Mock()
+    grader.grade_answer.return_value = ("Correct", "Feedback")
+    session = ReviewSession(test_db_session, order="id", grader=grader, commit_every=100)
+    session.submit_answer(session.get_next_card(), "A1")
+    session.wait_for_pending_grades()
+    session.submit_answer(session.get_next_card(), "A2")
+
+    # Act
+    with patch.object(session, "wait_for_pending_grades", side_effect=KeyboardInterrupt):
+        with pytest.raises(KeyboardInterrupt):
+            session.close()
+
+    # Assert
+    test_db_session.rollback()
+    levels = test_db_session.execute(select(Card.mastery_level).order_by(Card.id)).scalars().all()
+    assert levels == [1, 0]
+
+
+@patch("flash_zap.core.review_session.ai_grader.grade_answer")
+def test_graded_answers_are_logged_with_the_review_progress(mock_grade_answer, test_db_session: Session):
+    """
+    Tests that every applied grade is appended to the review log, and that the
+    log is only written when review progress is committed.
+    """
+    # Arrange
+    mock_grade_answer.side_effect = [("Correct", "Good"), ("Incorrect", "Bad")]
+    test_db_session.add_all([Card(front="Q1", back="A1", mastery_level=2), Card(front="Q2", back="A2")])
+    test_db_session.commit()
+    review_log = ReviewLogWriter(test_db_session)
+    session = ReviewSession(test_db_session, order="id", review_log=review_log, commit_every=100)
+
+    # Act
+    first = session.get_next_card()
+    session.grade_and_update_card(first, "A1")
+    session.grade_and_update_card(session.get_next_card(), "wrong")
+    buffered = len(review_log)
+    session.close()
+
+    # Assert
+    assert buffered == 2
+    reviews = test_db_session.scalars(select(Review).order_by(Review.id)).all()
+    assert [(r.card_id, r.answer, r.grade, r.old_mastery_level, r.new_mastery_level) for r in reviews] == [
+        (first.id, "A1", "Correct", 2, 3),
+        (first.id + 1, "wrong", "Incorrect", 0, 0),
+    ]
+
@@ -18,4 +18,16 @@ def test_card_model_can_be_created():
 
     # THEN
     assert card.front == front
-    assert card.back == back 
\ No newline at end of file
+    assert card.back == back 
+
+def test_card_model_declares_due_date_index():
+    """
+    GIVEN: Card model.
+    WHEN: Its table indexes are inspected.
+    THEN: A composite index on (next_review_date, id) is declared.
+    """
+    # GIVEN / WHEN
+    indexes = {index.name: [column.name for column in index.columns] for index in Card.__table__.indexes}
+
+    # THEN
+    assert indexes["ix_cards_next_review_date_id"] == ["next_review_date", "id"]
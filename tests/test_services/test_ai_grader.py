@@ -1,9 +1,16 @@
 import pytest
 from unittest.mock import patch, MagicMock
 
-from flash_zap.services.ai_grader import grade_answer
+from flash_zap.services import ai_grader
+from flash_zap.services.ai_grader import AIGrader, grade_answer
 from flash_zap.core.exceptions import AIGraderError
 
+
+@pytest.fixture(autouse=True)
+def reset_default_grader(monkeypatch):
+    """Makes every test build a fresh process-wide grader from its own mocks."""
+    monkeypatch.setattr(ai_grader, "_default_grader", None)
+
 @patch('flash_zap.services.ai_grader.genai.GenerativeModel')
 def test_grade_answer_returns_correct_for_positive_ai_response(mock_generative_model):
     """
@@ -70,4 +77,177 @@ def test_grade_answer_raises_custom_exception_on_api_failure(mock_generative_mod
     with pytest.raises(AIGraderError, match="An error occurred while grading the answer: API is down"):
         grade_answer(question, user_answer, correct_answer)
 
-    mock_model_instance.generate_content.assert_called_once() 
\ No newline at end of file
+    mock_model_instance.generate_content.assert_called_once() 
+
+
+@patch('flash_zap.services.ai_grader.genai.GenerationConfig')
+@patch('flash_zap.services.ai_grader.genai.GenerativeModel')
+def test_ai_grader_builds_model_once_for_many_grades(mock_generative_model, mock_generation_config):
+    """
+    Tests that an AIGrader reuses one model and generation config across calls.
+    """
+    # Arrange
+    mock_model_instance = MagicMock()
+    mock_response = MagicMock()
+    mock_response.text = "Result: Correct\nFeedback: Great job!"
+    mock_model_instance.generate_content.return_value = mock_response
+    mock_generative_model.return_value = mock_model_instance
+    grader = AIGrader(model_name="test-model")
+
+    # Act
+    for _ in range(3):
+        grader.grade_answer("Question", "Answer", "Answer")
+
+    # Assert
+    mock_generative_model.assert_called_once_with(
+        "test-model", generation_config=mock_generation_config.return_value
+    )
+    mock_generation_config.assert_called_once_with(temperature=0.1)
+    assert mock_model_instance.generate_content.call_count == 3
+
+
+@patch('flash_zap.services.ai_grader.genai.GenerativeModel')
+def test_grade_answer_reuses_default_grader(mock_generative_model):
+    """
+    Tests that the module-level grade_answer shares one process-wide grader.
+    """
+    # Arrange
+    mock_response = MagicMock()
+    mock_response.text = "Result: Incorrect\nFeedback: No."
+    mock_generative_model.return_value.generate_content.return_value = mock_response
+
+    # Act
+    grade_answer("Q", "A", "B")
+    grade_answer("Q", "A", "B")
+
+    # Assert
+    mock_generative_model.assert_called_once()
+    assert ai_grader.get_default_grader() is ai_grader.get_default_grader()
+
+
+def _grader_with_replies(mock_generative_model, *replies):
+    mock_model_instance = MagicMock()
+    responses = []
+    for reply in replies:
+        response = MagicMock()
+        response.text = reply
+        responses.append(response)
+    mock_model_instance.generate_content.side_effect = responses
+    mock_generative_model.return_value = mock_model_instance
+    return AIGrader(), mock_model_instance
+
+
+@patch('flash_zap.services.ai_grader.genai.GenerativeModel')
+def test_grade_answers_grades_batch_in_one_request(mock_generative_model):
+    """
+    Tests that grade_answers parses a JSON array reply in any order into per-item results.
+    """
+    # Arrange
+    reply = (
+        '```json\n'
+        '[{"index": 1, "result": "Incorrect", "feedback": "To Lyon."},\n'
+        ' {"index": 0, "result": "Correct", "feedback": "Dobrze."}]\n'
+        '```'
+    )
+    grader, mock_model_instance = _grader_with_replies(mock_generative_model, reply)
+    items = [("Capital of France?", "Paris", "Paris"), ("Capital of Italy?", "Rome", "Lyon")]
+
+    # Act
+    results = grader.grade_answers(items)
+
+    # Assert
+    assert results == [("Correct", "Dobrze."), ("Incorrect", "To Lyon.")]
+    mock_model_instance.generate_content.assert_called_once()
+
+
+@patch('flash_zap.services.ai_grader.genai.GenerativeModel')
+def test_grade_answers_falls_back_to_single_grading_for_malformed_items(mock_generative_model):
+    """
+    Tests that items missing from, or malformed in, the batch reply are graded one by one.
+    """
+    # Arrange
+    batch_reply = '[{"index": 0, "result": "Correct", "feedback": "Ok"}, {"index": 1, "result": "Maybe"}]'
+    single_reply = "Result: Incorrect\nFeedback: Nie."
+    grader, mock_model_instance = _grader_with_replies(mock_generative_model, batch_reply, single_reply)
+
+    # Act
+    results = grader.grade_answers([("Q1", "A1", "A1"), ("Q2", "A2", "B2")])
+
+    # Assert
+    assert results == [("Correct", "Ok"), ("Incorrect", "Nie.")]
+    assert mock_model_instance.generate_content.call_count == 2
+    assert "Q2" in mock_model_instance.generate_content.call_args_list[1].args[0]
+
+
+@patch('flash_zap.services.ai_grader.genai.GenerativeModel')
+def test_grade_answers_falls_back_for_items_graded_twice_or_with_a_boolean_index(mock_generative_model):
+    # Arrange
+    batch_reply = (
+        '[{"index": 0, "result": "Correct", "feedback": "Ok"},'
+        ' {"index": 0, "result": "Incorrect", "feedback": "Nie"},'
+        ' {"index": true, "result": "Correct", "feedback": "Ok"}]'
+    )
+    grader, mock_model_instance = _grader_with_replies(
+        mock_generative_model,
+        batch_reply,
+        "Result: Incorrect\nFeedback: A",
+        "Result: Correct\nFeedback: B",
+    )
+
+    # Act
+    results = grader.grade_answers([("Q1", "A1", "B1"), ("Q2", "A2", "A2")])
+
+    # Assert
+    assert results == [("Incorrect", "A"), ("Correct", "B")]
+    assert mock_model_instance.generate_content.call_count == 3
+
+
+@patch('flash_zap.services.ai_grader.genai.GenerativeModel')
+def test_grade_answers_falls_back_for_every_item_when_reply_is_not_json(mock_generative_model):
+    # Arrange
+    grader, mock_model_instance = _grader_with_replies(
+        mock_generative_model,
+        "Sorry, I cannot do that.",
+        "Result: Correct\nFeedback: A",
+        "Result: Correct\nFeedback: B",
+    )
+
+    # Act
+    results = grader.grade_answers([("Q1", "A1", "A1"), ("Q2", "A2", "A2")])
+
+    # Assert
+    assert results == [("Correct", "A"), ("Correct", "B")]
+    assert mock_model_instance.generate_content.call_count == 3
+
+
+@patch('flash_zap.services.ai_grader.settings')
+@patch('flash_zap.services.ai_grader.genai.GenerativeModel')
+def test_grade_answers_splits_items_into_batches(mock_generative_model, mock_settings):
+    # Arrange
+    from flash_zap.config import settings as real_settings
+
+    mock_settings.AI_GRADER_BATCH_SIZE = 2
+    mock_settings.AI_GRADER_BATCH_PROMPT_TEMPLATE = real_settings.AI_GRADER_BATCH_PROMPT_TEMPLATE
+    mock_settings.AI_GRADER_PROMPT_TEMPLATE = real_settings.AI_GRADER_PROMPT_TEMPLATE
+    pair = '[{"index": 0, "result": "Correct", "feedback": "x"}, {"index": 1, "result": "Correct", "feedback": "y"}]'
+    grader, mock_model_instance = _grader_with_replies(
+        mock_generative_model, pair, "Result: Incorrect\nFeedback: z"
+    )
+
+    # Act
+    results = grader.grade_answers([("Q1", "A", "A"), ("Q2", "A", "A"), ("Q3", "A", "B")])
+
+    # Assert
+    assert results == [("Correct", "x"), ("Correct", "y"), ("Incorrect", "z")]
+    assert mock_model_instance.generate_content.call_count == 2
+
+
+@patch('flash_zap.services.ai_grader.genai.GenerativeModel')
+def test_grade_answers_raises_custom_exception_on_api_failure(mock_generative_model):
+    # Arrange
+    mock_generative_model.return_value.generate_content.side_effect = Exception("API is down")
+    grader = AIGrader()
+
+    # Act & Assert
+    with pytest.raises(AIGraderError, match="API is down"):
+        grader.grade_answers([("Q1", "A1", "A1"), ("Q2", "A2", "A2")])
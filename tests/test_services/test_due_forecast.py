@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from flash_zap.core import bulk_schedule
+from flash_zap.models.card import Card
+from flash_zap.services import due_forecast
+from flash_zap.services.srs_engine import SRSEngine
+
+
+@pytest.fixture(autouse=True)
+def clear_cached_forecast():
+    due_forecast.invalidate_due_forecast()
+    yield
+    due_forecast.invalidate_due_forecast()
+
+
+@pytest.fixture
+def today():
+    return datetime.now(timezone.utc).date()
+
+
+def _add_cards(session, *levels_and_offsets):
+    today = datetime.now(timezone.utc).date()
+    cards = [
+        Card(front=f"Q{i}", back=f"A{i}", mastery_level=level, next_review_date=today + timedelta(days=offset))
+        for i, (level, offset) in enumerate(levels_and_offsets)
+    ]
+    session.add_all(cards)
+    session.commit()
+    return cards
+
+
+def test_load_counts_cards_per_day_and_level(test_db_session, today):
+    # Arrange
+    _add_cards(test_db_session, (0, -3), (2, 0), (2, 0), (1, 1), (4, 2), (5, 30))
+
+    # Act
+    forecast = due_forecast.load_due_forecast(test_db_session, days=3)
+
+    # Assert
+    assert (forecast.due_today, forecast.due_tomorrow) == (3, 1)
+    assert forecast.per_day() == [(today, 3), (today + timedelta(days=1), 1), (today + timedelta(days=2), 1)]
+    assert forecast.per_level() == {0: 1, 2: 2}
+    assert forecast.per_level(today + timedelta(days=2)) == {0: 1, 1: 1, 2: 2, 4: 1}
+
+
+def test_cached_forecast_follows_cards_rescheduled_by_the_srs_engine(test_db_session, today):
+    # Arrange
+    card, _ = _add_cards(test_db_session, (0, 0), (3, 1))
+    forecast = due_forecast.get_due_forecast(test_db_session, days=7)
+
+    # Act
+    SRSEngine().promote_card(card)
+    test_db_session.commit()
+
+    # Assert
+    assert due_forecast.cached_due_forecast() is forecast
+    assert (forecast.due_today, forecast.due_tomorrow) == (0, 2)
+    assert forecast.per_level(today + timedelta(days=1)) == {1: 1, 3: 1}
+    assert forecast.counts == due_forecast.load_due_forecast(test_db_session, days=7).counts
+
+
+def test_cached_forecast_waits_for_the_commit_and_ignores_rolled_back_reviews(test_db_session):
+    # Arrange
+    first, second = _add_cards(test_db_session, (0, 0), (0, 0))
+    forecast = due_forecast.get_due_forecast(test_db_session, days=7)
+
+    # Act / Assert
+    SRSEngine().promote_card(first)
+    assert forecast.due_today == 2
+    test_db_session.rollback()
+    assert forecast.due_today == 2
+
+    SRSEngine().promote_card(second)
+    test_db_session.commit()
+    assert forecast.due_today == 1
+    assert forecast.counts == due_forecast.load_due_forecast(test_db_session, days=7).counts
+
+
+def test_get_returns_the_cached_forecast_without_querying(test_db_session):
+    # Arrange
+    _add_cards(test_db_session, (0, 0))
+    first = due_forecast.get_due_forecast(test_db_session)
+    test_db_session.close()
+
+    # Act
+    second = due_forecast.get_due_forecast(None)
+
+    # Assert
+    assert second is first
+
+
+def test_bulk_changes_invalidate_the_cached_forecast(test_db_session):
+    # Arrange
+    _add_cards(test_db_session, (2, 0))
+    due_forecast.get_due_forecast(test_db_session)
+
+    # Act
+    bulk_schedule.shift_due_dates(test_db_session, 1)
+
+    # Assert
+    assert due_forecast.cached_due_forecast() is None
+    assert due_forecast.get_due_forecast(test_db_session).due_tomorrow == 1
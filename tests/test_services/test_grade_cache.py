@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from flash_zap.models.card import Card
+from flash_zap.models.grade_cache_entry import GradeCacheEntry
+from flash_zap.services.grade_cache import GradeCache
+
+
+@pytest.fixture
+def card(test_db_session):
+    card = Card(front="Capital of France?", back="Paris")
+    test_db_session.add(card)
+    test_db_session.commit()
+    return card
+
+
+def test_cache_returns_stored_grade_for_normalized_answer(test_db_session, card):
+    # Arrange
+    cache = GradeCache(test_db_session)
+    cache.put(card.id, card.back, "It's Paris", "Correct", "Dobrze", latency_seconds=1.5)
+    test_db_session.commit()
+
+    # Act
+    result = cache.get(card.id, card.back, "  it's   PARIS ")
+
+    # Assert
+    assert result == ("Correct", "Dobrze")
+    assert cache.hits == 1
+    assert cache.misses == 0
+    assert cache.saved_seconds == pytest.approx(1.5)
+
+
+def test_cache_misses_when_card_back_changed(test_db_session, card):
+    # Arrange
+    cache = GradeCache(test_db_session)
+    cache.put(card.id, "Paris", "Paris", "Correct", "Dobrze")
+
+    # Act
+    result = cache.get(card.id, "Paryż", "Paris")
+
+    # Assert
+    assert result is None
+    assert cache.misses == 1
+
+
+def test_cache_ignores_expired_entries(test_db_session, card):
+    # Arrange
+    cache = GradeCache(test_db_session, ttl_days=1)
+    cache.put(card.id, card.back, "Paris", "Correct", "Dobrze")
+    entry = test_db_session.query(GradeCacheEntry).one()
+    entry.created_at = datetime.now(timezone.utc) - timedelta(days=2)
+    test_db_session.commit()
+
+    # Act / Assert
+    assert cache.get(card.id, card.back, "Paris") is None
+    assert cache.evict() == 1
+    assert test_db_session.query(GradeCacheEntry).count() == 0
+
+
+def test_evict_drops_least_recently_used_entries(test_db_session, card):
+    # Arrange
+    cache = GradeCache(test_db_session, max_entries=2)
+    for answer in ["a", "b", "c"]:
+        cache.put(card.id, card.back, answer, "Incorrect", "Nie")
+    test_db_session.commit()
+    # Touch "a" so "b" becomes the least recently used entry
+    cache.get(card.id, card.back, "a")
+    test_db_session.commit()
+
+    # Act
+    removed = cache.evict()
+
+    # Assert
+    assert removed == 1
+    assert cache.get(card.id, card.back, "b") is None
+    assert cache.get(card.id, card.back, "a") is not None
+    assert cache.get(card.id, card.back, "c") is not None
+
+
+def test_put_twice_for_same_answer_keeps_one_entry(test_db_session, card):
+    # Arrange
+    cache = GradeCache(test_db_session)
+
+    # Act
+    cache.put(card.id, card.back, "Paris", "Correct", "First")
+    cache.put(card.id, card.back, "paris", "Correct", "Second")
+    test_db_session.commit()
+
+    # Assert
+    assert test_db_session.query(GradeCacheEntry).count() == 1
+    assert cache.get(card.id, card.back, "Paris") == ("Correct", "Second")
+
+
+def test_update_card_back_invalidates_cached_grades(test_db_session, card):
+    # Arrange
+    from flash_zap.core.card_manager import update_card_back
+
+    cache = GradeCache(test_db_session)
+    cache.put(card.id, card.back, "Paris", "Correct", "Dobrze")
+    test_db_session.commit()
+
+    # Act
+    update_card_back(test_db_session, card.id, "Paryż")
+
+    # Assert
+    assert test_db_session.query(GradeCacheEntry).count() == 0
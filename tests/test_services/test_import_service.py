@@ -1,11 +1,14 @@
 from flash_zap.services.import_service import (
     _parse_and_validate_file, 
+    _save_cards_deduplicated,
     _save_cards_to_db,
+    import_cards_from_files,
     import_cards_from_json,
 )
 from flash_zap.core.exceptions import InvalidFileError, ValidationError
 from flash_zap.models.card import Card
 import json
+import os
 import pytest
 from unittest.mock import patch, Mock
 from sqlalchemy.orm import Session
@@ -82,6 +85,16 @@ def test_parse_and_validate_file_raises_error_for_content_too_long(tmp_path):
         _parse_and_validate_file(str(file_path))
 
 
+def test_parse_and_validate_file_reports_the_item_whose_content_is_not_text(tmp_path):
+    # Arrange
+    file_path = tmp_path / "not_text.json"
+    file_path.write_text(json.dumps([{"front": "Valid front", "back": "Valid back"}, {"front": 5, "back": "x"}]))
+
+    # Act / Assert
+    with pytest.raises(ValidationError, match="index 1"):
+        _parse_and_validate_file(str(file_path))
+
+
 def test_save_cards_to_database(test_db_session):
     """
     GIVEN: A list of dictionaries with valid card data.
@@ -231,3 +244,196 @@ def test_import_valid_json_returns_data(tmp_path):
 
     # Assert
     assert data == expected_data
+
+
+def test_save_cards_to_db_commits_in_batches_and_reports_progress(test_db_session):
+    """
+    GIVEN: Five cards and a batch size of two.
+    WHEN: The _save_cards_to_db function is called.
+    THEN: All cards are saved, due today, and progress is reported after each batch.
+    """
+    # GIVEN
+    cards_data = [{"front": f"Q{i}", "back": f"A{i}"} for i in range(5)]
+    progress = Mock()
+
+    # WHEN
+    saved = _save_cards_to_db(cards_data, test_db_session, batch_size=2, progress=progress)
+
+    # THEN
+    assert saved == 5
+    assert [call.args[0] for call in progress.call_args_list] == [2, 4, 5]
+    cards = test_db_session.query(Card).order_by(Card.id).all()
+    assert [card.front for card in cards] == [f"Q{i}" for i in range(5)]
+    assert all(card.mastery_level == 0 and card.next_review_date is not None for card in cards)
+
+
+def test_save_cards_to_db_keeps_committed_batches_when_a_later_batch_fails(test_db_session):
+    """
+    GIVEN: Cards where the item in the second batch is missing its back.
+    WHEN: The _save_cards_to_db function is called.
+    THEN: The error propagates, the failed batch is rolled back and the first batch stays saved.
+    """
+    # GIVEN
+    cards_data = [
+        {"front": "Q1", "back": "A1"},
+        {"front": "Q2", "back": "A2"},
+        {"front": "Q3", "back": None},
+    ]
+
+    # WHEN
+    with pytest.raises(Exception):
+        _save_cards_to_db(cards_data, test_db_session, batch_size=2)
+
+    # THEN
+    assert [card.front for card in test_db_session.query(Card).order_by(Card.id)] == ["Q1", "Q2"]
+
+
+def test_full_import_flow_validates_every_item_before_saving(tmp_path, test_db_session, capsys, caplog):
+    """
+    GIVEN: A JSON file whose last item is missing its 'back' key.
+    WHEN: The user imports the file.
+    THEN: Nothing is saved and the log names the index of the invalid item.
+    """
+    # GIVEN
+    file_path = tmp_path / "last_item_invalid.json"
+    cards_data = [{"front": f"Q{i}", "back": f"A{i}"} for i in range(3)] + [{"front": "Q3"}]
+    file_path.write_text(json.dumps(cards_data))
+
+    # WHEN
+    with patch('builtins.input', return_value=str(file_path)):
+        import_cards_from_json(test_db_session)
+
+    # THEN
+    captured = capsys.readouterr()
+    assert "Missing 'front' or 'back' key in object." in captured.out
+    assert "Item at index 3 is missing 'front' or 'back' key." in caplog.text
+    assert test_db_session.query(Card).count() == 0
+
+
+def test_save_cards_deduplicated_skips_and_updates_existing_cards(test_db_session):
+    """
+    GIVEN: A collection imported from a deck, where one card was later edited by the user.
+    WHEN: An updated version of the deck is imported again with deduplication.
+    THEN: New cards are inserted, re-cased cards are updated in place, unchanged,
+          edited and repeated cards are skipped, and review progress is kept.
+    """
+    # GIVEN
+    first_import = [
+        {"front": "Stolica Polski?", "back": "Warszawa"},
+        {"front": "Bitwa pod Grunwaldem?", "back": "1410"},
+        {"front": "2+2?", "back": "4"},
+    ]
+    _save_cards_deduplicated(first_import, test_db_session)
+    grunwald = test_db_session.query(Card).filter_by(front="Bitwa pod Grunwaldem?").one()
+    grunwald.mastery_level = 5
+    edited = test_db_session.query(Card).filter_by(front="2+2?").one()
+    edited.back = "cztery"
+    test_db_session.commit()
+
+    second_import = [
+        {"front": "Stolica Polski?", "back": "Warszawa"},
+        {"front": "Bitwa pod  grunwaldem?", "back": "1410"},
+        {"front": "2+2?", "back": "4"},
+        {"front": "2-2?", "back": "0"},
+        {"front": "2-2?", "back": "0"},
+    ]
+
+    # WHEN
+    summary = _save_cards_deduplicated(second_import, test_db_session, batch_size=2)
+
+    # THEN
+    assert (summary.inserted, summary.updated, summary.skipped) == (1, 1, 3)
+    test_db_session.expire_all()
+    assert test_db_session.query(Card).count() == 4
+    assert grunwald.front == "Bitwa pod  grunwaldem?"
+    assert grunwald.mastery_level == 5
+    assert edited.back == "cztery"
+
+
+def test_full_import_flow_reports_skipped_duplicates(tmp_path, test_db_session, capsys):
+    """
+    GIVEN: A JSON file that has already been imported once.
+    WHEN: The user imports the same file again.
+    THEN: No duplicate cards are created and the skipped cards are reported.
+    """
+    # GIVEN
+    file_path = tmp_path / "deck.json"
+    file_path.write_text(json.dumps([{"front": "Q1", "back": "A1"}, {"front": "Q2", "back": "A2"}]))
+    with patch('builtins.input', return_value=str(file_path)):
+        import_cards_from_json(test_db_session)
+    capsys.readouterr()
+
+    # WHEN
+    with patch('builtins.input', return_value=str(file_path)):
+        import_cards_from_json(test_db_session)
+
+    # THEN
+    captured = capsys.readouterr()
+    assert "Successfully imported 0 cards." in captured.out
+    assert "skipped 2 cards" in captured.out
+    assert test_db_session.query(Card).count() == 2
+
+
+def _write_deck_tree(root):
+    (root / "history").mkdir()
+    (root / "history" / "poland.json").write_text(json.dumps([
+        {"front": "Bitwa pod Grunwaldem?", "back": "1410"},
+        {"front": "Chrzest Polski?", "back": "966"},
+    ]))
+    (root / "geography.json").write_text(json.dumps([{"front": "Stolica Polski?", "back": "Warszawa"}]))
+    (root / "broken.json").write_text("[{'front': 'Q'}]")
+    (root / "notes.txt").write_text("not a deck")
+
+
+def test_import_cards_from_files_imports_a_directory_tree(tmp_path, test_db_session):
+    """
+    GIVEN: A directory tree with two valid deck files, a malformed one and a non-JSON file.
+    WHEN: The directory is imported.
+    THEN: The valid files are imported, the malformed one is reported, and other files are ignored.
+    """
+    # GIVEN
+    _write_deck_tree(tmp_path)
+
+    # WHEN
+    results = import_cards_from_files(test_db_session, str(tmp_path), max_workers=2)
+
+    # THEN
+    by_name = {os.path.basename(result.file_path): result for result in results}
+    assert set(by_name) == {"poland.json", "geography.json", "broken.json"}
+    assert by_name["poland.json"].summary.inserted == 2
+    assert by_name["geography.json"].summary.inserted == 1
+    assert "not a valid JSON file" in by_name["broken.json"].error
+    assert test_db_session.query(Card).count() == 3
+
+
+def test_import_cards_from_files_prints_paths_that_look_like_markup(tmp_path, test_db_session, capsys):
+    # Arrange
+    deck_dir = tmp_path / "[deck]"
+    deck_dir.mkdir()
+    (deck_dir / "cards.json").write_text(json.dumps([{"front": "Q", "back": "A"}]))
+
+    # Act
+    import_cards_from_files(test_db_session, str(deck_dir), max_workers=1)
+
+    # Assert
+    assert "[deck]" in capsys.readouterr().out.replace("\n", "")
+
+
+def test_full_import_flow_accepts_a_glob_pattern(tmp_path, test_db_session, capsys):
+    """
+    GIVEN: A directory tree of deck files.
+    WHEN: The user enters a recursive glob pattern instead of a single file path.
+    THEN: Every matching file is imported and the totals are reported.
+    """
+    # GIVEN
+    _write_deck_tree(tmp_path)
+
+    # WHEN
+    with patch('builtins.input', return_value=str(tmp_path / "**" / "*.json")):
+        import_cards_from_json(test_db_session)
+
+    # THEN
+    captured = capsys.readouterr()
+    assert "Successfully imported 3 cards from 2 files." in captured.out
+    assert "1 files could not be imported." in captured.out
+    assert test_db_session.query(Card).count() == 3
@@ -0,0 +1,57 @@
+import pytest
+
+from flash_zap.services.local_grader import LocalGrader
+
+
+@pytest.fixture
+def grader():
+    return LocalGrader(max_edit_distance=1, min_fuzzy_length=6)
+
+
+@pytest.mark.parametrize("user_answer, correct_answer", [
+    ("paris", "Paris"),
+    ("  Gdansk ", "Gdańsk"),
+    ("15 lipiec 1410", "15 lipca 1410"),
+    ("15.07.1410", "15 lipca 1410 r."),
+    ("Waszyngtom", "Waszyngton"),
+])
+def test_local_grader_accepts_clearly_correct_answers(grader, user_answer, correct_answer):
+    # Act
+    result = grader.grade_answer("Question", user_answer, correct_answer)
+
+    # Assert
+    assert result is not None
+    assert result[0] == "Correct"
+
+
+@pytest.mark.parametrize("user_answer, correct_answer", [
+    ("1411", "1410"),
+    ("Bitwa pod Grunwald", "Bitwa pod Grunwaldem"),
+    ("Lyon", "Paris"),
+    ("16 lipca 1410", "15 lipca 1410"),
+    ("", "Paris"),
+    ("Rzym", "Rzep"),
+    ("5", "-5"),
+    ("50", "50%"),
+    ("314", "3.14"),
+    ("Prussia", "Russia"),
+])
+def test_local_grader_defers_uncertain_answers_to_ai(grader, user_answer, correct_answer):
+    # Act / Assert
+    assert grader.grade_answer("Question", user_answer, correct_answer) is None
+
+
+def test_local_grader_reports_hit_rate(grader):
+    # Arrange
+    assert grader.hit_rate == 0.0
+
+    # Act
+    grader.grade_answer("Q", "Paris", "Paris")
+    grader.grade_answer("Q", "Lyon", "Paris")
+    grader.grade_answer("Q", "paris", "Paris")
+    grader.grade_answer("Q", "Rome", "Paris")
+
+    # Assert
+    assert grader.lookups == 4
+    assert grader.hits == 2
+    assert grader.hit_rate == 0.5
@@ -0,0 +1,102 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from flash_zap.models.card import Card
+from flash_zap.models.review import Review
+from flash_zap.services.review_log import ReviewLogWriter, compact_review_log, review_history
+
+
+@pytest.fixture
+def card(test_db_session):
+    card = Card(front="Capital of France?", back="Paris")
+    test_db_session.add(card)
+    test_db_session.commit()
+    return card
+
+
+def _logged(session):
+    return session.execute(select(Review.answer, Review.grade).order_by(Review.id)).all()
+
+
+def test_writer_buffers_reviews_until_flushed(test_db_session, card):
+    # Arrange
+    writer = ReviewLogWriter(test_db_session, buffer_size=10)
+
+    # Act
+    writer.append(card.id, "Paris", "Correct", 0, 1, latency_seconds=0.25)
+    writer.append(card.id, "Lyon", "Incorrect", 1, 0)
+    before_flush = _logged(test_db_session)
+    written = writer.flush()
+
+    # Assert
+    assert before_flush == []
+    assert written == 2
+    assert len(writer) == 0
+    assert _logged(test_db_session) == [("Paris", "Correct"), ("Lyon", "Incorrect")]
+    assert test_db_session.scalars(select(Review.latency_ms).order_by(Review.id)).all() == [250, 0]
+
+
+def test_writer_flushes_when_the_buffer_is_full(test_db_session, card):
+    # Arrange
+    writer = ReviewLogWriter(test_db_session, buffer_size=2)
+
+    # Act
+    for answer in ("a", "b", "c"):
+        writer.append(card.id, answer, "Incorrect", 0, 0)
+
+    # Assert
+    assert len(writer) == 1
+    assert writer.written == 2
+    assert _logged(test_db_session) == [("a", "Incorrect"), ("b", "Incorrect")]
+
+
+def test_compact_deletes_old_reviews_and_clears_old_answers(test_db_session, card):
+    # Arrange
+    now = datetime.now(timezone.utc)
+    writer = ReviewLogWriter(test_db_session)
+    for answer, age in (("ancient", 800), ("old", 100), ("recent", 1)):
+        writer.append(card.id, answer, "Correct", 0, 1, reviewed_at=now - timedelta(days=age))
+    writer.flush()
+    test_db_session.commit()
+
+    # Act
+    deleted, compacted = compact_review_log(test_db_session, retention_days=730, answer_retention_days=90)
+
+    # Assert
+    assert (deleted, compacted) == (1, 1)
+    assert _logged(test_db_session) == [(None, "Correct"), ("recent", "Correct")]
+
+
+def test_review_history_returns_the_log_in_order_for_replay(test_db_session, card):
+    # Arrange
+    writer = ReviewLogWriter(test_db_session)
+    writer.append(card.id, "Lyon", "Incorrect", 0, 0, reviewed_at=datetime(2026, 5, 2, 9, tzinfo=timezone.utc))
+    writer.append(card.id, "Paris", "Correct", 0, 1, reviewed_at=datetime(2026, 5, 1, 9, tzinfo=timezone.utc))
+    writer.flush()
+
+    # Act
+    history = review_history(test_db_session, [card.id])
+
+    # Assert
+    assert history == ([card.id, card.id], [True, False], [date(2026, 5, 1), date(2026, 5, 2)])
+
+
+def test_studied_today_tells_new_cards_from_reviews(test_db_session):
+    # Arrange
+    from flash_zap.services.review_log import studied_today
+    today = datetime.now(timezone.utc).date()
+    cards = [Card(front=f"Q{i}", back=f"A{i}") for i in range(3)]
+    test_db_session.add_all(cards)
+    test_db_session.flush()
+    writer = ReviewLogWriter(test_db_session)
+    writer.append(cards[0].id, "a", "Correct", 0, 1, reviewed_at=datetime.now(timezone.utc) - timedelta(days=3))
+    for card in cards[:2]:
+        card.last_review_date = today
+        writer.append(card.id, "a", "Correct", 1, 2)
+    writer.flush()
+    test_db_session.commit()
+
+    # Act / Assert
+    assert studied_today(test_db_session, today) == (1, 1)
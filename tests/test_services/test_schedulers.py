@@ -0,0 +1,124 @@
+from datetime import date, timedelta
+
+import pytest
+
+from flash_zap.services.schedulers import (
+    FSRSScheduler,
+    LinearScheduler,
+    ReviewState,
+    SM2Scheduler,
+    get_scheduler,
+)
+
+DAY = date(2026, 3, 1)
+
+
+def _review_correctly(scheduler, times: int) -> ReviewState:
+    state, day = ReviewState(next_review_date=DAY), DAY
+    for _ in range(times):
+        state = scheduler.review(state, True, day)
+        day = state.next_review_date
+    return state
+
+
+def test_linear_scheduler_keeps_the_original_schedule():
+    # Arrange
+    scheduler = LinearScheduler()
+
+    # Act
+    promoted = scheduler.review(ReviewState(mastery_level=2), True, DAY)
+    demoted = scheduler.review(ReviewState(mastery_level=0), False, DAY)
+
+    # Assert
+    assert (promoted.mastery_level, promoted.next_review_date) == (3, DAY + timedelta(days=3))
+    assert (demoted.mastery_level, demoted.next_review_date) == (0, DAY)
+
+
+def test_sm2_scheduler_grows_intervals_by_the_ease_factor():
+    # Arrange
+    scheduler = SM2Scheduler()
+
+    # Act
+    intervals = [_review_correctly(scheduler, times).interval_days for times in range(1, 5)]
+
+    # Assert
+    assert intervals == [1, 6, 15, 38]
+
+
+def test_sm2_scheduler_restarts_and_lowers_the_ease_after_a_wrong_answer():
+    # Arrange
+    scheduler = SM2Scheduler()
+    state = _review_correctly(scheduler, 3)
+
+    # Act
+    lapsed = scheduler.review(state, False, state.next_review_date)
+
+    # Assert
+    assert lapsed.mastery_level == 0
+    assert lapsed.next_review_date == state.next_review_date
+    assert lapsed.ease_factor == pytest.approx(2.18)
+
+
+def test_fsrs_scheduler_spaces_reviews_further_than_the_linear_schedule():
+    # Arrange
+    fsrs, linear = FSRSScheduler(), LinearScheduler()
+
+    # Act
+    fsrs_state = _review_correctly(fsrs, 5)
+    linear_state = _review_correctly(linear, 5)
+
+    # Assert
+    assert fsrs_state.mastery_level == 5
+    assert fsrs_state.interval_days > 10 * linear_state.interval_days
+    assert 1 <= fsrs_state.difficulty <= 10
+
+
+def test_fsrs_scheduler_lowers_stability_after_a_wrong_answer():
+    # Arrange
+    scheduler = FSRSScheduler()
+    state = _review_correctly(scheduler, 3)
+
+    # Act
+    lapsed = scheduler.review(state, False, state.next_review_date)
+
+    # Assert
+    assert lapsed.mastery_level == 0
+    assert lapsed.next_review_date == state.next_review_date
+    assert lapsed.stability < state.stability
+    assert lapsed.difficulty > state.difficulty
+
+
+def test_fsrs_scheduler_picks_up_cards_scheduled_by_another_algorithm():
+    # Arrange
+    state = ReviewState(mastery_level=4, interval_days=4, next_review_date=DAY)
+
+    # Act
+    reviewed = FSRSScheduler().review(state, True, DAY)
+
+    # Assert
+    assert reviewed.mastery_level == 5
+    assert reviewed.interval_days > 4
+
+
+def test_higher_desired_retention_gives_shorter_intervals():
+    # Act
+    relaxed = _review_correctly(FSRSScheduler(desired_retention=0.8), 3)
+    strict = _review_correctly(FSRSScheduler(desired_retention=0.95), 3)
+
+    # Assert
+    assert strict.interval_days < relaxed.interval_days
+
+
+def test_intervals_are_capped_at_the_maximum():
+    # Act
+    state = _review_correctly(SM2Scheduler(maximum_interval_days=30), 6)
+
+    # Assert
+    assert state.interval_days == 30
+
+
+def test_get_scheduler_by_name():
+    assert isinstance(get_scheduler("FSRS"), FSRSScheduler)
+    assert isinstance(get_scheduler(), LinearScheduler)
+    with pytest.raises(ValueError):
+        get_scheduler("leitner")
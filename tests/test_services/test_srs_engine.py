@@ -2,6 +2,7 @@ from datetime import datetime, timedelta, timezone
 import pytest
 
 from flash_zap.models.card import Card
+from flash_zap.services.schedulers import ReviewState, SM2Scheduler
 from flash_zap.services.srs_engine import SRSEngine
 
 
@@ -86,4 +87,56 @@ def test_demote_card_at_level_0():
     # Assert
     assert card.mastery_level == 0
     expected_date = (datetime.now(timezone.utc) + timedelta(days=0)).date()
-    assert card.next_review_date == expected_date 
\ No newline at end of file
+    assert card.next_review_date == expected_date 
+
+def test_schedule_many_matches_promote_and_demote():
+    # Arrange
+    srs_engine = SRSEngine()
+    levels = [0, 2, 10, 4, 1, 0]
+    outcomes = [True, True, True, False, False, False]
+
+    # Act
+    new_states = srs_engine.schedule_many([ReviewState(mastery_level=level) for level in levels], outcomes)
+
+    # Assert
+    for level, correct, new_state in zip(levels, outcomes, new_states):
+        card = Card(front="Q", back="A", mastery_level=level)
+        if correct:
+            srs_engine.promote_card(card)
+        else:
+            srs_engine.demote_card(card)
+        assert (new_state.mastery_level, new_state.next_review_date) == (card.mastery_level, card.next_review_date)
+
+
+def test_schedule_many_uses_the_given_review_dates():
+    # Arrange
+    srs_engine = SRSEngine()
+    reviewed = datetime(2026, 1, 10).date()
+
+    # Act
+    [new_state] = srs_engine.schedule_many([ReviewState(mastery_level=3)], [True], [reviewed])
+
+    # Assert
+    assert new_state.mastery_level == 4
+    assert new_state.next_review_date == reviewed + timedelta(days=4)
+    assert new_state.last_review_date == reviewed
+
+
+def test_schedule_many_rejects_sequences_of_different_lengths():
+    with pytest.raises(ValueError):
+        SRSEngine().schedule_many([ReviewState(), ReviewState()], [True])
+
+
+def test_engine_uses_the_given_scheduler():
+    # Arrange
+    srs_engine = SRSEngine(SM2Scheduler())
+    card = Card(front="Q", back="A", mastery_level=2)
+    card.interval_days = 6
+
+    # Act
+    srs_engine.promote_card(card)
+
+    # Assert
+    assert card.mastery_level == 3
+    assert card.interval_days == 15
+    assert card.next_review_date == (datetime.now(timezone.utc) + timedelta(days=15)).date()
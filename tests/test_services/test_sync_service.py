@@ -0,0 +1,261 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import sessionmaker
+
+from flash_zap.core import decks
+from flash_zap.core.card_manager import bulk_delete_cards
+from flash_zap.models.base import Base
+from flash_zap.models.card import Card
+from flash_zap.models.card_tag import CardTag
+from flash_zap.models.deck import Deck
+from flash_zap.services.sync_service import SyncWorker, sync_once
+
+
+@pytest.fixture
+def engines(tmp_path):
+    """Two SQLite files standing in for the local replica and the cloud database."""
+    local = create_engine(f"sqlite:///{tmp_path / 'local.db'}")
+    remote = create_engine(f"sqlite:///{tmp_path / 'remote.db'}")
+    Base.metadata.create_all(local)
+    Base.metadata.create_all(remote)
+    yield local, remote
+    local.dispose()
+    remote.dispose()
+
+
+def _add_card(engine, **fields) -> Card:
+    with sessionmaker(bind=engine, expire_on_commit=False)() as session:
+        card = Card(front=fields.pop("front", "Q"), back=fields.pop("back", "A"))
+        for name, value in fields.items():
+            setattr(card, name, value)
+        session.add(card)
+        session.commit()
+        return card
+
+
+def _cards(engine):
+    with sessionmaker(bind=engine)() as session:
+        return session.scalars(select(Card).order_by(Card.id)).all()
+
+
+def test_sync_pushes_local_cards_and_pulls_remote_cards(engines):
+    # Arrange
+    local, remote = engines
+    _add_card(local, front="Local question", back="Local answer")
+    _add_card(remote, front="Remote question", back="Remote answer")
+
+    # Act
+    result = sync_once(local, remote)
+
+    # Assert
+    assert (result.pushed, result.pulled) == (1, 1)
+    for engine in (local, remote):
+        assert sorted(card.front for card in _cards(engine)) == ["Local question", "Remote question"]
+    assert {card.sync_id for card in _cards(local)} == {card.sync_id for card in _cards(remote)}
+
+
+def test_sync_only_copies_changes_since_the_last_sync(engines):
+    # Arrange
+    local, remote = engines
+    _add_card(local)
+    sync_once(local, remote)
+
+    # Act
+    result = sync_once(local, remote)
+
+    # Assert
+    assert (result.pushed, result.pulled) == (0, 0)
+
+
+def test_sync_resolves_conflicts_with_last_writer_wins(engines):
+    """
+    GIVEN: Two synced cards, one changed later locally and the other later remotely.
+    WHEN: The databases are synced.
+    THEN: Each card ends up with its most recent version on both sides.
+    """
+    # GIVEN
+    local, remote = engines
+    _add_card(local, front="Q1", back="A1")
+    _add_card(local, front="Q2", back="A2")
+    sync_once(local, remote)
+    now = datetime.now(timezone.utc)
+
+    with sessionmaker(bind=local)() as session:
+        first, second = session.scalars(select(Card).order_by(Card.front)).all()
+        first.mastery_level, first.updated_at = 3, now + timedelta(minutes=2)
+        second.mastery_level, second.updated_at = 1, now + timedelta(minutes=1)
+        session.commit()
+    with sessionmaker(bind=remote)() as session:
+        first, second = session.scalars(select(Card).order_by(Card.front)).all()
+        first.mastery_level, first.updated_at = 9, now + timedelta(minutes=1)
+        second.mastery_level, second.updated_at = 7, now + timedelta(minutes=2)
+        session.commit()
+
+    # WHEN
+    sync_once(local, remote)
+
+    # THEN
+    for engine in (local, remote):
+        assert [(card.front, card.mastery_level) for card in sorted(_cards(engine), key=lambda c: c.front)] == [
+            ("Q1", 3), ("Q2", 7)
+        ]
+
+
+def test_sync_pulls_an_older_edit_that_reached_the_cloud_after_the_last_pull(engines):
+    """
+    GIVEN: Two synced cards. The second is edited in the cloud and pulled,
+        then an edit of the first made earlier on an offline device reaches the cloud.
+    WHEN: The databases are synced again.
+    THEN: The offline edit is pulled, although it is older than the last pulled change.
+    """
+    # GIVEN
+    local, remote = engines
+    _add_card(remote, front="Q1", back="A1")
+    _add_card(remote, front="Q2", back="A2")
+    sync_once(local, remote, overlap=0)
+    now = datetime.now(timezone.utc)
+    cards = Card.__table__
+    with remote.begin() as conn:
+        conn.execute(update(cards).where(cards.c.front == "Q2").values(back="Edited", updated_at=now + timedelta(minutes=2)))
+    sync_once(local, remote, overlap=0)
+    with remote.begin() as conn:
+        conn.execute(
+            update(cards).where(cards.c.front == "Q1").values(back="Edited offline", updated_at=now + timedelta(minutes=1))
+        )
+
+    # WHEN
+    result = sync_once(local, remote, overlap=0)
+
+    # THEN
+    assert result.pulled == 1
+    assert [card.back for card in _cards(local)] == ["Edited offline", "Edited"]
+
+
+def _delete_cards(engine, *fronts):
+    with sessionmaker(bind=engine)() as session:
+        card_ids = session.scalars(select(Card.id).where(Card.front.in_(fronts))).all()
+        bulk_delete_cards(session, card_ids)
+
+
+def test_sync_deletes_cards_on_both_sides_and_does_not_copy_them_back(engines):
+    # Arrange
+    local, remote = engines
+    _add_card(local, front="Deleted locally")
+    _add_card(remote, front="Deleted remotely")
+    _add_card(local, front="Kept")
+    sync_once(local, remote)
+    _delete_cards(local, "Deleted locally")
+    _delete_cards(remote, "Deleted remotely")
+
+    # Act
+    result = sync_once(local, remote)
+    again = sync_once(local, remote)
+
+    # Assert
+    assert (result.pushed_deletions, result.pulled_deletions) == (1, 1)
+    assert (again.pushed, again.pulled, again.pushed_deletions, again.pulled_deletions) == (0, 0, 0, 0)
+    for engine in (local, remote):
+        assert [card.front for card in _cards(engine)] == ["Kept"]
+
+
+def test_sync_keeps_a_deleted_card_edited_later_on_the_other_side(engines):
+    # Arrange
+    local, remote = engines
+    _add_card(local, front="Q", back="A")
+    sync_once(local, remote)
+    _delete_cards(local, "Q")
+    with remote.begin() as conn:
+        conn.execute(update(Card.__table__).values(
+            back="Edited after the deletion", updated_at=datetime.now(timezone.utc) + timedelta(minutes=1)
+        ))
+
+    # Act
+    sync_once(local, remote)
+    sync_once(local, remote)
+
+    # Assert
+    for engine in (local, remote):
+        assert [card.back for card in _cards(engine)] == ["Edited after the deletion"]
+
+
+def test_sync_links_the_same_imported_card_by_content_hash(engines):
+    # Arrange
+    local, remote = engines
+    _add_card(local, front="Q", back="A", content_hash="same-deck-card", mastery_level=2)
+    _add_card(remote, front="Q", back="A", content_hash="same-deck-card")
+
+    # Act
+    sync_once(local, remote)
+    sync_once(local, remote)
+
+    # Assert
+    local_cards, remote_cards = _cards(local), _cards(remote)
+    assert len(local_cards) == len(remote_cards) == 1
+    assert local_cards[0].sync_id == remote_cards[0].sync_id
+    assert local_cards[0].mastery_level == remote_cards[0].mastery_level
+
+
+def _deck_and_tags(engine):
+    with sessionmaker(bind=engine)() as session:
+        card = session.scalars(select(Card)).one()
+        deck = session.get(Deck, card.deck_id) if card.deck_id is not None else None
+        tags = session.scalars(select(CardTag.tag).where(CardTag.card_id == card.id)).all()
+        return (deck.name if deck else None), sorted(tags)
+
+
+def test_sync_copies_decks_and_tags_by_name(engines):
+    """
+    GIVEN: A local card in a deck with tags, and a remote deck that takes the local deck's id.
+    WHEN: The databases are synced, and again after a tag is removed locally.
+    THEN: The remote card is in a deck of the same name and has the same tags.
+    """
+    # GIVEN
+    local, remote = engines
+    with sessionmaker(bind=remote)() as session:
+        decks.get_or_create_deck(session, "Remote only")
+    card = _add_card(local)
+    with sessionmaker(bind=local)() as session:
+        decks.move_cards_to_deck(session, [card.id], decks.get_or_create_deck(session, "Biology").id)
+        decks.tag_cards(session, [card.id], ["cells", "week1"])
+
+    # WHEN
+    sync_once(local, remote)
+    first = _deck_and_tags(remote)
+    with sessionmaker(bind=local)() as session:
+        decks.untag_cards(session, [card.id], ["week1"])
+    result = sync_once(local, remote)
+
+    # THEN
+    assert first == ("Biology", ["cells", "week1"])
+    assert result.pushed == 1
+    assert _deck_and_tags(remote) == _deck_and_tags(local) == ("Biology", ["cells"])
+
+
+def test_sync_worker_keeps_running_while_the_cloud_is_unreachable(engines, tmp_path):
+    # Arrange
+    local, _ = engines
+    unreachable = create_engine(f"sqlite:///{tmp_path / 'missing' / 'remote.db'}")
+    worker = SyncWorker(local, unreachable, interval=3600)
+
+    # Act
+    result = worker.sync_now()
+
+    # Assert
+    assert result is None
+    assert worker.last_error is not None
+
+
+def test_sync_worker_syncs_in_the_background_and_on_stop(engines):
+    # Arrange
+    local, remote = engines
+    worker = SyncWorker(local, remote, interval=3600)
+    worker.start()
+
+    # Act
+    _add_card(local, front="Added while running")
+    worker.stop()
+
+    # Assert
+    assert [card.front for card in _cards(remote)] == ["Added while running"]
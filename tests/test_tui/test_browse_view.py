@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import patch, Mock, call
 from datetime import date
+from flash_zap.core.card_manager import CardListItem, SearchPage
 from flash_zap.models.card import Card
 from flash_zap.tui import browse_view
 
@@ -58,16 +59,16 @@ def test_show_card_view_displays_card_and_menu(
 
 
 @patch("flash_zap.tui.browse_view.clear_screen")
-@patch("flash_zap.tui.browse_view.update_card_front")
-@patch("readchar.readkey", side_effect=["1", "any_key", "4"])  # Edit front, continue, cancel
+@patch("readchar.readkey", side_effect=["1", "any_key", "4", "any_key"])  # Edit front, continue, save, continue
 @patch("builtins.input", side_effect=["1", "New Front"])  # Card ID, new front text
 @patch("flash_zap.tui.browse_view.get_card_by_id")
 @patch("builtins.print")
 def test_edit_front_option(
-    mock_print, mock_get_card, mock_input, mock_readkey, mock_update, mock_clear
+    mock_print, mock_get_card, mock_input, mock_readkey, mock_clear
 ):
     """Tests the 'Edit front' option flow."""
     mock_session = Mock()
+    mock_session.execute.return_value.all.return_value = []  # No other card has the edited content.
     test_card = Card(front="Old Front", back="Test Back")
     test_card.id = 1
     mock_get_card.return_value = test_card
@@ -75,23 +76,25 @@ def test_edit_front_option(
     browse_view.show_card_view(mock_session)
 
     mock_input.assert_has_calls([call("Enter the ID of the card you want to view: "), call("Enter the new text for the front: ")])
-    mock_update.assert_called_once_with(mock_session, 1, "New Front")
+    assert test_card.front == "New Front"
+    mock_session.commit.assert_called_once()
     mock_print.assert_any_call("Current front: Old Front")
-    mock_print.assert_any_call("Card front updated successfully.")
+    mock_print.assert_any_call("Card front changed.")
+    mock_print.assert_any_call("Card saved successfully.")
     assert mock_clear.call_count > 2  # Start, after find, before prompt, then loops
 
 
 @patch("flash_zap.tui.browse_view.clear_screen")
-@patch("flash_zap.tui.browse_view.update_card_back")
-@patch("readchar.readkey", side_effect=["2", "any_key", "4"])  # Edit back, continue, cancel
+@patch("readchar.readkey", side_effect=["2", "any_key", "4", "any_key"])  # Edit back, continue, save, continue
 @patch("builtins.input", side_effect=["1", "New Back"])  # Card ID, new back text
 @patch("flash_zap.tui.browse_view.get_card_by_id")
 @patch("builtins.print")
 def test_edit_back_option(
-    mock_print, mock_get_card, mock_input, mock_readkey, mock_update, mock_clear
+    mock_print, mock_get_card, mock_input, mock_readkey, mock_clear
 ):
     """Tests the 'Edit back' option flow."""
     mock_session = Mock()
+    mock_session.execute.return_value.all.return_value = []  # No other card has the edited content.
     test_card = Card(front="Test Front", back="Old Back")
     test_card.id = 1
     mock_get_card.return_value = test_card
@@ -99,19 +102,19 @@ def test_edit_back_option(
     browse_view.show_card_view(mock_session)
 
     mock_input.assert_has_calls([call("Enter the ID of the card you want to view: "), call("Enter the new text for the back: ")])
-    mock_update.assert_called_once_with(mock_session, 1, "New Back")
+    assert test_card.back == "New Back"
+    mock_session.commit.assert_called_once()
     mock_print.assert_any_call("Current back: Old Back")
-    mock_print.assert_any_call("Card back updated successfully.")
+    mock_print.assert_any_call("Card back changed.")
 
 
 @patch("flash_zap.tui.browse_view.clear_screen")
-@patch("flash_zap.tui.browse_view.update_card_mastery")
-@patch("readchar.readkey", side_effect=["3", "any_key", "4"])  # Lower mastery, continue, cancel
+@patch("readchar.readkey", side_effect=["3", "any_key", "4", "any_key"])  # Lower mastery, continue, save, continue
 @patch("builtins.input", side_effect=["1", "2"])  # Card ID, new mastery level
 @patch("flash_zap.tui.browse_view.get_card_by_id")
 @patch("builtins.print")
 def test_lower_mastery_option_valid(
-    mock_print, mock_get_card, mock_input, mock_readkey, mock_update, mock_clear
+    mock_print, mock_get_card, mock_input, mock_readkey, mock_clear
 ):
     """Tests the 'Lower mastery level' option with a valid new level."""
     mock_session = Mock()
@@ -121,19 +124,19 @@ def test_lower_mastery_option_valid(
 
     browse_view.show_card_view(mock_session)
 
-    mock_update.assert_called_once_with(mock_session, 1, 2)
+    assert test_card.mastery_level == 2
+    mock_session.commit.assert_called_once()
     mock_print.assert_any_call("Current mastery level: 3")
-    mock_print.assert_any_call("Mastery level updated successfully.")
+    mock_print.assert_any_call("Mastery level changed.")
 
 
 @patch("flash_zap.tui.browse_view.clear_screen")
-@patch("flash_zap.tui.browse_view.update_card_mastery")
-@patch("readchar.readkey", side_effect=["3", "any_key", "4"])  # Lower mastery, continue, cancel
+@patch("readchar.readkey", side_effect=["3", "any_key", "4"])  # Lower mastery, continue, save
 @patch("builtins.input", side_effect=["1", "4"])  # Card ID, new (higher) mastery level
 @patch("flash_zap.tui.browse_view.get_card_by_id")
 @patch("builtins.print")
 def test_lower_mastery_option_invalid_higher(
-    mock_print, mock_get_card, mock_input, mock_readkey, mock_update, mock_clear
+    mock_print, mock_get_card, mock_input, mock_readkey, mock_clear
 ):
     """Tests that mastery level cannot be raised."""
     mock_session = Mock()
@@ -142,19 +145,19 @@ def test_lower_mastery_option_invalid_higher(
     mock_get_card.return_value = test_card
 
     browse_view.show_card_view(mock_session)
-    mock_update.assert_not_called()
+    assert test_card.mastery_level == 3
+    mock_session.commit.assert_not_called()
     mock_print.assert_any_call("Current mastery level: 3")
     mock_print.assert_any_call("New mastery level cannot be higher than the current one.")
 
 
 @patch("flash_zap.tui.browse_view.clear_screen")
-@patch("flash_zap.tui.browse_view.update_card_mastery")
-@patch("readchar.readkey", side_effect=["3", "any_key", "4"])  # Lower mastery, continue, cancel
+@patch("readchar.readkey", side_effect=["3", "any_key", "4"])  # Lower mastery, continue, save
 @patch("builtins.input", side_effect=["1", "abc"])  # Card ID, new (invalid) mastery level
 @patch("flash_zap.tui.browse_view.get_card_by_id")
 @patch("builtins.print")
 def test_lower_mastery_option_invalid_nan(
-    mock_print, mock_get_card, mock_input, mock_readkey, mock_update, mock_clear
+    mock_print, mock_get_card, mock_input, mock_readkey, mock_clear
 ):
     """Tests 'Lower mastery level' with non-numeric input."""
     mock_session = Mock()
@@ -163,6 +166,107 @@ def test_lower_mastery_option_invalid_nan(
     mock_get_card.return_value = test_card
 
     browse_view.show_card_view(mock_session)
-    mock_update.assert_not_called()
+    assert test_card.mastery_level == 3
+    mock_session.commit.assert_not_called()
     mock_print.assert_any_call("Current mastery level: 3")
-    mock_print.assert_any_call("Invalid input. Please enter a number.") 
\ No newline at end of file
+    mock_print.assert_any_call("Invalid input. Please enter a number.") 
+
+@patch("flash_zap.tui.browse_view.clear_screen")
+@patch("flash_zap.tui.browse_view.show_card_details")
+@patch("flash_zap.tui.browse_view.get_card_by_id")
+@patch("flash_zap.tui.browse_view.search_cards")
+@patch("builtins.input", side_effect=["paris", "n", "7", ""])  # Query, next page, open card, back
+@patch("builtins.print")
+def test_search_cards_view_pages_and_opens_a_result(
+    mock_print, mock_input, mock_search, mock_get_card, mock_details, mock_clear
+):
+    """Tests that the search view pages through results and opens the chosen card."""
+    mock_session = Mock()
+    card = Card(front="Capital of France?", back="Paris")
+    card.id = 7
+    mock_search.side_effect = [
+        SearchPage([card], 1, 1, True),
+        SearchPage([card], 2, 1, False),
+        SearchPage([card], 2, 1, False),
+    ]
+    mock_get_card.return_value = card
+
+    browse_view.search_cards_view(mock_session)
+
+    assert mock_search.call_args_list == [
+        call(mock_session, "paris", page=1),
+        call(mock_session, "paris", page=2),
+        call(mock_session, "paris", page=2),
+    ]
+    mock_get_card.assert_called_once_with(mock_session, 7)
+    mock_details.assert_called_once_with(mock_session, card)
+    assert any("Capital of France?" in str(c) for c in mock_print.call_args_list)
+
+
+@patch("flash_zap.tui.browse_view.clear_screen")
+@patch("readchar.readkey", side_effect=["1", "any_key", "2", "any_key", "5"])  # Edit front, edit back, discard
+@patch("builtins.input", side_effect=["New Front", "New Back"])
+@patch("builtins.print")
+def test_discarding_changes_leaves_the_card_untouched(mock_print, mock_input, mock_readkey, mock_clear):
+    mock_session = Mock()
+    test_card = Card(front="Old Front", back="Old Back")
+    test_card.id = 1
+
+    browse_view.show_card_details(mock_session, test_card)
+
+    assert (test_card.front, test_card.back) == ("Old Front", "Old Back")
+    mock_session.commit.assert_not_called()
+    mock_print.assert_any_call("Front: New Front")
+
+
+@patch("flash_zap.tui.browse_view.clear_screen")
+@patch("flash_zap.tui.browse_view.search_cards_view")
+@patch("flash_zap.tui.browse_view.show_card_view")
+@patch("readchar.readkey", side_effect=["2"])
+@patch("builtins.print")
+def test_browse_cards_opens_search(mock_print, mock_readkey, mock_show, mock_search_view, mock_clear):
+    mock_session = Mock()
+
+    browse_view.browse_cards(mock_session)
+
+    mock_search_view.assert_called_once_with(mock_session)
+    mock_show.assert_not_called()
+
+
+@patch("flash_zap.tui.browse_view.clear_screen")
+@patch("flash_zap.tui.browse_view.CardListPager")
+@patch("readchar.readkey", side_effect=["n", "p", "q"])
+@patch("builtins.print")
+def test_list_cards_view_scrolls_and_closes_the_pager(mock_print, mock_readkey, mock_pager_class, mock_clear):
+    pager = mock_pager_class.return_value
+    pager.page.items = [CardListItem(1, "Front", "Back", 0, date(2025, 1, 1))]
+
+    browse_view.list_cards_view(Mock())
+
+    pager.next_page.assert_called_once()
+    pager.previous_page.assert_called_once()
+    pager.close.assert_called_once()
+    assert any("Front" in str(c) for c in mock_print.call_args_list)
+
+
+@patch("flash_zap.tui.browse_view.clear_screen")
+@patch("flash_zap.tui.browse_view.bulk_delete_cards", return_value=2)
+@patch("flash_zap.tui.browse_view.bulk_edit_view", wraps=browse_view.bulk_edit_view)
+@patch("flash_zap.tui.browse_view.search_card_ids", return_value=[7, 8])
+@patch("flash_zap.tui.browse_view.search_cards")
+@patch("flash_zap.tui.browse_view.readchar.readkey", side_effect=["4", " "])
+@patch("builtins.input", side_effect=["paris", "a", "yes", ""])  # Query, edit all, confirm, back
+@patch("builtins.print")
+def test_search_cards_view_deletes_all_results_after_confirmation(
+    mock_print, mock_input, mock_readkey, mock_search, mock_ids, mock_bulk_view, mock_delete, mock_clear
+):
+    mock_session = Mock()
+    card = Card(front="Capital of France?", back="Paris")
+    card.id = 7
+    mock_search.return_value = SearchPage([card], 1, 20, False)
+
+    browse_view.search_cards_view(mock_session)
+
+    mock_ids.assert_called_once_with(mock_session, "paris")
+    mock_bulk_view.assert_called_once_with(mock_session, [7, 8])
+    mock_delete.assert_called_once_with(mock_session, [7, 8])
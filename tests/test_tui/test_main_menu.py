@@ -1,3 +1,6 @@
+import os
+import subprocess
+import sys
 from unittest.mock import patch
 import pytest
 
@@ -23,6 +26,16 @@ def test_display_main_menu_structure_and_content():
     assert actual_output == expected_output
 
 
+def test_display_main_menu_shows_the_due_summary():
+    actual_output = display_main_menu("Due today: 3, tomorrow: 5")
+
+    assert actual_output.splitlines()[:3] == [
+        "--- FlashZap Main Menu ---",
+        "Due today: 3, tomorrow: 5",
+        "1. Review Due Cards",
+    ]
+
+
 @patch('flash_zap.tui.review_view.start_review_session')
 def test_main_menu_review_option_starts_review_session(mock_start_review):
     """
@@ -70,4 +83,35 @@ def test_handle_menu_input_ignores_invalid_input(invalid_input):
     This test covers sub-tasks 4.1, 4.2, and 4.3.
     """
     action = handle_menu_input(invalid_input)
-    assert action is None 
\ No newline at end of file
+    assert action is None 
+
+# Time allowed for importing everything needed to draw the main menu. It is
+# about 0.2 s today; the Gemini SDK or an eagerly created engine alone would
+# take well over the budget again.
+STARTUP_IMPORT_BUDGET_SECONDS = 0.75
+HEAVY_MODULES = ("google.generativeai", "sqlalchemy", "rich", "flash_zap.tui.review_view")
+
+
+def test_main_menu_starts_without_heavy_imports():
+    """
+    Tests that importing the application entry point stays under the startup
+    budget and leaves the Gemini SDK, SQLAlchemy and the views to be loaded lazily.
+    """
+    # Arrange
+    code = (
+        "import sys, flash_zap.main\n"
+        f"print([name for name in {HEAVY_MODULES!r} if name in sys.modules])"
+    )
+    env = {**os.environ, "CLOUD_DB_HOST": "x", "CLOUD_DB_NAME": "x", "CLOUD_DB_USER": "x", "CLOUD_DB_PASSWORD": "x"}
+
+    # Act
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, check=True,
+    )
+
+    # Assert
+    assert result.stdout.strip() == "[]"
+    main_line = [line for line in result.stderr.splitlines() if line.rstrip().endswith("| flash_zap.main")][-1]
+    cumulative_us = int(main_line.split("|")[1])
+    assert cumulative_us / 1e6 < STARTUP_IMPORT_BUDGET_SECONDS
@@ -83,4 +83,47 @@ def test_review_view_displays_service_error_message():
     output = capture.get()
 
     # Assert
-    assert "Sorry, the AI grading service is currently unavailable." in output 
\ No newline at end of file
+    assert "Sorry, the AI grading service is currently unavailable." in output 
+
+def test_review_view_displays_graded_answer():
+    # Arrange
+    from flash_zap.core.review_session import GradedAnswer
+
+    console = Console()
+    card = Card(front="What is 2 + 2?", back="4", mastery_level=3)
+    graded = GradedAnswer(card=card, user_answer="4", grade="Correct", feedback="Well done", old_mastery_level=2)
+
+    # Act
+    with console.capture() as capture:
+        review_view.display_graded_answer(graded, console)
+
+    output = capture.get()
+
+    # Assert
+    assert "What is 2 + 2?" in output
+    assert "Your answer: 4" in output
+    assert "Feedback: Well done" in output
+    assert "Mastery level updated from 2 to: 3" in output
+
+
+@unittest.mock.patch("flash_zap.tui.review_view.Prompt.ask", return_value="2 #Verbs")
+@unittest.mock.patch("flash_zap.tui.review_view.list_tags", return_value=[("verbs", 3)])
+@unittest.mock.patch("flash_zap.tui.review_view.list_decks")
+def test_choose_review_scope_reads_a_deck_number_and_tags(mock_list_decks, mock_list_tags, mock_ask):
+    from flash_zap.core.decks import DeckSummary
+    console = Console()
+    mock_list_decks.return_value = [DeckSummary(4, "French", 10, 2), DeckSummary(9, "Spanish", 5, 1)]
+
+    with console.capture() as capture:
+        scope = review_view.choose_review_scope(unittest.mock.Mock(), console)
+
+    assert scope == (9, ["verbs"])
+    assert "Spanish (1 due of 5)" in capture.get()
+
+
+@unittest.mock.patch("flash_zap.tui.review_view.Prompt.ask")
+@unittest.mock.patch("flash_zap.tui.review_view.list_tags", return_value=[])
+@unittest.mock.patch("flash_zap.tui.review_view.list_decks", return_value=[])
+def test_choose_review_scope_does_not_ask_without_decks_or_tags(mock_list_decks, mock_list_tags, mock_ask):
+    assert review_view.choose_review_scope(unittest.mock.Mock(), Console()) == (None, None)
+    mock_ask.assert_not_called()
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from flash_zap.models.base import Base
+from flash_zap.models.card import Card
+from flash_zap.utils.db_timing import DbTimer, warm_up
+
+
+def test_db_timer_separates_connect_time_from_query_time(tmp_path, caplog):
+    # Arrange
+    engine = create_engine(f"sqlite:///{tmp_path / 'timing.db'}")
+    timer = DbTimer()
+    timer.attach(engine)
+
+    # Act
+    with caplog.at_level("INFO"):
+        with timer.measure("test view"):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 3"))
+
+    # Assert
+    timings = timer.snapshot()
+    assert timings.connections == 1
+    assert timings.statements == 3
+    assert timings.connect_seconds > 0
+    assert timings.query_seconds > 0
+    assert "DB timing for test view: connect" in caplog.text
+    assert "(1 connections)" in caplog.text
+
+
+def test_db_timer_forgets_the_start_of_failed_statements(tmp_path):
+    # Arrange
+    engine = create_engine(f"sqlite:///{tmp_path / 'timing.db'}")
+    timer = DbTimer()
+    timer.attach(engine)
+
+    # Act
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+        starts = conn.info["db_timer_starts"]
+
+    # Assert
+    assert starts == {}
+    assert timer.snapshot().statements == 4
+
+
+def test_warm_up_runs_setup_and_fills_the_pool(tmp_path):
+    # Arrange
+    engine = create_engine(f"sqlite:///{tmp_path / 'warm.db'}")
+    timer = DbTimer()
+    timer.attach(engine)
+
+    # Act
+    warm_up(lambda: engine, Base.metadata.create_all).join()
+    with engine.connect() as conn:
+        conn.execute(Card.__table__.select())
+
+    # Assert
+    assert timer.snapshot().connections == 1
@@ -0,0 +1,51 @@
+import io
+import json
+
+import pytest
+
+from flash_zap.utils.json_stream import NotAnArrayError, iter_json_array
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64 * 1024])
+def test_iter_json_array_yields_items_across_chunk_boundaries(chunk_size):
+    # Arrange
+    data = [
+        {"front": "Bitwa pod Grunwaldem, ]", "back": "15 lipca 1410"},
+        12345,
+        -0.5e-3,
+        True,
+        None,
+        ["nested", {"a": 1}],
+    ]
+    text = json.dumps(data, indent=2, ensure_ascii=False)
+
+    # Act
+    items = list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+
+    # Assert
+    assert items == data
+
+
+def test_iter_json_array_handles_an_empty_array():
+    assert list(iter_json_array(io.StringIO(" [ ] "))) == []
+
+
+@pytest.mark.parametrize("text", ["", "[", "[1,]", "[1 2]", "[1, 2", "[1] extra", "{'key': 'value'}"])
+def test_iter_json_array_raises_for_malformed_json(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO(text), chunk_size=1))
+
+
+def test_iter_json_array_raises_not_an_array_error_if_root_is_not_an_array():
+    with pytest.raises(NotAnArrayError):
+        list(iter_json_array(io.StringIO(json.dumps({"key": "value"}))))
+
+
+def test_iter_json_array_yields_items_before_reaching_an_error():
+    # Arrange
+    items = iter_json_array(io.StringIO('[{"front": "Q1"}, oops]'), chunk_size=4)
+
+    # Act / Assert
+    assert next(items) == {"front": "Q1"}
+    with pytest.raises(json.JSONDecodeError):
+        next(items)
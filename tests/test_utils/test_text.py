@@ -0,0 +1,55 @@
+import pytest
+
+from flash_zap.utils.text import card_content_hash, edit_distance, normalize_answer, parse_date
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("  Gdańsk,   Polska! ", "gdansk polska"),
+    ("ŁÓDŹ", "lodz"),
+    ("Zażółć gęślą jaźń", "zazolc gesla jazn"),
+    ("git  init\n", "git init"),
+    ("Bielsko-Biała", "bielsko biala"),
+    ("-5", "-5"),
+    ("50 %", "50%"),
+    ("3,14", "3.14"),
+])
+def test_normalize_answer(raw, expected):
+    assert normalize_answer(raw) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "15 lipca 1410",
+    "15 lipiec 1410",
+    "15 Lipca 1410 r.",
+    "15 VII 1410",
+    "15.07.1410",
+    "1410-07-15",
+    "15/7/1410",
+])
+def test_parse_date_understands_polish_and_numeric_formats(text):
+    assert parse_date(text) == (15, 7, 1410)
+
+
+@pytest.mark.parametrize("text", ["1410", "Bitwa pod Grunwaldem", "15 lipca", "32.01.2000", "15 foo 1410"])
+def test_parse_date_returns_none_for_non_dates(text):
+    assert parse_date(text) is None
+
+
+def test_edit_distance():
+    assert edit_distance("waszyngton", "waszyngtom") == 1
+    assert edit_distance("kitten", "sitting") == 3
+    assert edit_distance("", "abc") == 3
+
+
+def test_edit_distance_stops_early_past_limit():
+    assert edit_distance("abcdef", "uvwxyz", limit=1) == 2
+    assert edit_distance("short", "a much longer text", limit=2) == 3
+
+
+def test_card_content_hash_ignores_case_and_whitespace():
+    assert card_content_hash("Stolica  Polski?", " Warszawa") == card_content_hash("stolica polski?", "WARSZAWA")
+
+
+def test_card_content_hash_keeps_punctuation_and_sides_apart():
+    assert card_content_hash("2+2?", "4") != card_content_hash("2-2?", "4")
+    assert card_content_hash("a", "b c") != card_content_hash("a b", "c")